@@ -1,6 +1,6 @@
 """Scientific analysis module for XRD and XAFS data processing."""
 
-from beamline.analysis.xafs import XAFSProcessor
+from beamline.analysis.xafs import XAFSProcessor, XAFSResult
 from beamline.analysis.xrd import FitResult, Peak, XRDAnalyzer
 
 __all__ = [
@@ -8,4 +8,5 @@ __all__ = [
     "Peak",
     "FitResult",
     "XAFSProcessor",
+    "XAFSResult",
 ]
@@ -1,12 +1,50 @@
-"""X-ray absorption fine structure (XAFS) data processing utilities."""
+"""X-ray absorption fine structure (XAFS) data processing utilities.
+
+find_edge and normalize are memory-bound, the extract_chi spline fit is
+compute-bound, and fourier_transform is compute-bound in the FFT core but
+memory-bound around it. See ``beamline.analysis._kernels`` for the
+primitives each step is built from.
+"""
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Literal
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy import fft, interpolate, signal
+from scipy import fft, interpolate
+
+from beamline.analysis._kernels import (
+    derivative_peak,
+    energy_to_k,
+    fit_line,
+    get_window_function,
+    index_range,
+    spline_knots,
+    validate_spectrum,
+)
+
+
+@dataclass
+class XAFSResult:
+    """Results from the full XAFS processing pipeline.
+
+    Attributes:
+        e0: Edge energy in eV
+        mu_norm: Normalized absorption coefficient μ_norm(E)
+        k: Wavenumber array in Å⁻¹
+        chi: χ(k) array
+        r: Distance array in Å
+        chi_r: Fourier transform magnitude |χ(R)|
+    """
+
+    e0: float
+    mu_norm: NDArray[np.float64]
+    k: NDArray[np.float64]
+    chi: NDArray[np.float64]
+    r: NDArray[np.float64]
+    chi_r: NDArray[np.float64]
 
 
 class XAFSProcessor:
@@ -20,6 +58,8 @@ class XAFSProcessor:
         self,
         energy: NDArray[np.float64],
         mu: NDArray[np.float64],
+        validate: bool = True,
+        search_window: tuple[float, float] | None = None,
     ) -> float:
         """Determine absorption edge energy (E₀).
 
@@ -31,6 +71,10 @@ class XAFSProcessor:
         Args:
             energy: Energy values in eV (monotonically increasing)
             mu: Absorption coefficient μ(E)
+            validate: Check values are finite and energy is increasing. Pass
+                False for arrays that have already been validated.
+            search_window: Optional (start, stop) energy range in eV known to
+                contain the edge. The derivative is then only computed there.
 
         Returns:
             Edge energy E₀ in eV
@@ -38,6 +82,7 @@ class XAFSProcessor:
         Raises:
             ValueError: If arrays have different lengths
             ValueError: If energy is not monotonically increasing
+            ValueError: If search_window holds fewer than 2 points
             ValueError: If no clear edge is found
         """
         # Input validation
@@ -47,33 +92,44 @@ class XAFSProcessor:
         if len(energy) == 0:
             raise ValueError("Arrays must not be empty")
 
-        # Check for finite values
-        if not np.all(np.isfinite(energy)) or not np.all(np.isfinite(mu)):
-            raise ValueError("Arrays must contain only finite values")
-
-        # Check monotonicity
-        if not np.all(np.diff(energy) > 0):
-            raise ValueError("energy must be monotonically increasing")
-
-        # Calculate first derivative: dμ/dE
-        dmu = np.gradient(mu, energy)
-
-        # Find maximum of derivative (edge position)
-        edge_idx = int(np.argmax(dmu))
+        # Check for finite values and monotonicity
+        if validate:
+            validate_spectrum(energy, mu)
+
+        # Restrict the search to the window, if given
+        offset = 0
+        energy_search = energy
+        mu_search = mu
+        if search_window is not None:
+            window_range = index_range(energy, search_window[0], search_window[1])
+            offset = window_range.start
+            energy_search = energy[window_range]
+            mu_search = mu[window_range]
+            if len(energy_search) < 2:
+                raise ValueError(
+                    f"Insufficient data in search window "
+                    f"[{search_window[0]:.1f}, {search_window[1]:.1f}] eV. "
+                    f"Found {len(energy_search)} points, need at least 2."
+                )
+
+        # Find maximum of first derivative dμ/dE (edge position)
+        local_idx, dmu_local = derivative_peak(energy_search, mu_search)
+        edge_idx = offset + local_idx
 
         # Optional: Refine using interpolation for sub-sample accuracy
         # Use quadratic interpolation around maximum
-        if edge_idx > 0 and edge_idx < len(dmu) - 1:
-            # Fit quadratic to 3 points around maximum
-            x_local = energy[edge_idx - 1 : edge_idx + 2]
-            y_local = dmu[edge_idx - 1 : edge_idx + 2]
-
-            # Quadratic fit: y = ax² + bx + c
-            coeffs = np.polyfit(x_local, y_local, 2)
-
-            # Find maximum of quadratic: x = -b / (2a)
-            if abs(coeffs[0]) > 1e-10:  # Avoid division by zero
-                edge_energy = -coeffs[1] / (2 * coeffs[0])
+        if len(dmu_local) == 3:
+            # Parabola through the 3 points around maximum (Newton form):
+            # y = y0 + d01 * (x - x0) + a * (x - x0) * (x - x1)
+            x0, x1, x2 = energy[edge_idx - 1 : edge_idx + 2]
+            y0, y1, y2 = dmu_local
+            d01 = (y1 - y0) / (x1 - x0)
+            d12 = (y2 - y1) / (x2 - x1)
+            a = (d12 - d01) / (x2 - x0)
+
+            # Find maximum of quadratic: dy/dx = 0
+            if abs(a) > 1e-10:  # Avoid division by zero
+                edge_energy = 0.5 * (x0 + x1) - d01 / (2 * a)
                 # Clamp to valid range
                 edge_energy = np.clip(edge_energy, energy[0], energy[-1])
                 return float(edge_energy)
@@ -88,6 +144,7 @@ class XAFSProcessor:
         e0: float | None = None,
         pre_edge: tuple[float, float] = (-150, -30),
         post_edge: tuple[float, float] = (50, 300),
+        validate: bool = True,
     ) -> NDArray[np.float64]:
         """Perform edge-step normalization.
 
@@ -103,6 +160,8 @@ class XAFSProcessor:
             e0: Edge energy (if None, will be found automatically)
             pre_edge: (start, stop) eV relative to E₀ for pre-edge fit
             post_edge: (start, stop) eV relative to E₀ for post-edge fit
+            validate: Check values are finite and energy is increasing. Pass
+                False for arrays that have already been validated.
 
         Returns:
             Normalized absorption coefficient μ_norm(E)
@@ -118,13 +177,9 @@ class XAFSProcessor:
         if len(energy) == 0:
             raise ValueError("Arrays must not be empty")
 
-        # Check for finite values
-        if not np.all(np.isfinite(energy)) or not np.all(np.isfinite(mu)):
-            raise ValueError("Arrays must contain only finite values")
-
-        # Check monotonicity
-        if not np.all(np.diff(energy) > 0):
-            raise ValueError("energy must be monotonically increasing")
+        # Check for finite values and monotonicity
+        if validate:
+            validate_spectrum(energy, mu)
 
         # Validate pre_edge and post_edge ranges
         if pre_edge[1] >= post_edge[0]:
@@ -133,18 +188,18 @@ class XAFSProcessor:
                 f"pre_edge[1]={pre_edge[1]} >= post_edge[0]={post_edge[0]}"
             )
 
-        # Find E₀ if not provided
+        # Find E₀ if not provided (arrays are already validated)
         if e0 is None:
-            e0 = self.find_edge(energy, mu)
+            e0 = self.find_edge(energy, mu, validate=False)
 
         # Define pre-edge range: [E₀ + pre_edge[0], E₀ + pre_edge[1]]
         pre_start = e0 + pre_edge[0]
         pre_stop = e0 + pre_edge[1]
 
-        # Select pre-edge data
-        pre_mask = (energy >= pre_start) & (energy <= pre_stop)
-        energy_pre = energy[pre_mask]
-        mu_pre = mu[pre_mask]
+        # Select pre-edge data (energy is sorted, so the range is a slice)
+        pre_range = index_range(energy, pre_start, pre_stop)
+        energy_pre = energy[pre_range]
+        mu_pre = mu[pre_range]
 
         if len(energy_pre) < 2:
             raise ValueError(
@@ -153,21 +208,16 @@ class XAFSProcessor:
             )
 
         # Fit linear baseline to pre-edge
-        pre_coeffs = np.polyfit(energy_pre, mu_pre, 1)
-        # Extrapolate to all energies
-        pre_baseline = np.polyval(pre_coeffs, energy)
-
-        # Subtract pre-edge baseline
-        mu_subtracted = mu - pre_baseline
+        pre_slope, pre_intercept = fit_line(energy_pre, mu_pre)
 
         # Define post-edge range: [E₀ + post_edge[0], E₀ + post_edge[1]]
         post_start = e0 + post_edge[0]
         post_stop = e0 + post_edge[1]
 
         # Select post-edge data
-        post_mask = (energy >= post_start) & (energy <= post_stop)
-        energy_post = energy[post_mask]
-        mu_post = mu_subtracted[post_mask]
+        post_range = index_range(energy, post_start, post_stop)
+        energy_post = energy[post_range]
+        mu_post = mu[post_range]
 
         if len(energy_post) < 2:
             raise ValueError(
@@ -176,22 +226,134 @@ class XAFSProcessor:
             )
 
         # Fit linear to post-edge
-        post_coeffs = np.polyfit(energy_post, mu_post, 1)
+        # Least squares is linear in y, so fitting the raw post-edge μ and
+        # subtracting the pre-edge line equals fitting the baseline-subtracted
+        # data, without materializing it
+        post_slope, post_intercept = fit_line(energy_post, mu_post)
 
         # Calculate edge step: Δμ₀ = post_edge_line(E₀) - pre_edge_line(E₀)
-        # Pre-edge line at E₀ is already subtracted (baseline), so it's 0
-        # Post-edge line at E₀: post_coeffs[0] * e0 + post_coeffs[1]
-        edge_step = np.polyval(post_coeffs, e0)
+        edge_step = (post_slope - pre_slope) * e0 + (post_intercept - pre_intercept)
 
         if edge_step <= 0:
             raise ValueError(
                 f"Edge step must be > 0, got {edge_step:.6f}. Check pre_edge and post_edge ranges."
             )
 
-        # Normalize: μ_norm = μ_subtracted / Δμ₀
-        mu_norm = mu_subtracted / edge_step
+        # Subtract pre-edge baseline and normalize: μ_norm = (μ - baseline) / Δμ₀
+        # Built in a single output buffer
+        mu_norm = np.multiply(energy, pre_slope)
+        mu_norm += pre_intercept
+        np.subtract(mu, mu_norm, out=mu_norm)
+        mu_norm /= edge_step
+
+        result: NDArray[np.float64] = mu_norm.astype(np.float64, copy=False)
+        return result
+
+    def normalize_batch(
+        self,
+        energy: NDArray[np.float64],
+        mu_batch: NDArray[np.float64],
+        e0: float | None = None,
+        pre_edge: tuple[float, float] = (-150, -30),
+        post_edge: tuple[float, float] = (50, 300),
+    ) -> NDArray[np.float64]:
+        """Edge-step normalize several spectra measured on one energy grid.
+
+        Repeat scans and XAFS maps share the energy axis, so the pre- and
+        post-edge ranges are located once and the linear baselines of all
+        spectra are solved together with matrix products.
+
+        Args:
+            energy: Energy values in eV (monotonically increasing)
+            mu_batch: Absorption coefficients of shape (n_spectra, len(energy))
+            e0: Edge energy shared by all spectra (if None, found from the
+                mean spectrum)
+            pre_edge: (start, stop) eV relative to E₀ for pre-edge fit
+            post_edge: (start, stop) eV relative to E₀ for post-edge fit
+
+        Returns:
+            Normalized absorption coefficients, same shape as mu_batch
+
+        Raises:
+            ValueError: If mu_batch is not 2-D or does not match energy
+            ValueError: If pre_edge or post_edge ranges are invalid
+            ValueError: If insufficient data in ranges
+            ValueError: If any spectrum has a non-positive edge step
+        """
+        # Input validation
+        if mu_batch.ndim != 2 or mu_batch.shape[1] != len(energy):
+            raise ValueError(
+                f"mu_batch must have shape (n_spectra, {len(energy)}), got {mu_batch.shape}"
+            )
+
+        if len(energy) == 0:
+            raise ValueError("Arrays must not be empty")
+
+        # Check for finite values and monotonicity
+        validate_spectrum(energy, mu_batch)
+
+        # Validate pre_edge and post_edge ranges
+        if pre_edge[1] >= post_edge[0]:
+            raise ValueError(
+                f"pre_edge and post_edge must not overlap: "
+                f"pre_edge[1]={pre_edge[1]} >= post_edge[0]={post_edge[0]}"
+            )
+
+        # Find E₀ if not provided (arrays are already validated)
+        if e0 is None:
+            e0 = self.find_edge(energy, mu_batch.mean(axis=0), validate=False)
+
+        pre_start = e0 + pre_edge[0]
+        pre_stop = e0 + pre_edge[1]
+        pre_range = index_range(energy, pre_start, pre_stop)
+        energy_pre = energy[pre_range]
+
+        if len(energy_pre) < 2:
+            raise ValueError(
+                f"Insufficient data in pre-edge range [{pre_start:.1f}, {pre_stop:.1f}] eV. "
+                f"Found {len(energy_pre)} points, need at least 2."
+            )
+
+        post_start = e0 + post_edge[0]
+        post_stop = e0 + post_edge[1]
+        post_range = index_range(energy, post_start, post_stop)
+        energy_post = energy[post_range]
+
+        if len(energy_post) < 2:
+            raise ValueError(
+                f"Insufficient data in post-edge range [{post_start:.1f}, {post_stop:.1f}] eV. "
+                f"Found {len(energy_post)} points, need at least 2."
+            )
+
+        # Pre-edge lines for all spectra: slope = Σ(x - x̄)·y / Σ(x - x̄)²
+        pre_mean = energy_pre.mean()
+        pre_centered = energy_pre - pre_mean
+        pre_slope = mu_batch[:, pre_range] @ pre_centered / np.dot(pre_centered, pre_centered)
+        pre_intercept = mu_batch[:, pre_range].mean(axis=1) - pre_slope * pre_mean
+
+        # Post-edge lines of the raw spectra, evaluated at E₀ relative to the
+        # pre-edge lines to get each edge step
+        post_mean = energy_post.mean()
+        post_centered = energy_post - post_mean
+        mu_post = mu_batch[:, post_range]
+        post_slope = mu_post @ post_centered / np.dot(post_centered, post_centered)
+        post_at_e0 = mu_post.mean(axis=1) + post_slope * (e0 - post_mean)
+        edge_step = post_at_e0 - (pre_slope * e0 + pre_intercept)
+
+        bad = np.flatnonzero(edge_step <= 0)
+        if len(bad) > 0:
+            raise ValueError(
+                f"Edge step must be > 0, got {edge_step[bad[0]]:.6f} for spectrum {bad[0]}. "
+                "Check pre_edge and post_edge ranges."
+            )
 
-        result: NDArray[np.float64] = mu_norm.astype(np.float64)
+        # Subtract pre-edge baselines and normalize: μ_norm = (μ - baseline) / Δμ₀
+        mu_norm = np.multiply.outer(pre_slope, energy)
+        mu_norm += pre_intercept[:, np.newaxis]
+        np.subtract(mu_batch, mu_norm, out=mu_norm)
+        mu_norm /= edge_step[:, np.newaxis]
+
+        result: NDArray[np.float64] = mu_norm
         return result
 
     def extract_chi(
@@ -208,14 +370,17 @@ class XAFSProcessor:
         Process:
         1. Convert E to k: k = √(0.262465 * (E - E₀))
         2. Select k range: [kmin, kmax]
-        3. Fit spline background: μ₀(k) using UnivariateSpline
+        3. Fit spline background: μ₀(k) using a least-squares cubic spline
+           with knots every π / (2 * rbkg) Å⁻¹ (Autobk convention), fewer
+           where the data are too sparse to constrain them
         4. Calculate chi: χ(k) = (μ_norm(k) - μ₀(k)) / μ₀(k)
 
         Args:
-            energy: Energy values in eV
+            energy: Energy values in eV (monotonically increasing)
             mu_norm: Normalized absorption coefficient
             e0: Edge energy in eV
-            rbkg: Spline node spacing in Å (controls flexibility)
+            rbkg: Background cutoff distance in Å; sets the spline knot
+                spacing in k (larger is more flexible)
             kmin: Minimum k value in Å⁻¹
             kmax: Maximum k value in Å⁻¹
 
@@ -241,14 +406,14 @@ class XAFSProcessor:
         if rbkg <= 0:
             raise ValueError(f"rbkg must be > 0, got {rbkg}")
 
-        # Convert E to k: k = √(0.262465 * (E - E₀))
-        # 0.262465 = 2m_e / ℏ² conversion factor for eV -> Å⁻¹
-        k = np.sqrt(0.262465 * (energy - e0))
+        # Convert E to k above the edge: k = √(0.262465 * (E - E₀))
+        edge_idx = int(np.searchsorted(energy, e0, side="left"))
+        k = energy_to_k(energy[edge_idx:], e0)
 
-        # Mask k range: [kmin, kmax]
-        k_mask = (k >= kmin) & (k <= kmax)
-        k_sel = k[k_mask]
-        mu_norm_sel = mu_norm[k_mask]
+        # Select k range: [kmin, kmax] (k is increasing, so this is a slice)
+        k_range = index_range(k, kmin, kmax)
+        k_sel = k[k_range]
+        mu_norm_sel = mu_norm[edge_idx:][k_range]
 
         if len(k_sel) < 3:
             raise ValueError(
@@ -257,27 +422,27 @@ class XAFSProcessor:
             )
 
         # Fit spline background
-        # Smoothing parameter s: larger s = smoother spline
-        # Approximate: s ≈ len(k) * rbkg for reasonable smoothing
-        smoothing = len(k_sel) * rbkg * 0.1  # Scale factor for reasonable smoothing
+        # Knots spaced π / (2 * rbkg) cannot follow structure beyond R = rbkg.
+        # Fixed knots make the fit a single linear least-squares solve instead
+        # of FITPACK's iterative knot search; coarse data get fewer knots
+        knots = spline_knots(k_sel, np.pi / (2 * rbkg))
 
         try:
-            spline = interpolate.UnivariateSpline(
-                k_sel, mu_norm_sel, s=smoothing, ext="extrapolate"
-            )
+            spline = interpolate.LSQUnivariateSpline(k_sel, mu_norm_sel, t=knots, ext="extrapolate")
         except Exception as e:
             raise ValueError(f"Spline fitting failed: {e}") from e
 
         # Calculate background: μ₀(k)
         mu0 = spline(k_sel)
 
-        # Avoid division by zero
-        mu0 = np.maximum(mu0, 1e-10)
+        # Avoid division by zero (spline output is ours, so clamp in place)
+        np.maximum(mu0, 1e-10, out=mu0)
 
         # Calculate chi: χ(k) = (μ_norm(k) - μ₀(k)) / μ₀(k)
-        chi = (mu_norm_sel - mu0) / mu0
+        chi = np.subtract(mu_norm_sel, mu0)
+        chi /= mu0
 
-        return (k_sel.astype(np.float64), chi.astype(np.float64))
+        return (k_sel.astype(np.float64, copy=False), chi.astype(np.float64, copy=False))
 
     def fourier_transform(
         self,
@@ -288,6 +453,7 @@ class XAFSProcessor:
         kweight: int = 2,
         window: Literal["hanning", "kaiser", "tukey"] = "hanning",
         dk: float = 0.05,
+        precision: Literal["float32", "float64"] = "float64",
     ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
         """Fourier transform χ(k) to R-space.
 
@@ -300,13 +466,16 @@ class XAFSProcessor:
         6. Calculate magnitude: |χ(R)|
 
         Args:
-            k: Wavenumber array in Å⁻¹
+            k: Wavenumber array in Å⁻¹ (monotonically increasing)
             chi: χ(k) array
             kmin: Minimum k for transform
             kmax: Maximum k for transform
             kweight: k-weighting exponent (0, 1, 2, or 3)
             window: Windowing function type
             dk: k-grid spacing for interpolation (Å⁻¹)
+            precision: Floating-point precision of the FFT. "float32" halves
+                memory traffic and is ample for |χ(R)| display and fitting;
+                results are returned as float64 either way.
 
         Returns:
             Tuple of (R, chi_R_magnitude) arrays
@@ -314,11 +483,149 @@ class XAFSProcessor:
         Raises:
             ValueError: If kweight not in [0, 1, 2, 3]
             ValueError: If window type invalid
+            ValueError: If precision invalid
         """
         # Input validation
         if len(k) != len(chi):
             raise ValueError(f"Arrays must have same length: k={len(k)}, chi={len(chi)}")
 
+        r_out, chi_r_out = self._transform_to_r(
+            k, chi[np.newaxis, :], kmin, kmax, kweight, window, dk, precision
+        )
+        return (r_out, chi_r_out[0])
+
+    def fourier_transform_batch(
+        self,
+        k: NDArray[np.float64],
+        chi_batch: NDArray[np.float64],
+        kmin: float = 2.0,
+        kmax: float = 12.0,
+        kweight: int = 2,
+        window: Literal["hanning", "kaiser", "tukey"] = "hanning",
+        dk: float = 0.05,
+        precision: Literal["float32", "float64"] = "float64",
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Fourier transform several χ(k) spectra sharing one k grid.
+
+        Equivalent to calling fourier_transform on each row, but the k
+        selection, window, interpolation weights and FFT plan are built once
+        and the FFT runs over all spectra in a single batched call.
+
+        Args:
+            k: Wavenumber array in Å⁻¹ (monotonically increasing)
+            chi_batch: χ(k) array of shape (n_spectra, len(k))
+            kmin: Minimum k for transform
+            kmax: Maximum k for transform
+            kweight: k-weighting exponent (0, 1, 2, or 3)
+            window: Windowing function type
+            dk: k-grid spacing for interpolation (Å⁻¹)
+            precision: Floating-point precision of the FFT
+
+        Returns:
+            Tuple of (R, chi_R_magnitude) arrays, with chi_R_magnitude of
+            shape (n_spectra, len(R))
+
+        Raises:
+            ValueError: If chi_batch is not 2-D or does not match k
+            ValueError: If kweight not in [0, 1, 2, 3]
+            ValueError: If window type invalid
+            ValueError: If precision invalid
+        """
+        # Input validation
+        if chi_batch.ndim != 2 or chi_batch.shape[1] != len(k):
+            raise ValueError(
+                f"chi_batch must have shape (n_spectra, {len(k)}), got {chi_batch.shape}"
+            )
+
+        return self._transform_to_r(k, chi_batch, kmin, kmax, kweight, window, dk, precision)
+
+    def process(
+        self,
+        energy: NDArray[np.float64],
+        mu: NDArray[np.float64],
+        e0: float | None = None,
+        pre_edge: tuple[float, float] = (-150, -30),
+        post_edge: tuple[float, float] = (50, 300),
+        rbkg: float = 1.0,
+        kmin: float = 2.0,
+        kmax: float = 12.0,
+        kweight: int = 2,
+        window: Literal["hanning", "kaiser", "tukey"] = "hanning",
+        dk: float = 0.05,
+    ) -> XAFSResult:
+        """Run edge finding, normalization, χ(k) extraction and FFT in one call.
+
+        The input arrays are validated once up front rather than by every
+        stage, so this is the cheapest way to analyze a single spectrum.
+
+        Args:
+            energy: Energy values in eV (monotonically increasing)
+            mu: Absorption coefficient μ(E)
+            e0: Edge energy (if None, will be found automatically)
+            pre_edge: (start, stop) eV relative to E₀ for pre-edge fit
+            post_edge: (start, stop) eV relative to E₀ for post-edge fit
+            rbkg: Background cutoff distance in Å
+            kmin: Minimum k value in Å⁻¹
+            kmax: Maximum k value in Å⁻¹
+            kweight: k-weighting exponent (0, 1, 2, or 3)
+            window: Windowing function type
+            dk: k-grid spacing for interpolation (Å⁻¹)
+
+        Returns:
+            XAFSResult with intermediate and final arrays
+
+        Raises:
+            ValueError: If any stage rejects its inputs
+        """
+        # Input validation
+        if len(energy) != len(mu):
+            raise ValueError(f"Arrays must have same length: energy={len(energy)}, mu={len(mu)}")
+
+        if len(energy) == 0:
+            raise ValueError("Arrays must not be empty")
+
+        # Check for finite values and monotonicity
+        validate_spectrum(energy, mu)
+
+        if e0 is None:
+            e0 = self.find_edge(energy, mu, validate=False)
+
+        mu_norm = self.normalize(
+            energy, mu, e0=e0, pre_edge=pre_edge, post_edge=post_edge, validate=False
+        )
+        k, chi = self.extract_chi(energy, mu_norm, e0, rbkg=rbkg, kmin=kmin, kmax=kmax)
+        r, chi_r = self.fourier_transform(
+            k, chi, kmin=kmin, kmax=kmax, kweight=kweight, window=window, dk=dk
+        )
+
+        return XAFSResult(e0=e0, mu_norm=mu_norm, k=k, chi=chi, r=r, chi_r=chi_r)
+
+    def _transform_to_r(
+        self,
+        k: NDArray[np.float64],
+        chi: NDArray[np.float64],
+        kmin: float,
+        kmax: float,
+        kweight: int,
+        window: Literal["hanning", "kaiser", "tukey"],
+        dk: float,
+        precision: Literal["float32", "float64"],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Fourier transform rows of a 2-D χ(k) array to R-space.
+
+        Args:
+            k: Wavenumber array in Å⁻¹ (monotonically increasing)
+            chi: χ(k) array of shape (n_spectra, len(k))
+            kmin: Minimum k for transform
+            kmax: Maximum k for transform
+            kweight: k-weighting exponent
+            window: Windowing function type
+            dk: k-grid spacing for interpolation (Å⁻¹)
+            precision: Floating-point precision of the FFT
+
+        Returns:
+            Tuple of (R, chi_R_magnitude) with one magnitude row per spectrum
+        """
         if len(k) == 0:
             raise ValueError("Arrays must not be empty")
 
@@ -331,10 +638,13 @@ class XAFSProcessor:
         if dk <= 0:
             raise ValueError(f"dk must be > 0, got {dk}")
 
-        # Mask k range
-        k_mask = (k >= kmin) & (k <= kmax)
-        k_sel = k[k_mask]
-        chi_sel = chi[k_mask]
+        if precision not in ("float32", "float64"):
+            raise ValueError(f"precision must be 'float32' or 'float64', got {precision}")
+
+        # Select k range (k is increasing, so this is a slice)
+        k_range = index_range(k, kmin, kmax)
+        k_sel = k[k_range]
+        chi_sel = chi[:, k_range]
 
         if len(k_sel) < 2:
             raise ValueError(
@@ -342,58 +652,38 @@ class XAFSProcessor:
                 f"Found {len(k_sel)} points, need at least 2."
             )
 
-        # Apply k-weighting: chi_weighted = k^n * chi
-        chi_weighted = k_sel**kweight * chi_sel
-
-        # Create and apply window
-        window_func = self._get_window_function(window, len(chi_weighted))
-        chi_windowed = chi_weighted * window_func
-
-        # Interpolate to uniform k-grid
+        # Create window and apply it together with k-weighting: k^n * chi * w(k)
+        # kweight is a small integer, so repeated in-place multiplies into one
+        # buffer replace the generic power and its temporaries
+        window_func = get_window_function(window, len(k_sel))
+        chi_windowed = np.multiply(chi_sel, window_func)
+        for _ in range(kweight):
+            np.multiply(chi_windowed, k_sel, out=chi_windowed)
+
+        # Interpolate to uniform k-grid (in the requested FFT precision)
+        # Linear weights depend only on k, so they are shared by all spectra;
+        # clipping reproduces np.interp's constant extrapolation at the ends
         k_grid = np.arange(kmin, kmax + dk, dk)
-        chi_interp = np.interp(k_grid, k_sel, chi_windowed)
+        lo = np.clip(np.searchsorted(k_sel, k_grid, side="right") - 1, 0, len(k_sel) - 2)
+        frac = np.clip((k_grid - k_sel[lo]) / (k_sel[lo + 1] - k_sel[lo]), 0.0, 1.0)
+        chi_interp = chi_windowed[:, lo] * (1.0 - frac) + chi_windowed[:, lo + 1] * frac
+        chi_interp = chi_interp.astype(precision, copy=False)
 
         # Zero-pad for better FFT resolution
         # Pad to next power of 2 for efficiency
-        n_pad = 2 ** int(np.ceil(np.log2(len(chi_interp))))
-        chi_padded = np.pad(chi_interp, (0, n_pad - len(chi_interp)), mode="constant")
+        n_pad = 2 ** int(np.ceil(np.log2(len(k_grid))))
 
-        # FFT to R-space
-        chi_r_complex = fft.fft(chi_padded)
+        # FFT to R-space (rfft zero-pads to n_pad internally)
+        # chi is real, so the real FFT yields only the non-negative R half.
+        # Spectra are spread over all cores, and chi_interp is a scratch
+        # buffer pocketfft may reuse
+        chi_r_complex = fft.rfft(chi_interp, n=n_pad, axis=-1, workers=-1, overwrite_x=True)
 
-        # Calculate r: r = fftfreq * 2π / dk
+        # Calculate r: r = rfftfreq * 2π / dk
         # dk is the spacing in k-space
-        r_space = np.fft.fftfreq(len(chi_padded), dk) * 2 * np.pi
+        r_out = np.fft.rfftfreq(n_pad, dk) * 2 * np.pi
 
         # Calculate magnitude: |χ(R)|
-        chi_r_mag = np.abs(chi_r_complex)
-
-        # Return only positive R values
-        r_positive = r_space >= 0
-        r_out = r_space[r_positive]
-        chi_r_out = chi_r_mag[r_positive]
-
-        return (r_out.astype(np.float64), chi_r_out.astype(np.float64))
-
-    def _get_window_function(
-        self, window_type: Literal["hanning", "kaiser", "tukey"], length: int
-    ) -> NDArray[np.float64]:
-        """Get windowing function for XAFS Fourier transform.
-
-        Args:
-            window_type: Type of window
-            length: Length of window array
+        chi_r_out = np.abs(chi_r_complex)
 
-        Returns:
-            Window function array
-        """
-        if window_type == "hanning":
-            return signal.windows.hann(length).astype(np.float64)
-        elif window_type == "kaiser":
-            # Beta parameter for Kaiser window (typical: 5-10)
-            return signal.windows.kaiser(length, beta=8.0).astype(np.float64)
-        elif window_type == "tukey":
-            # Alpha parameter for Tukey window (typical: 0.1-0.2)
-            return signal.windows.tukey(length, alpha=0.1).astype(np.float64)
-        else:
-            raise ValueError(f"Unknown window type: {window_type}")
+        return (r_out.astype(np.float64, copy=False), chi_r_out.astype(np.float64, copy=False))
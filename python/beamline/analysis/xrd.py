@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import math
+import warnings
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, overload
 
 import numpy as np
 from numpy.typing import NDArray
 from scipy import optimize, signal
 
+from beamline.analysis._kernels import validate_spectrum
 
-@dataclass
+# Gaussian sigma per unit FWHM: FWHM = 2 * sqrt(2 * ln(2)) * sigma
+_FWHM_TO_SIGMA = 1.0 / (2.0 * math.sqrt(2.0 * math.log(2.0)))
+
+
+@dataclass(slots=True)
 class Peak:
     """Represents a diffraction peak.
 
@@ -96,13 +105,8 @@ class XRDAnalyzer:
         if len(two_theta) == 0:
             return []
 
-        # Check for finite values
-        if not np.all(np.isfinite(two_theta)) or not np.all(np.isfinite(intensity)):
-            raise ValueError("Arrays must contain only finite values")
-
-        # Check monotonicity
-        if not np.all(np.diff(two_theta) > 0):
-            raise ValueError("two_theta must be monotonically increasing")
+        # Check for finite values and monotonicity in a single pass
+        validate_spectrum(two_theta, intensity, x_name="two_theta")
 
         # Validate parameters
         if prominence <= 0:
@@ -129,85 +133,87 @@ class XRDAnalyzer:
         if len(peak_indices) == 0:
             return []
 
-        # Calculate FWHM for each peak
-        peaks: list[Peak] = []
-        for idx in peak_indices:
-            peak_pos = two_theta[idx]
-            peak_intensity = intensity[idx]
-
-            # Calculate FWHM using interpolation
-            fwhm = self._calculate_fwhm(two_theta, intensity, int(idx))
-
-            peaks.append(
-                Peak(
-                    position=float(peak_pos),
-                    intensity=float(peak_intensity),
-                    fwhm=fwhm,
-                    hkl_indices=None,
-                )
+        # Calculate FWHM for all peaks at once
+        fwhms = self._calculate_fwhm(two_theta, intensity, peak_indices)
+
+        peaks = [
+            Peak(position=pos, intensity=height, fwhm=fwhm, hkl_indices=None)
+            for pos, height, fwhm in zip(
+                two_theta[peak_indices].tolist(),
+                intensity[peak_indices].tolist(),
+                fwhms.tolist(),
+                strict=True,
             )
+        ]
 
-        # Sort by position
-        peaks.sort(key=lambda p: p.position)
+        # scipy returns peak indices in increasing order and two_theta is
+        # increasing, so the peaks are already sorted by position
         return peaks
 
     def _calculate_fwhm(
         self,
         two_theta: NDArray[np.float64],
         intensity: NDArray[np.float64],
-        peak_idx: int,
-    ) -> float:
-        """Calculate FWHM for a peak using interpolation.
+        peak_indices: NDArray[np.intp],
+    ) -> NDArray[np.float64]:
+        """Calculate FWHM for a set of peaks using interpolation.
+
+        The half-maximum crossings are found with scipy.signal.peak_widths,
+        walking outward from each peak to the first sample at or below half
+        the peak intensity and interpolating linearly in two-theta.
 
         Args:
             two_theta: Two-theta array
             intensity: Intensity array
-            peak_idx: Index of peak center
+            peak_indices: Indices of peak centers
 
         Returns:
-            FWHM in degrees
+            FWHM in degrees for each peak
         """
-        peak_intensity = intensity[peak_idx]
-        half_max = peak_intensity / 2.0
-
-        # Find left half-maximum point
-        left_idx = peak_idx
-        while left_idx > 0 and intensity[left_idx] > half_max:
-            left_idx -= 1
-
-        if left_idx < peak_idx:
-            # Interpolate left side
-            if left_idx >= 0:
-                left_theta = np.interp(
-                    half_max,
-                    intensity[left_idx : left_idx + 2],
-                    two_theta[left_idx : left_idx + 2],
-                )
-            else:
-                left_theta = two_theta[0]
-        else:
-            left_theta = two_theta[peak_idx]
-
-        # Find right half-maximum point
-        right_idx = peak_idx
-        while right_idx < len(intensity) - 1 and intensity[right_idx] > half_max:
-            right_idx += 1
-
-        if right_idx > peak_idx:
-            # Interpolate right side
-            if right_idx < len(intensity):
-                right_theta = np.interp(
-                    half_max,
-                    intensity[right_idx - 1 : right_idx + 1][::-1],
-                    two_theta[right_idx - 1 : right_idx + 1][::-1],
-                )
-            else:
-                right_theta = two_theta[-1]
-        else:
-            right_theta = two_theta[peak_idx]
+        # Measuring against a "prominence" equal to the peak intensity puts the
+        # reference line at half the absolute maximum; non-positive peaks get
+        # zero width. Searching to the array ends matches a full-range scan.
+        n_peaks = len(peak_indices)
+        prominence_data = (
+            np.maximum(intensity[peak_indices], 0.0),
+            np.zeros(n_peaks, dtype=np.intp),
+            np.full(n_peaks, len(intensity) - 1, dtype=np.intp),
+        )
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="some peaks have a width of 0")
+            _, _, left_ips, right_ips = signal.peak_widths(
+                intensity, peak_indices, rel_height=0.5, prominence_data=prominence_data
+            )
+
+        left_theta = self._theta_at(two_theta, left_ips)
+        right_theta = self._theta_at(two_theta, right_ips)
+
+        fwhm: NDArray[np.float64] = np.abs(right_theta - left_theta)
+        return fwhm
+
+    def _theta_at(
+        self,
+        two_theta: NDArray[np.float64],
+        positions: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Linearly interpolate two-theta at fractional sample positions.
+
+        The bracketing samples are known from the integer part of each
+        position, so this indexes directly rather than searching as np.interp
+        would.
+
+        Args:
+            two_theta: Two-theta array (at least two samples)
+            positions: Fractional indices in [0, len(two_theta) - 1]
 
-        fwhm = abs(right_theta - left_theta)
-        return float(fwhm)
+        Returns:
+            Two-theta at each position
+        """
+        lower = np.minimum(positions.astype(np.intp), len(two_theta) - 2)
+        frac = positions - lower
+        theta_lower = two_theta[lower]
+        theta: NDArray[np.float64] = theta_lower + frac * (two_theta[lower + 1] - theta_lower)
+        return theta
 
     def fit_peak(
         self,
@@ -217,6 +223,7 @@ class XRDAnalyzer:
         width: float = 1.0,
         model: Literal["gaussian", "lorentzian", "pseudo_voigt"] = "gaussian",
         background_order: int = 1,
+        fit_window_factor: float | None = None,
     ) -> FitResult:
         """Fit peak profile using specified model.
 
@@ -232,13 +239,18 @@ class XRDAnalyzer:
             width: Initial guess for peak width (FWHM)
             model: Profile model type
             background_order: Polynomial order for background (0=constant, 1=linear)
+            fit_window_factor: Fit only samples within this many widths of center
+                (at least 3 degrees either side); None (default) fits the full arrays
 
         Returns:
-            FitResult with fitted parameters and uncertainties
+            FitResult with fitted parameters and uncertainties. The background is
+            reported at the mean two-theta of the fitted samples, i.e. of the
+            window when fit_window_factor is set.
 
         Raises:
             ValueError: If model type is invalid
             ValueError: If arrays have different lengths
+            ValueError: If fit_window_factor <= 0 or the window holds no data
             RuntimeError: If fitting fails to converge
         """
         # Input validation
@@ -260,28 +272,49 @@ class XRDAnalyzer:
         if width <= 0:
             raise ValueError(f"width must be > 0, got {width}")
 
-        # Get model function
+        if fit_window_factor is not None and fit_window_factor <= 0:
+            raise ValueError(f"fit_window_factor must be > 0, got {fit_window_factor}")
+
+        # Restrict the fit to where the peak is non-negligible; the rest of the
+        # scan only costs model evaluations
+        if fit_window_factor is not None:
+            half_window = max(fit_window_factor * width, 3.0)
+            in_window = np.abs(two_theta - center) <= half_window
+            two_theta = two_theta[in_window]
+            intensity = intensity[in_window]
+            if len(two_theta) == 0:
+                raise ValueError(f"No data within {half_window} degrees of center {center}")
+
+        # Get model function and its analytic Jacobian
+        model_func: Callable[..., NDArray[np.float64]]
+        jac_func: Callable[..., NDArray[np.float64]]
         if model == "gaussian":
             model_func = self._gaussian_model
+            jac_func = self._gaussian_jac
         elif model == "lorentzian":
             model_func = self._lorentzian_model
+            jac_func = self._lorentzian_jac
         else:  # pseudo_voigt
             model_func = self._pseudo_voigt_model
+            jac_func = self._pseudo_voigt_jac
 
-        # Initial parameter guesses
-        max_intensity = np.max(intensity)
-        min_intensity = np.min(intensity)
+        # Initial parameter guesses, as Python floats for cheap scalar math
+        max_intensity = float(intensity.max())
+        min_intensity = float(intensity.min())
+        theta_first = float(two_theta[0])
+        theta_last = float(two_theta[-1])
+        theta_mean = float(two_theta.mean())
 
         # Estimate background from edges
         n_edge = min(10, len(intensity) // 10)
         if n_edge > 0:
-            left_bg = np.mean(intensity[:n_edge])
-            right_bg = np.mean(intensity[-n_edge:])
-            bg_slope = (right_bg - left_bg) / (two_theta[-1] - two_theta[0])
-            bg_intercept = left_bg - bg_slope * two_theta[0]
+            left_bg = float(intensity[:n_edge].mean())
+            right_bg = float(intensity[-n_edge:].mean())
+            bg_slope = (right_bg - left_bg) / (theta_last - theta_first)
+            bg_intercept = left_bg - bg_slope * theta_first
         else:
             bg_slope = 0.0
-            bg_intercept = np.mean(intensity)
+            bg_intercept = float(intensity.mean())
 
         # Build initial parameter vector
         if model == "pseudo_voigt":
@@ -322,21 +355,49 @@ class XRDAnalyzer:
             lower_bounds.append(-bg_range)
             upper_bounds.append(bg_range)
 
+        def residuals(p: NDArray[np.float64]) -> NDArray[np.float64]:
+            r = model_func(two_theta, *p)
+            r -= intensity
+            return r
+
+        def jacobian(p: NDArray[np.float64]) -> NDArray[np.float64]:
+            return jac_func(two_theta, *p)
+
         # Perform fit
         try:
-            popt, pcov = optimize.curve_fit(
-                lambda x, *p: model_func(x, np.array(p, dtype=np.float64), background_order),
-                two_theta,
-                intensity,
-                p0=p0,
+            fit = optimize.least_squares(
+                residuals,
+                p0,
+                jac=jacobian,
                 bounds=(lower_bounds, upper_bounds),
-                maxfev=10000,
+                ftol=1e-6,
+                xtol=1e-6,
+                x_scale="jac",
+                max_nfev=10000,
             )
-        except optimize.OptimizeWarning as e:
-            raise RuntimeError(f"Peak fitting failed to converge: {e}") from e
         except Exception as e:
             raise RuntimeError(f"Peak fitting error: {e}") from e
 
+        if not fit.success:
+            raise RuntimeError(f"Peak fitting failed to converge: {fit.message}")
+
+        popt = fit.x
+
+        # Reduced chi-squared from the final cost (cost = 0.5 * sum(residuals**2))
+        dof = len(intensity) - len(popt)
+        chi_squared = 2.0 * float(fit.cost) / dof if dof > 0 else float("inf")
+
+        # Covariance from the Jacobian at the solution, pcov = chi2 * (J^T J)^-1,
+        # via SVD with small singular values dropped as curve_fit does
+        if dof > 0:
+            jac = np.asarray(fit.jac)
+            _, s, vt = np.linalg.svd(jac, full_matrices=False)
+            keep = s > np.finfo(np.float64).eps * max(jac.shape) * s[0]
+            vt = vt[keep]
+            pcov = (vt.T / s[keep] ** 2) @ vt * chi_squared
+        else:
+            pcov = np.full((len(popt), len(popt)), np.inf)
+
         # Calculate uncertainties
         uncertainties_dict: dict[str, float] = {}
         param_names = ["center", "amplitude", "width"]
@@ -354,27 +415,21 @@ class XRDAnalyzer:
             if idx < len(popt):
                 uncertainties_dict[f"background_{i}"] = float(np.sqrt(pcov[idx, idx]))
 
-        # Calculate chi-squared
-        y_fit = model_func(two_theta, popt, background_order)
-        residuals = intensity - y_fit
-        chi_squared = float(np.sum(residuals**2) / (len(intensity) - len(popt)))
-
         # Extract parameters
         center_fit = float(popt[0])
         amplitude_fit = float(popt[1])
         width_fit = float(popt[2])
 
-        # Background
-        bg_idx = 3 if model == "pseudo_voigt" else 3
+        # Background evaluated at the mean two-theta of the fitted samples; the
+        # polynomial says nothing about the pattern outside the window
+        bg_coeffs = popt[bg_start:].tolist()
         if background_order == 0:
-            background_fit = float(popt[bg_idx])
+            background_fit = bg_coeffs[0]
         elif background_order == 1:
-            background_fit = float(popt[bg_idx] + popt[bg_idx + 1] * np.mean(two_theta))
+            background_fit = bg_coeffs[0] + bg_coeffs[1] * theta_mean
         else:
-            background_fit = float(
-                popt[bg_idx]
-                + popt[bg_idx + 1] * np.mean(two_theta)
-                + popt[bg_idx + 2] * np.mean(two_theta) ** 2
+            background_fit = (
+                bg_coeffs[0] + bg_coeffs[1] * theta_mean + bg_coeffs[2] * theta_mean * theta_mean
             )
 
         return FitResult(
@@ -387,193 +442,495 @@ class XRDAnalyzer:
             uncertainties=uncertainties_dict,
         )
 
+    def fit_peaks(
+        self,
+        two_theta: NDArray[np.float64],
+        intensity: NDArray[np.float64],
+        centers: Sequence[float],
+        widths: float | Sequence[float] = 1.0,
+        model: Literal["gaussian", "lorentzian", "pseudo_voigt"] = "gaussian",
+        background_order: int = 1,
+        fit_window_factor: float | None = 5.0,
+        max_workers: int | None = None,
+    ) -> list[FitResult]:
+        """Fit several peaks of one pattern independently and in parallel.
+
+        Each peak is fitted with fit_peak on its own local window of the
+        shared arrays. The fits run on a thread pool since the least-squares
+        linear algebra releases the GIL.
+
+        Args:
+            two_theta: Two-theta angles in degrees (monotonically increasing)
+            intensity: Intensity values
+            centers: Initial guesses for the peak centers
+            widths: Initial guess for the peak width (FWHM), shared or per peak
+            model: Profile model type
+            background_order: Polynomial order for each local background
+            fit_window_factor: Fit window half-width in peak widths (see fit_peak)
+            max_workers: Maximum number of fitting threads (default: executor default)
+
+        Returns:
+            FitResult for each center, in the order given
+
+        Raises:
+            ValueError: If arrays have different lengths or invalid values
+            ValueError: If widths does not match centers in length
+            ValueError: If fit_window_factor <= 0
+            RuntimeError: If any fit fails to converge
+        """
+        if len(two_theta) != len(intensity):
+            raise ValueError(
+                f"Arrays must have same length: two_theta={len(two_theta)}, "
+                f"intensity={len(intensity)}"
+            )
+
+        if len(two_theta) == 0:
+            raise ValueError("Arrays must not be empty")
+
+        if fit_window_factor is not None and fit_window_factor <= 0:
+            raise ValueError(f"fit_window_factor must be > 0, got {fit_window_factor}")
+
+        if isinstance(widths, int | float):
+            width_list = [float(widths)] * len(centers)
+        else:
+            width_list = [float(w) for w in widths]
+        if len(width_list) != len(centers):
+            raise ValueError(
+                f"widths and centers must have same length: {len(width_list)} vs {len(centers)}"
+            )
+
+        validate_spectrum(two_theta, intensity, x_name="two_theta")
+
+        if not centers:
+            return []
+
+        def fit_one(center: float, width: float) -> FitResult:
+            return self.fit_peak(
+                two_theta,
+                intensity,
+                center=center,
+                width=width,
+                model=model,
+                background_order=background_order,
+                fit_window_factor=fit_window_factor,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fit_one, centers, width_list))
+
     def _gaussian_model(
         self,
         x: NDArray[np.float64],
-        params: NDArray[np.float64],
-        background_order: int,
+        center: float,
+        amplitude: float,
+        width: float,
+        *bg_coeffs: float,
     ) -> NDArray[np.float64]:
         """Gaussian peak model: A * exp(-0.5 * ((x - μ) / σ)²).
 
         Args:
             x: Two-theta values
-            params: [center, amplitude, width, background...]
-            background_order: Background polynomial order
+            center: Peak center
+            amplitude: Peak amplitude
+            width: Peak FWHM
+            *bg_coeffs: Background polynomial coefficients, constant term first
 
         Returns:
             Model intensity values
         """
-        center = params[0]
-        amplitude = params[1]
-        width = params[2]  # FWHM
-
         # Convert FWHM to sigma: FWHM = 2 * sqrt(2 * ln(2)) * sigma
-        sigma = width / (2 * np.sqrt(2 * np.log(2)))
+        sigma = width * _FWHM_TO_SIGMA
 
-        # Gaussian profile
-        profile = amplitude * np.exp(-0.5 * ((x - center) / sigma) ** 2)
+        # Gaussian profile, evaluated in a single buffer
+        profile: NDArray[np.float64] = np.subtract(x, center)
+        np.square(profile, out=profile)
+        profile *= -0.5 / (sigma * sigma)
+        np.exp(profile, out=profile)
+        profile *= amplitude
 
         # Add background
-        bg_start = 3
-        background = self._calculate_background(x, params, bg_start, background_order)
-
-        result: NDArray[np.float64] = (profile + background).astype(np.float64)
-        return result
+        self._calculate_background(x, bg_coeffs, out=profile)
+        return profile
 
     def _lorentzian_model(
         self,
         x: NDArray[np.float64],
-        params: NDArray[np.float64],
-        background_order: int,
+        center: float,
+        amplitude: float,
+        width: float,
+        *bg_coeffs: float,
     ) -> NDArray[np.float64]:
         """Lorentzian peak model: A / (1 + ((x - μ) / γ)²).
 
         Args:
             x: Two-theta values
-            params: [center, amplitude, width, background...]
-            background_order: Background polynomial order
+            center: Peak center
+            amplitude: Peak amplitude
+            width: Peak FWHM
+            *bg_coeffs: Background polynomial coefficients, constant term first
 
         Returns:
             Model intensity values
         """
-        center = params[0]
-        amplitude = params[1]
-        width = params[2]  # FWHM
-
         # Convert FWHM to gamma: FWHM = 2 * gamma
         gamma = width / 2.0
 
-        # Lorentzian profile
-        profile = amplitude / (1 + ((x - center) / gamma) ** 2)
+        # Lorentzian profile, evaluated in a single buffer
+        profile: NDArray[np.float64] = np.subtract(x, center)
+        np.square(profile, out=profile)
+        profile *= 1.0 / (gamma * gamma)
+        profile += 1.0
+        np.divide(amplitude, profile, out=profile)
 
         # Add background
-        bg_start = 3
-        background = self._calculate_background(x, params, bg_start, background_order)
-
-        result: NDArray[np.float64] = (profile + background).astype(np.float64)
-        return result
+        self._calculate_background(x, bg_coeffs, out=profile)
+        return profile
 
     def _pseudo_voigt_model(
         self,
         x: NDArray[np.float64],
-        params: NDArray[np.float64],
-        background_order: int,
+        center: float,
+        amplitude: float,
+        width: float,
+        eta: float,
+        *bg_coeffs: float,
     ) -> NDArray[np.float64]:
         """Pseudo-Voigt peak model: η * Gaussian + (1 - η) * Lorentzian.
 
         Args:
             x: Two-theta values
-            params: [center, amplitude, width, eta, background...]
-            background_order: Background polynomial order
+            center: Peak center
+            amplitude: Peak amplitude
+            width: Peak FWHM
+            eta: Mixing parameter in [0, 1]
+            *bg_coeffs: Background polynomial coefficients, constant term first
 
         Returns:
             Model intensity values
         """
-        center = params[0]
-        amplitude = params[1]
-        width = params[2]  # FWHM
-        eta = params[3]  # Mixing parameter [0, 1]
-
         # Convert FWHM to sigma and gamma
-        sigma = width / (2 * np.sqrt(2 * np.log(2)))
+        sigma = width * _FWHM_TO_SIGMA
         gamma = width / 2.0
 
-        # Gaussian component
-        gaussian = amplitude * np.exp(-0.5 * ((x - center) / sigma) ** 2)
+        # Squared offset from the center, shared by both components
+        lorentzian = np.subtract(x, center)
+        np.square(lorentzian, out=lorentzian)
+
+        # Gaussian component, pre-scaled by its mixing weight
+        profile: NDArray[np.float64] = np.multiply(lorentzian, -0.5 / (sigma * sigma))
+        np.exp(profile, out=profile)
+        profile *= eta * amplitude
 
-        # Lorentzian component
-        lorentzian = amplitude / (1 + ((x - center) / gamma) ** 2)
+        # Lorentzian component, pre-scaled by its mixing weight, built in place
+        # over the squared offset
+        lorentzian *= 1.0 / (gamma * gamma)
+        lorentzian += 1.0
+        np.divide((1 - eta) * amplitude, lorentzian, out=lorentzian)
 
         # Pseudo-Voigt: weighted combination
-        profile = eta * gaussian + (1 - eta) * lorentzian
+        profile += lorentzian
 
         # Add background
-        bg_start = 4
-        background = self._calculate_background(x, params, bg_start, background_order)
-
-        result: NDArray[np.float64] = (profile + background).astype(np.float64)
-        return result
+        self._calculate_background(x, bg_coeffs, out=profile)
+        return profile
 
     def _calculate_background(
         self,
         x: NDArray[np.float64],
-        params: NDArray[np.float64],
-        bg_start: int,
-        background_order: int,
+        bg_coeffs: tuple[float, ...],
+        out: NDArray[np.float64] | None = None,
     ) -> NDArray[np.float64]:
         """Calculate polynomial background.
 
         Args:
             x: Two-theta values
-            params: Parameter array
-            bg_start: Index where background parameters start
-            background_order: Polynomial order
+            bg_coeffs: Polynomial coefficients, constant term first (order 0-2)
+            out: Optional array to add the background to in place, so a model
+                can fold it into its profile buffer without a separate array
 
         Returns:
-            Background values
+            Background values, or out with the background added
         """
+        if out is None:
+            out = np.zeros_like(x, dtype=np.float64)
+
+        out += bg_coeffs[0]
+        if len(bg_coeffs) > 1:
+            # Horner's rule on the non-constant terms, e.g. (c2 * x + c1) * x,
+            # reusing one scratch array instead of forming x**2
+            terms = np.multiply(x, bg_coeffs[-1])
+            for coeff in bg_coeffs[-2:0:-1]:
+                terms += coeff
+                terms *= x
+            out += terms
+        return out
+
+    def _gaussian_jac(
+        self,
+        x: NDArray[np.float64],
+        center: float,
+        amplitude: float,
+        width: float,
+        *bg_coeffs: float,
+    ) -> NDArray[np.float64]:
+        """Jacobian of the Gaussian model with respect to its parameters.
 
-        bg_result: NDArray[np.float64]
+        Args:
+            x: Two-theta values
+            center: Peak center
+            amplitude: Peak amplitude
+            width: Peak FWHM
+            *bg_coeffs: Background polynomial coefficients, constant term first
 
-        if background_order == 0:
-            bg_result = np.full_like(x, params[bg_start], dtype=np.float64)
-            return bg_result
-        elif background_order == 1:
-            bg_result = (params[bg_start] + params[bg_start + 1] * x).astype(np.float64)
-            return bg_result
-        else:  # background_order == 2
-            bg_result = (
-                params[bg_start] + params[bg_start + 1] * x + params[bg_start + 2] * x**2
-            ).astype(np.float64)
-            return bg_result
+        Returns:
+            Array of shape (len(x), n_params) of partial derivatives
+        """
+        sigma = width * _FWHM_TO_SIGMA
+        inv_sigma_sq = 1.0 / (sigma * sigma)
+
+        # Column-major so each partial derivative is written in place into its
+        # own contiguous column, with no intermediate arrays
+        jac = np.empty((len(x), 3 + len(bg_coeffs)), dtype=np.float64, order="F")
+        d_center, shape, d_width = jac[:, 0], jac[:, 1], jac[:, 2]
+
+        np.subtract(x, center, out=d_center)
+        np.multiply(d_center, d_center, out=shape)
+        shape *= -0.5 * inv_sigma_sq
+        np.exp(shape, out=shape)
+
+        # dsigma/dwidth = sigma / width
+        np.multiply(d_center, d_center, out=d_width)
+        d_width *= shape
+        d_width *= amplitude * inv_sigma_sq / width
+
+        d_center *= shape
+        d_center *= amplitude * inv_sigma_sq
+
+        self._background_jac(x, jac, 3)
+        return jac
+
+    def _lorentzian_jac(
+        self,
+        x: NDArray[np.float64],
+        center: float,
+        amplitude: float,
+        width: float,
+        *bg_coeffs: float,
+    ) -> NDArray[np.float64]:
+        """Jacobian of the Lorentzian model with respect to its parameters.
+
+        Args:
+            x: Two-theta values
+            center: Peak center
+            amplitude: Peak amplitude
+            width: Peak FWHM
+            *bg_coeffs: Background polynomial coefficients, constant term first
+
+        Returns:
+            Array of shape (len(x), n_params) of partial derivatives
+        """
+        inv_gamma = 2.0 / width
+
+        jac = np.empty((len(x), 3 + len(bg_coeffs)), dtype=np.float64, order="F")
+        d_center, shape, d_width = jac[:, 0], jac[:, 1], jac[:, 2]
+
+        # u = (x - center) / gamma, held in the center column until last
+        np.subtract(x, center, out=d_center)
+        d_center *= inv_gamma
+        np.multiply(d_center, d_center, out=shape)
+        shape += 1.0
+        np.reciprocal(shape, out=shape)
+
+        np.multiply(d_center, d_center, out=d_width)
+        d_width *= shape
+        d_width *= shape
+        d_width *= amplitude * inv_gamma
+
+        d_center *= shape
+        d_center *= shape
+        d_center *= 2.0 * amplitude * inv_gamma
+
+        self._background_jac(x, jac, 3)
+        return jac
+
+    def _pseudo_voigt_jac(
+        self,
+        x: NDArray[np.float64],
+        center: float,
+        amplitude: float,
+        width: float,
+        eta: float,
+        *bg_coeffs: float,
+    ) -> NDArray[np.float64]:
+        """Jacobian of the pseudo-Voigt model with respect to its parameters.
+
+        Args:
+            x: Two-theta values
+            center: Peak center
+            amplitude: Peak amplitude
+            width: Peak FWHM
+            eta: Mixing parameter in [0, 1]
+            *bg_coeffs: Background polynomial coefficients, constant term first
+
+        Returns:
+            Array of shape (len(x), n_params) of partial derivatives
+        """
+        sigma = width * _FWHM_TO_SIGMA
+        inv_sigma_sq = 1.0 / (sigma * sigma)
+        inv_gamma = 2.0 / width
+        g_scale = eta * amplitude
+        l_scale = (1 - eta) * amplitude
+
+        jac = np.empty((len(x), 4 + len(bg_coeffs)), dtype=np.float64, order="F")
+        d_center, d_amplitude, d_width, d_eta = jac[:, 0], jac[:, 1], jac[:, 2], jac[:, 3]
+
+        # Offset, Gaussian and Lorentzian shapes held in the center, amplitude
+        # and eta columns until they are combined
+        dx, gauss, lorentz = d_center, d_amplitude, d_eta
+        np.subtract(x, center, out=dx)
+        dx_sq = np.multiply(dx, dx)
+        np.multiply(dx_sq, -0.5 * inv_sigma_sq, out=gauss)
+        np.exp(gauss, out=gauss)
+        np.multiply(dx_sq, inv_gamma * inv_gamma, out=lorentz)
+        lorentz += 1.0
+        np.reciprocal(lorentz, out=lorentz)
+
+        # Width: Gaussian term plus Lorentzian term, reusing dx_sq as scratch
+        np.multiply(dx_sq, gauss, out=d_width)
+        d_width *= g_scale * inv_sigma_sq / width
+        scratch = dx_sq
+        scratch *= lorentz
+        scratch *= lorentz
+        scratch *= l_scale * inv_gamma**3
+        d_width += scratch
+
+        # Center
+        np.multiply(dx, lorentz, out=scratch)
+        scratch *= lorentz
+        scratch *= 2.0 * l_scale * inv_gamma * inv_gamma
+        d_center *= gauss
+        d_center *= g_scale * inv_sigma_sq
+        d_center += scratch
+
+        # Amplitude and eta from the shape difference
+        np.subtract(gauss, lorentz, out=scratch)
+        np.multiply(scratch, eta, out=d_amplitude)
+        d_amplitude += lorentz
+        np.multiply(scratch, amplitude, out=d_eta)
+
+        self._background_jac(x, jac, 4)
+        return jac
+
+    def _background_jac(
+        self,
+        x: NDArray[np.float64],
+        jac: NDArray[np.float64],
+        bg_start: int,
+    ) -> None:
+        """Fill the background columns of a model Jacobian in place.
+
+        Args:
+            x: Two-theta values
+            jac: Jacobian array to fill; columns from bg_start on are background
+            bg_start: Column where background parameters start
+        """
+        background_order = jac.shape[1] - bg_start - 1
+        jac[:, bg_start] = 1.0
+        if background_order >= 1:
+            jac[:, bg_start + 1] = x
+        if background_order == 2:
+            np.multiply(x, x, out=jac[:, bg_start + 2])
+
+    @overload
+    def calculate_d_spacing(self, two_theta: float, wavelength: float = ...) -> float: ...
+
+    @overload
+    def calculate_d_spacing(
+        self, two_theta: NDArray[np.float64], wavelength: float = ...
+    ) -> NDArray[np.float64]: ...
 
     def calculate_d_spacing(
         self,
-        two_theta: float,
+        two_theta: float | NDArray[np.float64],
         wavelength: float = 1.5406,
-    ) -> float:
+    ) -> float | NDArray[np.float64]:
         """Calculate d-spacing using Bragg's law.
 
         Formula: d = λ / (2 sin θ)
         where θ = two_theta / 2
 
         Args:
-            two_theta: Peak position in degrees
+            two_theta: Peak position in degrees, or an array of positions
             wavelength: X-ray wavelength in Å (default: Cu Kα)
 
         Returns:
-            d-spacing in Å
+            d-spacing in Å, as a float for scalar input or an array otherwise
 
         Raises:
-            ValueError: If two_theta <= 0 or >= 180
+            ValueError: If any two_theta <= 0 or >= 180
             ValueError: If wavelength <= 0
         """
-        if two_theta <= 0 or two_theta >= 180:
-            raise ValueError(f"two_theta must be in (0, 180) degrees, got {two_theta}")
+        self._check_two_theta(two_theta)
 
         if wavelength <= 0:
             raise ValueError(f"wavelength must be > 0, got {wavelength}")
 
+        if isinstance(two_theta, int | float):
+            # Scalar path: math functions skip NumPy's per-call dispatch
+            return wavelength / (2 * math.sin(math.radians(two_theta * 0.5)))
+
         # Convert two_theta to theta (half)
-        theta_rad = np.deg2rad(two_theta / 2.0)
+        theta_rad = np.deg2rad(np.asarray(two_theta, dtype=np.float64) * 0.5)
 
         # Apply Bragg's law: d = λ / (2 sin θ)
-        d_spacing = wavelength / (2 * np.sin(theta_rad))
+        d_spacing: NDArray[np.float64] = wavelength / (2 * np.sin(theta_rad))
 
-        return float(d_spacing)
+        if d_spacing.ndim == 0:
+            return float(d_spacing)
+        return d_spacing
 
+    @overload
     def estimate_crystallite_size(
         self,
         fwhm: float,
         two_theta: float,
+        wavelength: float = ...,
+        k_factor: float = ...,
+    ) -> float: ...
+
+    @overload
+    def estimate_crystallite_size(
+        self,
+        fwhm: float | NDArray[np.float64],
+        two_theta: NDArray[np.float64],
+        wavelength: float = ...,
+        k_factor: float = ...,
+    ) -> NDArray[np.float64]: ...
+
+    @overload
+    def estimate_crystallite_size(
+        self,
+        fwhm: NDArray[np.float64],
+        two_theta: float | NDArray[np.float64],
+        wavelength: float = ...,
+        k_factor: float = ...,
+    ) -> NDArray[np.float64]: ...
+
+    def estimate_crystallite_size(
+        self,
+        fwhm: float | NDArray[np.float64],
+        two_theta: float | NDArray[np.float64],
         wavelength: float = 1.5406,
         k_factor: float = 0.9,
-    ) -> float:
+    ) -> float | NDArray[np.float64]:
         """Estimate crystallite size using Scherrer equation.
 
         Formula: D = Kλ / (β cos θ)
         where β = FWHM in radians, θ = two_theta / 2
 
+        fwhm and two_theta may be arrays (broadcast against each other) to
+        size many peaks in one call.
+
         Args:
             fwhm: Peak FWHM in degrees
             two_theta: Peak position in degrees
@@ -581,16 +938,21 @@ class XRDAnalyzer:
             k_factor: Shape factor (default: 0.9 for spherical crystallites)
 
         Returns:
-            Crystallite size in nm
+            Crystallite size in nm, as a float for scalar inputs or an array otherwise
 
         Raises:
             ValueError: If inputs are invalid
         """
-        if fwhm <= 0:
-            raise ValueError(f"fwhm must be > 0, got {fwhm}")
+        if isinstance(fwhm, int | float):
+            if fwhm <= 0:
+                raise ValueError(f"fwhm must be > 0, got {fwhm}")
+        else:
+            fwhm_arr = np.asarray(fwhm, dtype=np.float64)
+            non_positive = fwhm_arr <= 0
+            if non_positive.any():
+                raise ValueError(f"fwhm must be > 0, got {fwhm_arr[non_positive].flat[0]}")
 
-        if two_theta <= 0 or two_theta >= 180:
-            raise ValueError(f"two_theta must be in (0, 180) degrees, got {two_theta}")
+        self._check_two_theta(two_theta)
 
         if wavelength <= 0:
             raise ValueError(f"wavelength must be > 0, got {wavelength}")
@@ -598,20 +960,44 @@ class XRDAnalyzer:
         if k_factor <= 0:
             raise ValueError(f"k_factor must be > 0, got {k_factor}")
 
+        if isinstance(fwhm, int | float) and isinstance(two_theta, int | float):
+            # Scalar path: math functions skip NumPy's per-call dispatch
+            cos_theta = math.cos(math.radians(two_theta * 0.5))
+            return (k_factor * wavelength / 10.0) / (math.radians(fwhm) * cos_theta)
+
         # Convert FWHM to radians: β = fwhm * π / 180
-        beta_rad = np.deg2rad(fwhm)
+        beta_rad = np.deg2rad(np.asarray(fwhm, dtype=np.float64))
 
         # Convert two_theta to theta
-        theta_rad = np.deg2rad(two_theta / 2.0)
+        theta_rad = np.deg2rad(np.asarray(two_theta, dtype=np.float64) * 0.5)
+
+        # Apply Scherrer: D = Kλ / (β cos θ), converting from Å to nm
+        d_nm: NDArray[np.float64] = (k_factor * wavelength / 10.0) / (beta_rad * np.cos(theta_rad))
 
-        # Apply Scherrer: D = Kλ / (β cos θ)
-        # Result in Å
-        d_angstrom = (k_factor * wavelength) / (beta_rad * np.cos(theta_rad))
+        if d_nm.ndim == 0:
+            return float(d_nm)
+        return d_nm
 
-        # Convert from Å to nm: divide by 10
-        d_nm = d_angstrom / 10.0
+    def _check_two_theta(self, two_theta: float | NDArray[np.float64]) -> None:
+        """Check that two-theta value(s) lie in (0, 180) degrees.
 
-        return float(d_nm)
+        Args:
+            two_theta: Peak position(s) in degrees
+
+        Raises:
+            ValueError: If any two_theta <= 0 or >= 180
+        """
+        if isinstance(two_theta, int | float):
+            if two_theta <= 0 or two_theta >= 180:
+                raise ValueError(f"two_theta must be in (0, 180) degrees, got {two_theta}")
+            return
+
+        theta_arr = np.asarray(two_theta, dtype=np.float64)
+        out_of_range = (theta_arr <= 0) | (theta_arr >= 180)
+        if out_of_range.any():
+            raise ValueError(
+                f"two_theta must be in (0, 180) degrees, got {theta_arr[out_of_range].flat[0]}"
+            )
 
     def calculate_lattice_parameter(
         self,
@@ -645,25 +1031,32 @@ class XRDAnalyzer:
         if len(d_spacings) == 0:
             raise ValueError("At least one peak is required")
 
-        # Validate hkl indices
-        for hkl in hkl_indices:
-            if len(hkl) != 3:
-                raise ValueError(f"hkl_indices must be tuples of length 3, got {hkl}")
-            if not all(isinstance(x, int) for x in hkl):
-                raise ValueError(f"hkl_indices must contain integers, got {hkl}")
+        # Validate hkl indices as one (N, 3) integer array
+        try:
+            hkl_arr = np.asarray(hkl_indices)
+        except ValueError as e:
+            # Ragged input: rows of different lengths
+            raise ValueError(f"hkl_indices must be tuples of length 3: {e}") from e
+        if hkl_arr.ndim != 2 or hkl_arr.shape[1] != 3:
+            raise ValueError(
+                f"hkl_indices must be tuples of length 3, got array of shape {hkl_arr.shape}"
+            )
+        if not np.issubdtype(hkl_arr.dtype, np.integer):
+            raise ValueError(f"hkl_indices must contain integers, got dtype {hkl_arr.dtype}")
 
         if crystal_system == "cubic":
             # For cubic: a = d * √(h² + k² + l²)
-            lattice_params: list[float] = []
-            for d, (h, k, l_idx) in zip(d_spacings, hkl_indices, strict=True):
-                hkl_sq_sum = h * h + k * k + l_idx * l_idx
-                if hkl_sq_sum <= 0:
-                    raise ValueError(f"Invalid hkl indices: ({h}, {k}, {l_idx})")
-                a = d * np.sqrt(float(hkl_sq_sum))
-                lattice_params.append(a)
+            d = np.asarray(d_spacings, dtype=np.float64)
+            hkl_arr = hkl_arr.astype(np.int64, copy=False)
+            hkl_sq_sum = (hkl_arr * hkl_arr).sum(axis=1)
+
+            invalid = hkl_sq_sum <= 0
+            if invalid.any():
+                h, k, l_idx = hkl_arr[invalid][0].tolist()
+                raise ValueError(f"Invalid hkl indices: ({h}, {k}, {l_idx})")
 
             # Return average
-            return float(np.mean(lattice_params))
+            return float((d * np.sqrt(hkl_sq_sum)).mean())
 
         elif crystal_system in ("tetragonal", "orthorhombic", "hexagonal"):
             # Simplified: use first peak with non-zero h or k
@@ -1,9 +1,11 @@
 """Beamline DAQ package for device control and data acquisition."""
 
+from beamline.daq.aclient import AsyncDeviceClient
 from beamline.daq.client import DeviceClient
 from beamline.daq.data import ScanData
 from beamline.daq.device import Detector, Motor, MotorStatus, Shutter
 from beamline.daq.nexus import NeXusWriter
+from beamline.daq.pool import DeviceClientPool
 from beamline.daq.scan import (
     LinearScanConfig,
     MeshScanConfig,
@@ -14,6 +16,8 @@ from beamline.daq.scan import (
 
 __all__ = [
     "DeviceClient",
+    "AsyncDeviceClient",
+    "DeviceClientPool",
     "Motor",
     "Detector",
     "Shutter",
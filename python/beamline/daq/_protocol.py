@@ -0,0 +1,84 @@
+"""Encoding and parsing for the device server's line protocol.
+
+Shared by the blocking and asyncio clients; not part of the public API.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from functools import lru_cache
+
+from beamline.daq.exceptions import ProtocolError
+
+
+@lru_cache(maxsize=4096)
+def encode_command(verb: str, target: str) -> bytes:
+    """Encode ``VERB:target`` plus newline; scans repeat the same few PVs."""
+    return f"{verb}:{target}\n".encode()
+
+
+@lru_cache(maxsize=4096)
+def encode_prefix(verb: str, target: str) -> bytes:
+    """Encode the ``VERB:target:`` prefix of a command that carries a value."""
+    return f"{verb}:{target}:".encode()
+
+
+def iter_pv_names(data: str) -> Iterator[str]:
+    """Split a comma-separated LIST reply into PV names, skipping blanks."""
+    return filter(None, map(str.strip, data.split(",")))
+
+
+def parse_response(response: str) -> tuple[str, str]:
+    """Parse response: "OK:data" or "ERR:code".
+
+    Args:
+        response: Response string from server
+
+    Returns:
+        (status, data) tuple where status is "OK" or "ERR"
+
+    Raises:
+        ProtocolError: If response format is invalid
+    """
+    if not response:
+        raise ProtocolError("EMPTY", "Empty response from server")
+
+    parts = response.split(":", 1)
+    if len(parts) == 1:
+        # Response without colon (e.g., "OK" or "ERR")
+        status = parts[0].strip()
+        data = ""
+    else:
+        status, data = parts
+        status = status.strip()
+        data = data.strip()
+
+    if status not in ("OK", "ERR"):
+        raise ProtocolError("INVALID", f"Invalid response format: {response}")
+
+    return (status, data)
+
+
+def parse_response_bytes(response: bytes) -> tuple[bool, bytes]:
+    """Classify a raw response without decoding it.
+
+    Fast path for the fixed "OK:data" / "ERR:code" grammar; anything else
+    is handed to ``parse_response`` so unusual spacing is still accepted
+    and malformed replies raise the same errors.
+
+    Args:
+        response: Raw response bytes from server (whitespace stripped)
+
+    Returns:
+        (ok, data) tuple where ok is True for "OK" replies
+
+    Raises:
+        ProtocolError: If response format is invalid
+    """
+    if response.startswith(b"OK:"):
+        return True, response[3:].strip()
+    if response.startswith(b"ERR:"):
+        return False, response[4:].strip()
+
+    status, data = parse_response(response.decode("utf-8"))
+    return status == "OK", data.encode()
@@ -0,0 +1,293 @@
+"""Asyncio TCP client for beamline device server."""
+
+from __future__ import annotations
+
+import asyncio
+import builtins
+import contextlib
+import socket
+from collections.abc import Sequence
+from types import TracebackType
+
+import numpy as np
+from numpy.typing import NDArray
+
+from beamline.daq._protocol import (
+    encode_command,
+    encode_prefix,
+    iter_pv_names,
+    parse_response,
+    parse_response_bytes,
+)
+from beamline.daq.exceptions import ConnectionError, ProtocolError, TimeoutError
+
+# StreamReader line limit; a LIST reply for a large PV set is one long line
+_MAX_LINE = 16 * 1024 * 1024
+
+
+class AsyncDeviceClient:
+    """Asyncio counterpart of DeviceClient.
+
+    Speaks the same text protocol, but each command is a coroutine so a scan
+    orchestrator can overlap independent operations with ``asyncio.gather``.
+    Requests on one connection are serialized with an ``asyncio.Lock`` (the
+    server answers in order and has no request IDs); use one client per
+    device for true concurrency.
+
+    Example:
+        >>> async with AsyncDeviceClient() as i0, AsyncDeviceClient() as it:
+        ...     a, b = await asyncio.gather(i0.get("BL02:DET:I0"), it.get("BL02:DET:IT"))
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5064,
+        timeout: float = 5.0,
+    ) -> None:
+        """Initialize client with connection parameters.
+
+        Args:
+            host: Server hostname or IP address
+            port: TCP port (default: 5064, EPICS standard)
+            timeout: Timeout in seconds for connecting and for each command
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> AsyncDeviceClient:
+        """Async context manager entry: connect to server."""
+        await self.connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Async context manager exit: close connection."""
+        await self.disconnect()
+
+    @property
+    def connected(self) -> bool:
+        """True while the connection is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        """Establish TCP connection to server.
+
+        Raises:
+            ConnectionError: If connection fails or times out
+        """
+        if self.connected:
+            return
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=_MAX_LINE), self.timeout
+            )
+        except (OSError, builtins.TimeoutError) as e:
+            raise ConnectionError(f"Failed to connect to {self.host}:{self.port}") from e
+
+        self._reader, self._writer = reader, writer
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    async def disconnect(self) -> None:
+        """Close TCP connection."""
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is not None:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    async def get(self, pv: str) -> float:
+        """Read process variable value.
+
+        Args:
+            pv: Process variable name (e.g., "BL02:RING:CURRENT")
+
+        Returns:
+            PV value as float
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error response
+            ValueError: If response cannot be parsed as float
+            TimeoutError: If operation times out
+        """
+        (line,) = await self._exchange(encode_command("GET", pv), 1)
+        ok, data = parse_response_bytes(line)
+
+        if not ok:
+            code = data.decode("utf-8")
+            raise ProtocolError(code, f"Failed to get PV {pv}: {code}")
+
+        return float(data)
+
+    async def get_many(self, pvs: Sequence[str]) -> NDArray[np.float64]:
+        """Read several process variables in one pipelined round trip.
+
+        Args:
+            pvs: Process variable names
+
+        Returns:
+            Array of values, one per entry in ``pvs``
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error response for any PV
+            ValueError: If a response cannot be parsed as float
+            TimeoutError: If operation times out
+        """
+        values = np.empty(len(pvs), dtype=np.float64)
+        if not pvs:
+            return values
+
+        payload = b"".join([encode_command("GET", pv) for pv in pvs])
+        lines = await self._exchange(payload, len(pvs))
+        for i, (pv, line) in enumerate(zip(pvs, lines, strict=True)):
+            ok, data = parse_response_bytes(line)
+            if not ok:
+                code = data.decode("utf-8")
+                raise ProtocolError(code, f"Failed to get PV {pv}: {code}")
+            values[i] = float(data)
+        return values
+
+    async def put(self, pv: str, value: float) -> None:
+        """Write process variable value.
+
+        Args:
+            pv: Process variable name
+            value: Value to write
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error (e.g., ERR:INVALID_VALUE)
+            TimeoutError: If operation times out
+        """
+        payload = encode_prefix("PUT", pv) + f"{value}\n".encode()
+        (line,) = await self._exchange(payload, 1)
+        ok, data = parse_response_bytes(line)
+
+        if not ok:
+            code = data.decode("utf-8")
+            raise ProtocolError(code, f"Failed to put PV {pv}={value}: {code}")
+
+    async def move(self, motor: str, position: float) -> None:
+        """Move motor to position (asynchronous, non-blocking).
+
+        Args:
+            motor: Motor PV name (e.g., "BL02:SAMPLE:X")
+            position: Target position
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If motor not found or invalid position
+            TimeoutError: If operation times out
+        """
+        payload = encode_prefix("MOVE", motor) + f"{position}\n".encode()
+        (line,) = await self._exchange(payload, 1)
+        ok, data = parse_response_bytes(line)
+
+        if not ok:
+            code = data.decode("utf-8")
+            raise ProtocolError(code, f"Failed to move motor {motor} to {position}: {code}")
+
+    async def status(self, motor: str) -> str:
+        """Get motor status.
+
+        Args:
+            motor: Motor PV name
+
+        Returns:
+            Motor status string ("IDLE" or "MOVING")
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If motor not found
+            TimeoutError: If operation times out
+        """
+        (line,) = await self._exchange(encode_command("STATUS", motor), 1)
+        ok, data = parse_response_bytes(line)
+        text = data.decode("utf-8")
+
+        if not ok:
+            raise ProtocolError(text, f"Failed to get status for motor {motor}: {text}")
+
+        return text.upper()
+
+    async def list_pvs(self, pattern: str | None = None) -> list[str]:
+        """List process variables, optionally filtered by pattern.
+
+        Args:
+            pattern: Optional glob pattern (e.g., "BL02:DET:*")
+
+        Returns:
+            List of PV names
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error
+            TimeoutError: If operation times out
+        """
+        command = f"LIST:{pattern}\n" if pattern else "LIST\n"
+        (line,) = await self._exchange(command.encode(), 1)
+        status, data = parse_response(line.decode("utf-8"))
+
+        if status == "ERR":
+            raise ProtocolError(data, f"Failed to list PVs: {data}")
+
+        return list(iter_pv_names(data))
+
+    async def _exchange(self, payload: bytes, n_replies: int) -> list[bytes]:
+        """Write a request payload and read ``n_replies`` newline-terminated replies.
+
+        Args:
+            payload: Encoded, newline-terminated command(s)
+            n_replies: Number of reply lines to read
+
+        Returns:
+            Raw reply lines with surrounding whitespace stripped
+
+        Raises:
+            ConnectionError: If not connected or a socket error occurs
+            ProtocolError: If a reply line exceeds the stream limit
+            TimeoutError: If operation times out
+        """
+        async with self._lock:
+            reader, writer = self._reader, self._writer
+            if reader is None or writer is None:
+                raise ConnectionError("Not connected to server")
+
+            try:
+                async with asyncio.timeout(self.timeout):
+                    writer.write(payload)
+                    await writer.drain()
+                    return [(await reader.readuntil(b"\n")).strip() for _ in range(n_replies)]
+            except builtins.TimeoutError as e:
+                # Replies may still arrive for this request; the stream is out of sync
+                await self.disconnect()
+                raise TimeoutError(f"Operation timed out after {self.timeout}s") from e
+            except asyncio.IncompleteReadError as e:
+                await self.disconnect()
+                raise ConnectionError("Connection closed by server") from e
+            except (asyncio.LimitOverrunError, ValueError) as e:
+                # The rest of the oversized line is still unread
+                await self.disconnect()
+                raise ProtocolError("LINE_TOO_LONG", f"Reply exceeds {_MAX_LINE} bytes") from e
+            except OSError as e:
+                await self.disconnect()
+                raise ConnectionError(f"Socket error: {e}") from e
+            except asyncio.CancelledError:
+                # Cancelled by the caller mid-request: the reply may still arrive
+                # and would be read as the answer to the next command
+                await asyncio.shield(self.disconnect())
+                raise
@@ -5,9 +5,42 @@ from __future__ import annotations
 import builtins
 import contextlib
 import socket
+import time
+from collections.abc import Callable, Iterator, Sequence
 from types import TracebackType
 
-from beamline.daq.exceptions import ConnectionError, ProtocolError, TimeoutError
+import numpy as np
+from numpy.typing import NDArray
+
+from beamline.daq._protocol import (
+    encode_command,
+    encode_prefix,
+    iter_pv_names,
+    parse_response,
+    parse_response_bytes,
+)
+from beamline.daq.exceptions import BeamlineError, ConnectionError, ProtocolError, TimeoutError
+
+
+def _default_socket_options() -> tuple[tuple[int, int, int], ...]:
+    """Socket options applied to every DeviceClient connection."""
+    options = [
+        # Commands are tiny request/reply exchanges; Nagle would delay each one
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        # Detect peers that vanished during long idle or MONITOR sessions
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        # Room for pipelined command bursts and their replies
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, 256 * 1024),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024),
+    ]
+    # Keepalive timers are not available on every platform
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return tuple(options)
+
+
+_DEFAULT_SOCKET_OPTIONS = _default_socket_options()
 
 
 class DeviceClient:
@@ -22,6 +55,7 @@ class DeviceClient:
         host: str = "localhost",
         port: int = 5064,
         timeout: float = 5.0,
+        socket_options: Sequence[tuple[int, int, int]] | None = None,
     ) -> None:
         """Initialize client with connection parameters.
 
@@ -29,12 +63,24 @@ class DeviceClient:
             host: Server hostname or IP address
             port: TCP port (default: 5064, EPICS standard)
             timeout: Socket timeout in seconds
+            socket_options: Extra ``(level, optname, value)`` tuples passed to
+                ``setsockopt`` before connecting. Applied after the defaults
+                (TCP_NODELAY, keepalive, 256 KiB buffers), so they can override them
         """
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.socket_options = list(socket_options) if socket_options else []
         self._socket: socket.socket | None = None
         self._connected = False
+        # Bytes received past the last reply; kept so pipelined replies are not lost
+        self._recv_buf = bytearray()
+        # Fixed landing area for recv_into, so reads don't allocate a bytes per chunk
+        self._recv_chunk = memoryview(bytearray(65536))
+        # Write coalescing state, active only inside buffered_writes()
+        self._write_buf: bytearray | None = None
+        self._write_flush_bytes = 0
+        self._deferred: list[str] = []
 
     def __enter__(self) -> DeviceClient:
         """Context manager entry: connect to server."""
@@ -50,6 +96,23 @@ class DeviceClient:
         """Context manager exit: close connection."""
         self.disconnect()
 
+    @property
+    def connected(self) -> bool:
+        """True while the connection is open."""
+        return self._connected and self._socket is not None
+
+    def is_idle(self) -> bool:
+        """True if connected with no received bytes waiting to be read.
+
+        Only an idle client can be handed to another caller without its reply
+        stream going out of sync.
+        """
+        return self.connected and not self._recv_buf
+
+    def fileno(self) -> int:
+        """Return the socket's file descriptor, or -1 if not connected."""
+        return self._socket.fileno() if self._socket is not None else -1
+
     def connect(self) -> None:
         """Establish TCP connection to server.
 
@@ -62,6 +125,10 @@ class DeviceClient:
         try:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._socket.settimeout(self.timeout)
+            # Set before connect so buffer sizes apply to the handshake's window;
+            # user options come last and can override the defaults
+            for level, optname, value in (*_DEFAULT_SOCKET_OPTIONS, *self.socket_options):
+                self._socket.setsockopt(level, optname, value)
             self._socket.connect((self.host, self.port))
             self._connected = True
         except OSError as e:
@@ -79,6 +146,10 @@ class DeviceClient:
                 self._socket.close()
             self._socket = None
         self._connected = False
+        self._recv_buf.clear()
+        if self._write_buf is not None:
+            self._write_buf.clear()
+        self._deferred.clear()
 
     def get(self, pv: str) -> float:
         """Read process variable value.
@@ -98,20 +169,56 @@ class DeviceClient:
         if not self._connected:
             raise ConnectionError("Not connected to server")
 
-        response = self._send_command(f"GET:{pv}")
-        status, data = self._parse_response(response)
+        ok, data = parse_response_bytes(self._send_encoded(encode_command("GET", pv)))
 
-        if status == "ERR":
-            raise ProtocolError(data, f"Failed to get PV {pv}: {data}")
+        if not ok:
+            code = data.decode("utf-8")
+            raise ProtocolError(code, f"Failed to get PV {pv}: {code}")
 
-        try:
-            return float(data)
-        except ValueError as e:
-            raise ValueError(f"Invalid float value in response: {data}") from e
+        # float() parses ASCII bytes directly and raises ValueError on bad data
+        return float(data)
+
+    def get_many(self, pvs: Sequence[str]) -> NDArray[np.float64]:
+        """Read several process variables in one pipelined round trip.
+
+        All GET commands are written at once and the replies read in order,
+        so N reads cost one round trip instead of N. The same PV may appear
+        more than once (e.g. for repeated detector reads).
+
+        Args:
+            pvs: Process variable names
+
+        Returns:
+            Array of values, one per entry in ``pvs``
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error response for any PV
+            ValueError: If a response cannot be parsed as float
+            TimeoutError: If operation times out
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected to server")
+
+        values = np.empty(len(pvs), dtype=np.float64)
+        if not pvs:
+            return values
+
+        payload = b"".join([encode_command("GET", pv) for pv in pvs])
+        for i, (pv, line) in enumerate(zip(pvs, self._exchange(payload, len(pvs)), strict=True)):
+            ok, data = parse_response_bytes(line)
+            if not ok:
+                code = data.decode("utf-8")
+                raise ProtocolError(code, f"Failed to get PV {pv}: {code}")
+            values[i] = float(data)
+        return values
 
     def put(self, pv: str, value: float) -> None:
         """Write process variable value.
 
+        Inside ``buffered_writes()`` the command is queued and its reply is
+        checked when the buffer is flushed.
+
         Args:
             pv: Process variable name
             value: Value to write
@@ -124,15 +231,23 @@ class DeviceClient:
         if not self._connected:
             raise ConnectionError("Not connected to server")
 
-        response = self._send_command(f"PUT:{pv}:{value}")
-        status, data = self._parse_response(response)
+        payload = encode_prefix("PUT", pv) + f"{value}\n".encode()
+        if self._write_buf is not None:
+            self._defer(payload, f"Failed to put PV {pv}={value}")
+            return
 
-        if status == "ERR":
-            raise ProtocolError(data, f"Failed to put PV {pv}={value}: {data}")
+        ok, data = parse_response_bytes(self._send_encoded(payload))
+
+        if not ok:
+            code = data.decode("utf-8")
+            raise ProtocolError(code, f"Failed to put PV {pv}={value}: {code}")
 
     def move(self, motor: str, position: float) -> None:
         """Move motor to position (asynchronous, non-blocking).
 
+        Inside ``buffered_writes()`` the command is queued and its reply is
+        checked when the buffer is flushed.
+
         Args:
             motor: Motor PV name (e.g., "BL02:SAMPLE:X")
             position: Target position
@@ -145,11 +260,16 @@ class DeviceClient:
         if not self._connected:
             raise ConnectionError("Not connected to server")
 
-        response = self._send_command(f"MOVE:{motor}:{position}")
-        status, data = self._parse_response(response)
+        payload = encode_prefix("MOVE", motor) + f"{position}\n".encode()
+        if self._write_buf is not None:
+            self._defer(payload, f"Failed to move motor {motor} to {position}")
+            return
 
-        if status == "ERR":
-            raise ProtocolError(data, f"Failed to move motor {motor} to {position}: {data}")
+        ok, data = parse_response_bytes(self._send_encoded(payload))
+
+        if not ok:
+            code = data.decode("utf-8")
+            raise ProtocolError(code, f"Failed to move motor {motor} to {position}: {code}")
 
     def status(self, motor: str) -> str:
         """Get motor status.
@@ -168,13 +288,13 @@ class DeviceClient:
         if not self._connected:
             raise ConnectionError("Not connected to server")
 
-        response = self._send_command(f"STATUS:{motor}")
-        resp_status, data = self._parse_response(response)
+        ok, data = parse_response_bytes(self._send_encoded(encode_command("STATUS", motor)))
+        text = data.decode("utf-8")
 
-        if resp_status == "ERR":
-            raise ProtocolError(data, f"Failed to get status for motor {motor}: {data}")
+        if not ok:
+            raise ProtocolError(text, f"Failed to get status for motor {motor}: {text}")
 
-        return data.strip().upper()
+        return text.upper()
 
     def list_pvs(self, pattern: str | None = None) -> list[str]:
         """List process variables, optionally filtered by pattern.
@@ -185,6 +305,26 @@ class DeviceClient:
         Returns:
             List of PV names
 
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error
+            TimeoutError: If operation times out
+        """
+        return list(self.iter_pvs(pattern))
+
+    def iter_pvs(self, pattern: str | None = None) -> Iterator[str]:
+        """List process variables lazily, optionally filtered by pattern.
+
+        The LIST request is made immediately; only splitting the reply into
+        names is deferred, so callers that filter or stop early never build
+        the full list.
+
+        Args:
+            pattern: Optional glob pattern (e.g., "BL02:DET:*")
+
+        Returns:
+            Iterator over PV names
+
         Raises:
             ConnectionError: If not connected
             ProtocolError: If server returns error
@@ -196,15 +336,12 @@ class DeviceClient:
         command = f"LIST:{pattern}" if pattern else "LIST"
 
         response = self._send_command(command)
-        status, data = self._parse_response(response)
+        status, data = parse_response(response)
 
         if status == "ERR":
             raise ProtocolError(data, f"Failed to list PVs: {data}")
 
-        if not data or data.strip() == "":
-            return []
-
-        return [pv.strip() for pv in data.split(",") if pv.strip()]
+        return iter_pv_names(data)
 
     def monitor_start(self, pv: str, interval_ms: int) -> None:
         """Start monitoring PV with periodic updates.
@@ -224,7 +361,7 @@ class DeviceClient:
             raise ConnectionError("Not connected to server")
 
         response = self._send_command(f"MONITOR:{pv}:{interval_ms}")
-        status, data = self._parse_response(response)
+        status, data = parse_response(response)
 
         if status == "ERR":
             raise ProtocolError(data, f"Failed to start monitoring {pv}: {data}")
@@ -232,6 +369,9 @@ class DeviceClient:
     def monitor_stop(self) -> None:
         """Stop monitoring.
 
+        Any ``DATA:`` updates the server sent before it processed STOP are
+        discarded.
+
         Raises:
             ConnectionError: If not connected
             ProtocolError: If server returns error
@@ -240,12 +380,137 @@ class DeviceClient:
         if not self._connected:
             raise ConnectionError("Not connected to server")
 
-        response = self._send_command("STOP")
-        status, data = self._parse_response(response)
+        line = self._exchange(b"STOP\n", 1)[0]
+        while line.startswith(b"DATA:"):
+            line = self._exchange(b"", 1)[0]
+        status, data = parse_response(line.decode("utf-8"))
 
         if status == "ERR":
             raise ProtocolError(data, f"Failed to stop monitoring: {data}")
 
+    def monitor_until(
+        self,
+        pv: str,
+        predicate: Callable[[float], bool],
+        interval_ms: int = 10,
+        timeout: float = 60.0,
+    ) -> float:
+        """Block until a monitored PV value satisfies ``predicate``.
+
+        Uses the server's MONITOR push updates instead of polling, so no
+        request is sent per sample. Monitoring is stopped before returning.
+
+        Args:
+            pv: Process variable name
+            predicate: Called with each pushed value; return True to stop waiting
+            interval_ms: Server update interval in milliseconds
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            The first value for which ``predicate`` returned True
+
+        Raises:
+            ConnectionError: If not connected
+            ProtocolError: If server returns error or an unexpected line
+            TimeoutError: If the condition is not met within timeout
+        """
+        self.monitor_start(pv, interval_ms)
+        deadline = time.monotonic() + timeout
+
+        try:
+            while True:
+                line = self._exchange(b"", 1)[0]
+                if not line.startswith(b"DATA:"):
+                    raise ProtocolError(
+                        "INVALID", f"Unexpected line while monitoring {pv}: {line!r}"
+                    )
+                value = float(line[5:])
+                if predicate(value):
+                    break
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Monitored PV {pv} did not match within {timeout}s")
+        except BaseException:
+            # Best effort: the original error is more useful than a failed STOP
+            with contextlib.suppress(BeamlineError):
+                self.monitor_stop()
+            raise
+
+        self.monitor_stop()
+        return value
+
+    @contextlib.contextmanager
+    def buffered_writes(self, flush_bytes: int = 16384) -> Iterator[DeviceClient]:
+        """Coalesce PUT/MOVE commands into as few socket writes as possible.
+
+        Within the block, ``put()`` and ``move()`` append to a local buffer
+        instead of writing immediately. The buffer is sent once it reaches
+        ``flush_bytes``, when a command that needs its reply (``get()``,
+        ``status()``, ...) is issued, or when the block exits. Replies are still
+        consumed in order, and an ERR reply to a queued command raises
+        ``ProtocolError`` at the point the buffer is flushed.
+
+        Args:
+            flush_bytes: Buffer size that triggers an automatic flush
+
+        Yields:
+            This client
+
+        Raises:
+            ValueError: If flush_bytes is not positive
+        """
+        if flush_bytes <= 0:
+            raise ValueError(f"flush_bytes must be > 0, got {flush_bytes}")
+        if self._write_buf is not None:
+            # Already buffering: the outer block owns the flush
+            yield self
+            return
+
+        self._write_buf = bytearray()
+        self._write_flush_bytes = flush_bytes
+        try:
+            yield self
+            self.flush()
+        finally:
+            self._write_buf = None
+            self._deferred.clear()
+
+    def flush(self) -> None:
+        """Send any commands queued by ``buffered_writes()`` and check their replies.
+
+        Raises:
+            ConnectionError: If not connected or a socket error occurs
+            ProtocolError: If the server rejected a queued command
+            TimeoutError: If operation times out
+        """
+        if self._write_buf:
+            self._exchange(b"", 0)
+
+    def pipeline(self, commands: Sequence[str]) -> list[str]:
+        """Send several commands in a single write and read their replies in order.
+
+        Useful for scan loops that issue many independent GET/STATUS commands:
+        all requests go out together, so the cost is one round trip rather than
+        one per command. Replies are returned unparsed; use the same
+        "OK:data" / "ERR:code" handling as the single-command methods.
+
+        Args:
+            commands: Command strings (without newline)
+
+        Returns:
+            Response strings (newline stripped), one per command
+
+        Raises:
+            ConnectionError: If not connected or a socket error occurs
+            TimeoutError: If operation times out
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected to server")
+        if not commands:
+            return []
+
+        payload = b"".join(f"{command}\n".encode() for command in commands)
+        return [line.decode("utf-8") for line in self._exchange(payload, len(commands))]
+
     def _send_command(self, command: str) -> str:
         """Send command and receive response.
 
@@ -261,58 +526,108 @@ class DeviceClient:
             ConnectionError: If socket error occurs
             TimeoutError: If operation times out
         """
+        return self._exchange(f"{command}\n".encode(), 1)[0].decode("utf-8")
+
+    def _send_encoded(self, payload: bytes) -> bytes:
+        """Send one pre-encoded, newline-terminated command and receive its response.
+
+        Args:
+            payload: Encoded command including the trailing newline
+
+        Returns:
+            Raw response bytes (surrounding whitespace stripped)
+
+        Raises:
+            ConnectionError: If socket error occurs
+            TimeoutError: If operation times out
+        """
+        return self._exchange(payload, 1)[0]
+
+    def _exchange(self, payload: bytes, n_replies: int) -> list[bytes]:
+        """Write a request payload and read ``n_replies`` newline-terminated replies.
+
+        Any commands queued by ``buffered_writes()`` are sent first and their
+        replies checked before the ``n_replies`` requested ones are returned.
+
+        Args:
+            payload: Encoded, newline-terminated command(s)
+            n_replies: Number of reply lines to read
+
+        Returns:
+            Raw reply lines with surrounding whitespace stripped
+
+        Raises:
+            ConnectionError: If socket error occurs
+            ProtocolError: If the server rejected a queued command
+            TimeoutError: If operation times out
+        """
         if not self._socket:
             raise ConnectionError("Socket not initialized")
 
-        try:
-            # Send command with newline
-            self._socket.sendall(f"{command}\n".encode())
+        deferred: list[str] = []
+        if self._write_buf:
+            # Send queued writes ahead of this request; their replies come first
+            payload = bytes(self._write_buf) + payload
+            deferred = self._deferred
+            self._write_buf.clear()
+            self._deferred = []
 
-            # Receive response
-            response_bytes = b""
-            while True:
-                chunk = self._socket.recv(4096)
-                if not chunk:
-                    raise ConnectionError("Connection closed by server")
-                response_bytes += chunk
-                if b"\n" in response_bytes:
-                    break
-
-            response = response_bytes.decode("utf-8").strip()
-            return response
+        try:
+            self._socket.sendall(payload)
+            lines = [self._read_line(self._socket) for _ in range(len(deferred) + n_replies)]
 
         except builtins.TimeoutError as e:
+            # A partial reply left in the buffer would desynchronize later commands
+            self._recv_buf.clear()
             raise TimeoutError(f"Operation timed out after {self.timeout}s") from e
         except OSError as e:
             self._connected = False
+            self._recv_buf.clear()
             raise ConnectionError(f"Socket error: {e}") from e
 
-    def _parse_response(self, response: str) -> tuple[str, str]:
-        """Parse response: "OK:data" or "ERR:code".
+        for context, line in zip(deferred, lines, strict=False):
+            ok, data = parse_response_bytes(line)
+            if not ok:
+                code = data.decode("utf-8")
+                raise ProtocolError(code, f"{context}: {code}")
+        return lines[len(deferred) :]
+
+    def _defer(self, payload: bytes, context: str) -> None:
+        """Queue a command whose reply is checked when the write buffer is flushed.
+
+        Args:
+            payload: Encoded command including the trailing newline
+            context: Error message prefix used if the server rejects the command
+        """
+        if self._write_buf is None:
+            raise RuntimeError("Write buffering is not active")
+        self._write_buf += payload
+        self._deferred.append(context)
+        if len(self._write_buf) >= self._write_flush_bytes:
+            self.flush()
+
+    def _read_line(self, sock: socket.socket) -> bytes:
+        """Read one reply line, buffering any bytes that arrive after it.
 
         Args:
-            response: Response string from server
+            sock: Connected socket to read from
 
         Returns:
-            (status, data) tuple where status is "OK" or "ERR"
+            Raw reply line with surrounding whitespace stripped
 
         Raises:
-            ProtocolError: If response format is invalid
+            ConnectionError: If the server closes the connection
+            OSError: On socket errors (translated by the caller)
         """
-        if not response:
-            raise ProtocolError("EMPTY", "Empty response from server")
-
-        parts = response.split(":", 1)
-        if len(parts) == 1:
-            # Response without colon (e.g., "OK" or "ERR")
-            status = parts[0].strip()
-            data = ""
-        else:
-            status, data = parts
-            status = status.strip()
-            data = data.strip()
-
-        if status not in ("OK", "ERR"):
-            raise ProtocolError("INVALID", f"Invalid response format: {response}")
-
-        return (status, data)
+        buf = self._recv_buf
+        scanned = 0
+        while (idx := buf.find(b"\n", scanned)) < 0:
+            scanned = len(buf)
+            n = sock.recv_into(self._recv_chunk)
+            if not n:
+                raise ConnectionError("Connection closed by server")
+            buf += self._recv_chunk[:n]
+
+        line = bytes(buf[:idx]).strip()
+        del buf[: idx + 1]
+        return line
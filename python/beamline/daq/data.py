@@ -2,14 +2,34 @@
 
 from __future__ import annotations
 
+import contextlib
 import csv
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Literal
+from typing import Literal, TextIO
 
 import numpy as np
 
 
+def _all_finite(values: np.ndarray) -> bool:
+    """Return True if no element is NaN or Inf (single pass over the data)."""
+    return bool(np.isfinite(values).all())
+
+
+def _is_nondecreasing(values: np.ndarray, block: int = 65536) -> bool:
+    """Return True if ``values[i + 1] >= values[i]`` for every i.
+
+    Compares adjacent elements through views instead of materializing
+    ``np.diff``, working in blocks so an inversion early in a long scan
+    returns without touching the rest and the boolean temporary stays small.
+    """
+    for start in range(0, len(values) - 1, block):
+        stop = min(start + block, len(values) - 1)
+        if np.less(values[start + 1 : stop + 1], values[start:stop]).any():
+            return False
+    return True
+
+
 @dataclass
 class ScanData:
     """Container for scan data with metadata.
@@ -22,15 +42,16 @@ class ScanData:
     timestamps: np.ndarray = field(default_factory=lambda: np.array([]))
     metadata: dict[str, object] = field(default_factory=dict)
 
-    def to_csv(self, path: Path | str, delimiter: str = ",") -> None:
-        """Export scan data to CSV file.
+    def to_csv(self, path: Path | str | TextIO, delimiter: str = ",") -> None:
+        """Export scan data to CSV file or text stream.
 
         CSV format:
         - Header row: timestamp, motor1_pos, motor2_pos, det1, det2, ...
         - Data rows: one per scan point
 
         Args:
-            path: Output file path
+            path: Output file path, or an open text-mode file-like object
+                (written to but not closed)
             delimiter: CSV delimiter (default: comma)
 
         Raises:
@@ -38,43 +59,39 @@ class ScanData:
         """
         self.validate()
 
-        path_obj = Path(path)
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
-
         # Determine number of points from timestamps
         n_points = len(self.timestamps)
         if n_points == 0:
             raise ValueError("No timestamps in data")
 
         # Collect all column names
-        columns = ["timestamp"]
-        columns.extend(sorted(self.motor_positions.keys()))
-        columns.extend(sorted(self.detector_readings.keys()))
-
-        with path_obj.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, delimiter=delimiter)
-
-            # Write header
-            writer.writerow(columns)
-
-            # Write data rows
-            for i in range(n_points):
-                row = [self.timestamps[i]]
-                # Add motor positions
-                for motor_pv in sorted(self.motor_positions.keys()):
-                    motor_data = self.motor_positions[motor_pv]
-                    if i < len(motor_data):
-                        row.append(motor_data[i])
-                    else:
-                        row.append(np.nan)
-                # Add detector readings
-                for det_pv in sorted(self.detector_readings.keys()):
-                    det_data = self.detector_readings[det_pv]
-                    if i < len(det_data):
-                        row.append(det_data[i])
-                    else:
-                        row.append(np.nan)
-                writer.writerow(row)
+        motor_pvs = sorted(self.motor_positions.keys())
+        det_pvs = sorted(self.detector_readings.keys())
+        columns = ["timestamp", *motor_pvs, *det_pvs]
+
+        # validate() guarantees every column has n_points entries
+        table = np.column_stack(
+            [
+                self.timestamps,
+                *(self.motor_positions[pv] for pv in motor_pvs),
+                *(self.detector_readings[pv] for pv in det_pvs),
+            ]
+        )
+
+        output: contextlib.AbstractContextManager[TextIO]
+        if isinstance(path, str | Path):
+            path_obj = Path(path)
+            path_obj.parent.mkdir(parents=True, exist_ok=True)
+            output = path_obj.open("w", newline="", encoding="utf-8")
+        else:
+            output = contextlib.nullcontext(path)
+
+        with output as f:
+            # Header through csv so PV names are quoted if they contain the delimiter
+            csv.writer(f, delimiter=delimiter).writerow(columns)
+            # repr() of plain Python floats (tolist() converts in C) is the shortest
+            # round-trip form; writelines() streams rows without a per-row write()
+            f.writelines(delimiter.join(map(repr, row)) + "\r\n" for row in table.tolist())
 
     def validate(self) -> None:
         """Validate data consistency.
@@ -92,14 +109,12 @@ class ScanData:
             raise ValueError("No timestamps in data")
 
         # Check for NaN/Inf in timestamps
-        if np.any(np.isnan(self.timestamps)) or np.any(np.isinf(self.timestamps)):
+        if not _all_finite(self.timestamps):
             raise ValueError("Timestamps contain NaN or Inf values")
 
         # Check timestamp ordering (allow equal for simultaneous measurements)
-        if len(self.timestamps) > 1:
-            diffs = np.diff(self.timestamps)
-            if np.any(diffs < 0):
-                raise ValueError("Timestamps are not monotonically increasing")
+        if not _is_nondecreasing(self.timestamps):
+            raise ValueError("Timestamps are not monotonically increasing")
 
         # Check motor positions
         expected_length = len(self.timestamps)
@@ -108,7 +123,7 @@ class ScanData:
                 raise ValueError(
                     f"Motor {motor_pv} has {len(positions)} points, expected {expected_length}"
                 )
-            if np.any(np.isnan(positions)) or np.any(np.isinf(positions)):
+            if not _all_finite(positions):
                 raise ValueError(f"Motor {motor_pv} contains NaN or Inf values")
 
         # Check detector readings
@@ -117,7 +132,7 @@ class ScanData:
                 raise ValueError(
                     f"Detector {det_pv} has {len(readings)} points, expected {expected_length}"
                 )
-            if np.any(np.isnan(readings)) or np.any(np.isinf(readings)):
+            if not _all_finite(readings):
                 raise ValueError(f"Detector {det_pv} contains NaN or Inf values")
 
     def to_nexus(
@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 import time
+from dataclasses import dataclass, field
 from enum import Enum
 
 import numpy as np
-from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from beamline.daq.client import DeviceClient
 from beamline.daq.exceptions import TimeoutError
@@ -19,25 +19,28 @@ class MotorStatus(str, Enum):
     MOVING = "MOVING"
 
 
-class Motor(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Motor:
     """High-level motor abstraction.
 
     Provides convenient methods for motor control with automatic readback
     and status polling.
-    """
 
-    pv: str = Field(..., description="Motor setpoint PV (e.g., 'BL02:SAMPLE:X')")
-    client: DeviceClient = Field(..., description="DeviceClient instance")
+    Attributes:
+        pv: Motor setpoint PV (e.g., 'BL02:SAMPLE:X')
+        client: DeviceClient instance
+    """
 
-    model_config = ConfigDict(strict=True, arbitrary_types_allowed=True)
+    pv: str
+    client: DeviceClient
+    _readback_pv: str = field(init=False, repr=False, compare=False)
 
-    @field_validator("pv")
-    @classmethod
-    def validate_pv(cls, v: str) -> str:
-        """Validate PV name format."""
-        if not v or ":" not in v:
-            raise ValueError(f"Invalid PV name: {v}")
-        return v
+    def __post_init__(self) -> None:
+        """Validate PV name format and derive the readback PV once."""
+        if not isinstance(self.pv, str) or ":" not in self.pv:
+            raise ValueError(f"Invalid PV name: {self.pv}")
+        # Frozen: the readback name can never go stale, so format it only once
+        object.__setattr__(self, "_readback_pv", f"{self.pv}.RBV")
 
     def move_to(self, position: float, wait: bool = True, timeout: float = 60.0) -> None:
         """Move motor to target position.
@@ -83,44 +86,74 @@ class Motor(BaseModel):
             # Handle unexpected status values
             return MotorStatus.IDLE if status_str == "IDLE" else MotorStatus.MOVING
 
-    def wait_for_idle(self, timeout: float = 60.0, poll_interval: float = 0.1) -> None:
+    def wait_for_idle(
+        self, timeout: float = 60.0, poll_interval: float = 0.1, use_monitor: bool = False
+    ) -> None:
         """Wait until motor is idle.
 
-        Polls STATUS command until IDLE or timeout.
+        Polls STATUS until IDLE or timeout. The first polls are 2 ms apart and
+        the interval grows by 1.5x up to ``poll_interval``, so short moves are
+        noticed quickly without flooding the server during long ones. With
+        ``use_monitor=True`` the server pushes the motor's ``.DMOV`` PV instead
+        (MONITOR command) and no per-sample requests are sent.
 
         Args:
             timeout: Maximum wait time in seconds
-            poll_interval: Polling interval in seconds
+            poll_interval: Maximum polling interval in seconds
+            use_monitor: Wait on server-pushed updates instead of polling
 
         Raises:
             TimeoutError: If motor doesn't become idle within timeout
         """
-        start_time = time.time()
+        if use_monitor:
+            interval_ms = max(1, round(poll_interval * 1000))
+            try:
+                self.client.monitor_until(
+                    self.done_moving_pv, lambda moving: moving < 0.5, interval_ms, timeout
+                )
+            except TimeoutError as e:
+                raise TimeoutError(
+                    f"Motor {self.pv} did not reach IDLE state within {timeout}s"
+                ) from e
+            return
+
+        start_time = time.monotonic()
+        delay = min(0.002, poll_interval)
 
         while True:
             current_status = self.status()
             if current_status == MotorStatus.IDLE:
                 return
 
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             if elapsed >= timeout:
                 raise TimeoutError(f"Motor {self.pv} did not reach IDLE state within {timeout}s")
 
-            time.sleep(poll_interval)
+            time.sleep(min(delay, timeout - elapsed))
+            delay = min(poll_interval, delay * 1.5)
 
     @property
     def readback_pv(self) -> str:
         """Get readback PV name (.RBV suffix)."""
-        return f"{self.pv}.RBV"
+        return self._readback_pv
 
+    @property
+    def done_moving_pv(self) -> str:
+        """Get motion status PV name (.DMOV suffix, 1.0 while moving, 0.0 when idle)."""
+        return f"{self.pv}.DMOV"
 
-class Detector(BaseModel):
-    """High-level detector abstraction."""
 
-    pv: str = Field(..., description="Detector PV name")
-    client: DeviceClient = Field(..., description="DeviceClient instance")
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Detector:
+    """High-level detector abstraction.
 
-    model_config = ConfigDict(strict=True, arbitrary_types_allowed=True)
+    Attributes:
+        pv: Detector PV name
+        client: DeviceClient instance
+    """
+
+    pv: str
+    client: DeviceClient
 
     def read(self) -> float:
         """Read detector value.
@@ -136,7 +169,8 @@ class Detector(BaseModel):
     def read_multiple(self, n: int, dwell_time: float = 0.1) -> np.ndarray:
         """Read detector multiple times and return array of readings.
 
-        Useful for noise reduction or averaging.
+        Useful for noise reduction or averaging. With ``dwell_time=0`` all
+        reads are pipelined into a single round trip.
 
         Args:
             n: Number of readings
@@ -148,22 +182,29 @@ class Detector(BaseModel):
         Raises:
             ProtocolError: If any read fails
         """
-        readings = []
-        for _ in range(n):
-            readings.append(self.read())
-            if dwell_time > 0:
-                time.sleep(dwell_time)
-        return np.array(readings)
+        if dwell_time <= 0:
+            return self.client.get_many([self.pv] * n)
+
+        readings = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            readings[i] = self.read()
+            time.sleep(dwell_time)
+        return readings
 
 
-class Shutter(BaseModel):
-    """Shutter control abstraction."""
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Shutter:
+    """Shutter control abstraction.
 
-    status_pv: str = Field(default="BL02:SHUTTER:STATUS", description="Status PV name")
-    cmd_pv: str = Field(default="BL02:SHUTTER:CMD", description="Command PV name")
-    client: DeviceClient = Field(..., description="DeviceClient instance")
+    Attributes:
+        status_pv: Status PV name
+        cmd_pv: Command PV name
+        client: DeviceClient instance
+    """
 
-    model_config = ConfigDict(strict=True, arbitrary_types_allowed=True)
+    status_pv: str = "BL02:SHUTTER:STATUS"
+    cmd_pv: str = "BL02:SHUTTER:CMD"
+    client: DeviceClient
 
     def open(self) -> None:
         """Open shutter.
@@ -3,14 +3,55 @@
 from __future__ import annotations
 
 import datetime
+from collections.abc import Mapping, Sequence
+from itertools import islice
 from pathlib import Path
 from typing import Any, Literal
 
 import h5py
 import numpy as np
+from numpy.typing import DTypeLike, NDArray
 
 from beamline.daq.data import ScanData
 
+CompressionFilter = Literal["gzip", "lzf"]
+
+# 1 MiB of float64: fills, but does not overflow, HDF5's default 1 MiB chunk cache
+_MAX_CHUNK_POINTS = 131072
+_MIN_CHUNKED_POINTS = 1024
+
+# Twice the largest chunk, so a chunk never straddles a page boundary
+CLOUD_PAGE_SIZE = 2 * _MAX_CHUNK_POINTS * 8
+
+# Dataset names replace PV separators; attribute keys replace spaces and dashes
+_DATASET_NAME_TABLE = str.maketrans({":": "_", "/": "_"})
+_ATTR_KEY_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+def _compute_chunks(n_points: int) -> tuple[int] | None:
+    """Choose the chunk shape for a 1-D scan dataset.
+
+    Args:
+        n_points: Number of points in the dataset
+
+    Returns:
+        Chunk shape of at most 1 MiB of float64, or None for scans short
+        enough that h5py's own layout (contiguous, or a single chunk when
+        filtered) is already optimal
+    """
+    if n_points < _MIN_CHUNKED_POINTS:
+        return None
+    return (min(n_points, _MAX_CHUNK_POINTS),)
+
+
+def _as_f64(values: np.ndarray) -> np.ndarray:
+    """Return ``values`` as a contiguous float64 array, copying only if needed.
+
+    ``astype`` copies even when the dtype already matches; scan arrays are
+    float64 almost always, so this avoids a full copy per dataset.
+    """
+    return np.ascontiguousarray(values, dtype=np.float64)
+
 
 class NeXusWriter:
     """NeXus/HDF5 file writer following NXxas application definition.
@@ -28,27 +69,63 @@ class NeXusWriter:
         self,
         filename: str | Path,
         mode: Literal["w", "w-", "a"] = "w",
-        compression: int = 1,
+        compression: CompressionFilter | int | None = "lzf",
+        compression_opts: int | None = None,
+        page_size: int | None = None,
+        detector_dtype: DTypeLike = np.float64,
+        in_memory: bool = False,
     ) -> None:
         """Initialize NeXus file.
 
+        LZF is the default: it is several times faster than gzip on float64
+        scan data for a modestly larger file. An integer selects gzip at that
+        level (0 disables compression), as in earlier versions.
+
         Args:
             filename: Output HDF5 file path
             mode: File mode ('w' overwrite, 'w-' fail if exists, 'a' append)
-            compression: Gzip compression level (0-9, default 1)
+            compression: Filter name ("lzf", "gzip"), gzip level 0-9, or None
+            compression_opts: Gzip level when compression="gzip" (default 1);
+                not accepted for LZF, which has no options
+            page_size: Create the file with the paged file-space strategy and
+                this page size in bytes, so metadata and chunks are aligned for
+                range reads from object storage (``CLOUD_PAGE_SIZE`` suits the
+                default chunking). Every file is then at least two pages long,
+                so leave None for small local scans. Ignored when appending to
+                an existing file.
+            detector_dtype: Floating-point dtype for detector datasets.
+                ``np.float32`` halves their size and compression time, at about
+                seven significant digits; energy and motor positions are
+                always float64.
+            in_memory: Build the file in memory with the HDF5 core driver and
+                never write it to ``filename``. Useful for write-then-read
+                checks; the file is discarded on close.
 
         Raises:
-            ValueError: If compression level is not in range 0-9
+            ValueError: If the compression filter, level or options are invalid,
+                or page_size is below the HDF5 minimum of 512 bytes, or
+                detector_dtype is not a floating-point type
             OSError: If file cannot be opened
         """
-        if not (0 <= compression <= 9):
-            raise ValueError(f"Compression level must be 0-9, got {compression}")
+        self._filter, self._filter_opts = self._resolve_compression(compression, compression_opts)
+        if page_size is not None and page_size < 512:
+            raise ValueError(f"page_size must be >= 512 bytes, got {page_size}")
+        if np.dtype(detector_dtype).kind != "f":
+            raise ValueError(f"detector_dtype must be a floating-point type, got {detector_dtype}")
 
         self.filename = Path(filename)
         self.mode = mode
         self.compression = compression
+        self.compression_opts = compression_opts
+        self.page_size = page_size
+        self.detector_dtype = np.dtype(detector_dtype)
+        self.in_memory = in_memory
         self._file: h5py.File | None = None
         self._entry_group: h5py.Group | None = None
+        # Datasets of the scan being streamed by begin_scan/append_point
+        self._stream: list[tuple[h5py.Dataset, str, int]] | None = None
+        self._stream_shape = (0, 0)
+        self._stream_points = 0
 
     def __enter__(self) -> NeXusWriter:
         """Context manager entry."""
@@ -64,7 +141,19 @@ class NeXusWriter:
         if self._file is not None:
             return
 
-        self._file = h5py.File(self.filename, mode=self.mode)
+        file_kwargs: dict[str, Any] = {}
+        if self.page_size is not None and not (self.mode == "a" and self.filename.exists()):
+            # File-space strategy is fixed at creation and persisted in the file
+            file_kwargs = {
+                "fs_strategy": "page",
+                "fs_page_size": self.page_size,
+                "fs_persist": True,
+            }
+
+        if self.in_memory:
+            file_kwargs.update(driver="core", backing_store=False)
+
+        self._file = h5py.File(self.filename, mode=self.mode, **file_kwargs)
 
         # Create entry group (NXentry)
         self._entry_group = self._file.create_group("entry")
@@ -77,6 +166,46 @@ class NeXusWriter:
             self._file.close()
             self._file = None
             self._entry_group = None
+            self._stream = None
+
+    @staticmethod
+    def _resolve_compression(
+        compression: CompressionFilter | int | None, compression_opts: int | None
+    ) -> tuple[CompressionFilter | None, int | None]:
+        """Map the public compression arguments to an h5py filter and its options."""
+        if isinstance(compression, int) and not isinstance(compression, bool):
+            if compression_opts is not None:
+                raise ValueError("compression_opts requires compression='gzip'")
+            if not (0 <= compression <= 9):
+                raise ValueError(f"Compression level must be 0-9, got {compression}")
+            return ("gzip", compression) if compression > 0 else (None, None)
+
+        if compression is None:
+            return None, None
+        if compression == "lzf":
+            if compression_opts is not None:
+                raise ValueError("LZF compression does not take compression_opts")
+            return "lzf", None
+        if compression == "gzip":
+            level = 1 if compression_opts is None else compression_opts
+            if not (0 <= level <= 9):
+                raise ValueError(f"Compression level must be 0-9, got {level}")
+            return "gzip", level
+        raise ValueError(f"Unsupported compression: {compression!r}")
+
+    def _dset_kwargs(self) -> dict[str, Any]:
+        """Filter keyword arguments shared by every array dataset.
+
+        Compressed datasets also get the byte-shuffle filter, which groups the
+        slowly varying exponent bytes of float64 samples and shrinks the output
+        by a quarter or more, and a Fletcher-32 checksum per chunk.
+        """
+        if self._filter is None:
+            return {}
+        kwargs: dict[str, Any] = {"compression": self._filter, "shuffle": True, "fletcher32": True}
+        if self._filter_opts is not None:
+            kwargs["compression_opts"] = self._filter_opts
+        return kwargs
 
     def write_scan(
         self,
@@ -120,21 +249,177 @@ class NeXusWriter:
         # Validate scan data
         scan_data.validate()
 
+        n_points = len(scan_data.timestamps)
+        columns = self._create_layout(
+            self._entry_group,
+            list(scan_data.motor_positions),
+            list(scan_data.detector_readings),
+            title,
+            scan_type,
+            scan_data.metadata,
+        )
+        self._set_start_time(self._entry_group, scan_data.timestamps[0])
+
+        chunks = _compute_chunks(n_points)
+        filter_kwargs = self._dset_kwargs()
+
+        for group, name, kind, key in columns:
+            if kind == "motor":
+                data = _as_f64(scan_data.motor_positions[key])
+            elif kind == "detector":
+                data = np.ascontiguousarray(
+                    scan_data.detector_readings[key], dtype=self.detector_dtype
+                )
+            else:
+                # Fallback energy axis: use index
+                data = np.arange(n_points, dtype=np.float64)
+            group.create_dataset(name, data=data, dtype=data.dtype, **filter_kwargs, chunks=chunks)
+
+        self._link_default_plot(self._entry_group, scan_type, bool(scan_data.detector_readings))
+
+    def begin_scan(
+        self,
+        motors: Sequence[str],
+        detectors: Sequence[str],
+        n_points: int | None = None,
+        title: str | None = None,
+        scan_type: Literal["linear", "mesh", "xafs"] = "linear",
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Start writing a scan point by point.
+
+        Creates the same structure as ``write_scan`` with empty, resizable
+        datasets that ``append_point`` extends as the scan runs, so acquired
+        points reach the file during the scan instead of only at the end.
+        Finish with ``end_scan``.
+
+        Args:
+            motors: Motor PV names, in the order of ``append_point`` positions
+                (the first one is the energy axis)
+            detectors: Detector PV names, in the order of ``append_point``
+                values (the first one is the default signal)
+            n_points: Expected number of points, used to size chunks
+            title: Scan title (default: from metadata or auto-generated)
+            scan_type: Scan type for proper axis labeling
+            metadata: Scan metadata (title, ring_current, sample_name)
+
+        Raises:
+            RuntimeError: If file is not open or a scan is already in progress
+        """
+        if self._file is None or self._entry_group is None:
+            raise RuntimeError("File not open. Use open() or context manager.")
+        if self._stream is not None:
+            raise RuntimeError("Scan already in progress. Call end_scan() first.")
+
+        columns = self._create_layout(
+            self._entry_group, list(motors), list(detectors), title, scan_type, metadata or {}
+        )
+
+        chunk_points = min(n_points, _MAX_CHUNK_POINTS) if n_points else _MIN_CHUNKED_POINTS
+        filter_kwargs = self._dset_kwargs()
+        motor_index = {pv: i for i, pv in enumerate(motors)}
+        detector_index = {pv: i for i, pv in enumerate(detectors)}
+
+        stream: list[tuple[h5py.Dataset, str, int]] = []
+        for group, name, kind, key in columns:
+            dtype = self.detector_dtype if kind == "detector" else np.dtype(np.float64)
+            dataset = group.create_dataset(
+                name,
+                shape=(0,),
+                maxshape=(None,),
+                dtype=dtype,
+                **filter_kwargs,
+                chunks=(chunk_points,),
+            )
+            index = detector_index[key] if kind == "detector" else motor_index.get(key, -1)
+            stream.append((dataset, kind, index))
+
+        self._link_default_plot(self._entry_group, scan_type, bool(detectors))
+        self._stream = stream
+        self._stream_shape = (len(motors), len(detectors))
+        self._stream_points = 0
+
+    def append_point(
+        self,
+        positions: Sequence[float],
+        values: Sequence[float] | NDArray[np.float64],
+        timestamp: float,
+    ) -> None:
+        """Append one scan point to the datasets created by ``begin_scan``.
+
+        Args:
+            positions: Motor positions, in ``begin_scan`` motor order
+            values: Detector readings, in ``begin_scan`` detector order
+            timestamp: Unix time of the reading
+
+        Raises:
+            RuntimeError: If no scan is in progress
+            ValueError: If positions or values have the wrong length
+        """
+        if self._stream is None or self._entry_group is None:
+            raise RuntimeError("No scan in progress. Call begin_scan() first.")
+
+        n_motors, n_detectors = self._stream_shape
+        if len(positions) != n_motors:
+            raise ValueError(f"Expected {n_motors} positions, got {len(positions)}")
+        if len(values) != n_detectors:
+            raise ValueError(f"Expected {n_detectors} detector values, got {len(values)}")
+
+        i = self._stream_points
+        if i == 0:
+            self._set_start_time(self._entry_group, timestamp)
+
+        for dataset, kind, index in self._stream:
+            dataset.resize((i + 1,))
+            if kind == "detector":
+                dataset[i] = values[index]
+            elif kind == "motor":
+                dataset[i] = positions[index]
+            else:
+                dataset[i] = i
+        self._stream_points = i + 1
+
+    def end_scan(self) -> int:
+        """Finish a scan started with ``begin_scan`` and flush it to disk.
+
+        Returns:
+            Number of points written
+
+        Raises:
+            RuntimeError: If no scan is in progress
+        """
+        if self._stream is None or self._file is None:
+            raise RuntimeError("No scan in progress. Call begin_scan() first.")
+
+        self._file.flush()
+        self._stream = None
+        return self._stream_points
+
+    def _create_layout(
+        self,
+        entry_group: h5py.Group,
+        motors: list[str],
+        detectors: list[str],
+        title: str | None,
+        scan_type: Literal["linear", "mesh", "xafs"],
+        metadata: Mapping[str, Any],
+    ) -> list[tuple[h5py.Group, str, str, str]]:
+        """Create the NXxas groups and decide which array goes where.
+
+        Returns:
+            ``(group, dataset name, kind, PV)`` for every 1-D dataset, where
+            kind is "motor", "detector" or "index" (energy axis fallback)
+        """
         # Set title
         if title is None:
-            title_str: str | object = scan_data.metadata.get(
+            title_str: str | object = metadata.get(
                 "title", f"Scan {datetime.datetime.now().isoformat()}"
             )
             title = str(title_str) if not isinstance(title_str, str) else title_str
-        self._entry_group.attrs["title"] = title
-
-        # Set start time (ISO 8601)
-        if len(scan_data.timestamps) > 0:
-            start_time = datetime.datetime.fromtimestamp(scan_data.timestamps[0], tz=datetime.UTC)
-            self._entry_group.attrs["start_time"] = start_time.isoformat()
+        entry_group.attrs["title"] = title
 
         # Create instrument group
-        instrument_group = self._entry_group.create_group("instrument")
+        instrument_group = entry_group.create_group("instrument")
         instrument_group.attrs["NX_class"] = "NXinstrument"
 
         # Source group
@@ -143,108 +428,70 @@ class NeXusWriter:
         source_group.attrs["type"] = "Synchrotron X-ray Source"
 
         # Ring current from metadata
-        ring_current = scan_data.metadata.get("ring_current", 0.0)
+        ring_current = metadata.get("ring_current", 0.0)
         source_group.create_dataset("current", data=ring_current, dtype=np.float64)
 
         # Monochromator group
         monochromator_group = instrument_group.create_group("monochromator")
         monochromator_group.attrs["NX_class"] = "NXmonochromator"
 
-        # Energy axis: use motor position for XAFS, or two_theta for XRD
-        n_points = len(scan_data.timestamps)
-        if scan_type == "xafs" and scan_data.motor_positions:
-            # Use first motor as energy (typically monochromator)
-            energy_motor = next(iter(scan_data.motor_positions.values()))
-            energy_data = energy_motor.astype(np.float64)
-        elif scan_type in ("linear", "mesh") and scan_data.motor_positions:
-            # Use first motor as two_theta or position
-            energy_motor = next(iter(scan_data.motor_positions.values()))
-            energy_data = energy_motor.astype(np.float64)
+        # Energy axis: first motor (monochromator for XAFS, two_theta or position otherwise)
+        columns: list[tuple[h5py.Group, str, str, str]] = []
+        if motors:
+            columns.append((monochromator_group, "energy", "motor", motors[0]))
         else:
-            # Fallback: use index
-            energy_data = np.arange(n_points, dtype=np.float64)
-
-        # Determine chunking for large datasets
-        chunks = True if n_points > 10000 else None
-
-        monochromator_group.create_dataset(
-            "energy",
-            data=energy_data,
-            dtype=np.float64,
-            compression="gzip" if self.compression > 0 else None,
-            compression_opts=self.compression if self.compression > 0 else None,
-            chunks=chunks,
-        )
+            columns.append((monochromator_group, "energy", "index", ""))
 
         # Detector group
         detector_group = instrument_group.create_group("detector")
         detector_group.attrs["NX_class"] = "NXdetector"
 
-        # Write detector data (use first detector as default signal)
-        if scan_data.detector_readings:
-            default_detector = next(iter(scan_data.detector_readings.values()))
-            detector_group.create_dataset(
-                "data",
-                data=default_detector.astype(np.float64),
-                dtype=np.float64,
-                compression="gzip" if self.compression > 0 else None,
-                compression_opts=self.compression if self.compression > 0 else None,
-                chunks=chunks,
-            )
-
-            # Write additional detectors as separate datasets
-            for det_name, det_data in list(scan_data.detector_readings.items())[1:]:
-                sanitized_name = det_name.replace(":", "_").replace("/", "_")
-                detector_group.create_dataset(
-                    sanitized_name,
-                    data=det_data.astype(np.float64),
-                    dtype=np.float64,
-                    compression="gzip" if self.compression > 0 else None,
-                    compression_opts=self.compression if self.compression > 0 else None,
-                    chunks=chunks,
-                )
+        # Detector data (use first detector as default signal, others as separate datasets)
+        if detectors:
+            columns.append((detector_group, "data", "detector", detectors[0]))
+            for det_name in islice(detectors, 1, None):
+                sanitized_name = det_name.translate(_DATASET_NAME_TABLE)
+                columns.append((detector_group, sanitized_name, "detector", det_name))
 
         # Sample group
-        sample_group = self._entry_group.create_group("sample")
+        sample_group = entry_group.create_group("sample")
         sample_group.attrs["NX_class"] = "NXsample"
 
         # Sample name from metadata
-        sample_name = scan_data.metadata.get("sample_name", "unknown")
+        sample_name = metadata.get("sample_name", "unknown")
         sample_group.attrs["name"] = sample_name
 
         # Motor positions as sample positions
-        motor_keys = sorted(scan_data.motor_positions.keys())
-        if len(motor_keys) >= 1:
-            sample_group.create_dataset(
-                "position_x",
-                data=scan_data.motor_positions[motor_keys[0]].astype(np.float64),
-                dtype=np.float64,
-                compression="gzip" if self.compression > 0 else None,
-                compression_opts=self.compression if self.compression > 0 else None,
-                chunks=chunks,
-            )
-        if len(motor_keys) >= 2:
-            sample_group.create_dataset(
-                "position_y",
-                data=scan_data.motor_positions[motor_keys[1]].astype(np.float64),
-                dtype=np.float64,
-                compression="gzip" if self.compression > 0 else None,
-                compression_opts=self.compression if self.compression > 0 else None,
-                chunks=chunks,
-            )
+        motor_keys = sorted(motors)
+        for name, pv in zip(("position_x", "position_y"), motor_keys, strict=False):
+            columns.append((sample_group, name, "motor", pv))
+
+        return columns
 
-        # Data group (NXdata) - default plot
-        data_group = self._entry_group.create_group("data")
+    def _link_default_plot(
+        self,
+        entry_group: h5py.Group,
+        scan_type: Literal["linear", "mesh", "xafs"],
+        has_detectors: bool,
+    ) -> None:
+        """Create the NXdata group linking the default signal and axis."""
+        data_group = entry_group.create_group("data")
         data_group.attrs["NX_class"] = "NXdata"
 
         # Set signal and axes
-        if scan_data.detector_readings:
+        if has_detectors:
             data_group.attrs["signal"] = "intensity"
             data_group.attrs["axes"] = ["energy"] if scan_type == "xafs" else ["two_theta"]
 
             # Link to detector data
-            data_group["intensity"] = detector_group["data"]
-            data_group["energy"] = monochromator_group["energy"]
+            data_group["intensity"] = entry_group["instrument/detector/data"]
+            data_group["energy"] = entry_group["instrument/monochromator/energy"]
+
+    @staticmethod
+    def _set_start_time(entry_group: h5py.Group, timestamp: float) -> None:
+        """Store the scan start time as ISO 8601."""
+        start_time = datetime.datetime.fromtimestamp(timestamp, tz=datetime.UTC)
+        entry_group.attrs["start_time"] = start_time.isoformat()
 
     def add_metadata(self, key: str, value: Any) -> None:
         """Add custom metadata to /entry group.
@@ -257,22 +504,40 @@ class NeXusWriter:
             RuntimeError: If file is not open
             TypeError: If value cannot be serialized to HDF5
         """
+        self.add_metadata_batch({key: value})
+
+    def add_metadata_batch(self, metadata: Mapping[str, Any]) -> None:
+        """Add several custom metadata entries to /entry group.
+
+        Keys are sanitized and values converted as in ``add_metadata``.
+
+        Args:
+            metadata: Mapping of metadata keys to values
+
+        Raises:
+            RuntimeError: If file is not open
+            TypeError: If a value cannot be serialized to HDF5
+        """
         if self._file is None or self._entry_group is None:
             raise RuntimeError("File not open. Use open() or context manager.")
 
-        # Sanitize key (HDF5 attribute names should be valid identifiers)
-        sanitized_key = key.replace(" ", "_").replace("-", "_")
+        # Sanitize keys (HDF5 attribute names should be valid identifiers)
+        attrs = {
+            key.translate(_ATTR_KEY_TABLE): _to_attr_value(value) for key, value in metadata.items()
+        }
+        self._entry_group.attrs.update(attrs)
 
-        # Convert value to HDF5-compatible type
-        if (
-            isinstance(value, str | int | float | bool)
-            or (
-                isinstance(value, list | tuple)
-                and all(isinstance(v, str | int | float | bool) for v in value)
-            )
-            or isinstance(value, np.ndarray)
-        ):
-            self._entry_group.attrs[sanitized_key] = value
-        else:
-            # Try to convert to string
-            self._entry_group.attrs[sanitized_key] = str(value)
+
+def _to_attr_value(value: Any) -> Any:
+    """Convert a metadata value to an HDF5-compatible attribute value."""
+    if (
+        isinstance(value, str | int | float | bool)
+        or (
+            isinstance(value, list | tuple)
+            and all(isinstance(v, str | int | float | bool) for v in value)
+        )
+        or isinstance(value, np.ndarray)
+    ):
+        return value
+    # Try to convert to string
+    return str(value)
@@ -0,0 +1,156 @@
+"""Connection pool for reusing DeviceClient connections."""
+
+from __future__ import annotations
+
+import contextlib
+import select
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from types import TracebackType
+
+from beamline.daq.client import DeviceClient
+from beamline.daq.exceptions import ProtocolError
+
+
+class DeviceClientPool:
+    """Pool of idle, connected DeviceClient instances keyed by (host, port).
+
+    Handing out an already-connected client avoids the TCP handshake for every
+    short-lived workflow. Idle connections are health-checked before reuse and
+    evicted after ``max_idle_time`` seconds. Thread-safe: each acquired client
+    is used by one caller at a time.
+
+    Example:
+        >>> pool = DeviceClientPool()
+        >>> with pool.acquire("localhost", 5064) as client:
+        ...     client.get("BL02:RING:CURRENT")
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 4,
+        max_idle_time: float = 60.0,
+        timeout: float = 5.0,
+    ) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            max_idle: Maximum idle connections kept per (host, port)
+            max_idle_time: Seconds after which an idle connection is closed
+            timeout: Socket timeout for newly created clients
+
+        Raises:
+            ValueError: If max_idle is negative or max_idle_time is not positive
+        """
+        if max_idle < 0:
+            raise ValueError(f"max_idle must be >= 0, got {max_idle}")
+        if max_idle_time <= 0:
+            raise ValueError(f"max_idle_time must be > 0, got {max_idle_time}")
+
+        self.max_idle = max_idle
+        self.max_idle_time = max_idle_time
+        self.timeout = timeout
+        self._idle: dict[tuple[str, int], deque[tuple[DeviceClient, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> DeviceClientPool:
+        """Context manager entry."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Context manager exit: close all idle connections."""
+        self.close()
+
+    @contextlib.contextmanager
+    def acquire(self, host: str = "localhost", port: int = 5064) -> Iterator[DeviceClient]:
+        """Borrow a connected client, returning it to the pool afterwards.
+
+        The client is put back only if the block finished normally or raised a
+        server-side ``ProtocolError``; any other exception leaves the connection
+        state unknown, so it is closed instead.
+
+        Args:
+            host: Server hostname or IP address
+            port: TCP port
+
+        Yields:
+            Connected DeviceClient
+
+        Raises:
+            ConnectionError: If a new connection cannot be established
+        """
+        client = self._checkout((host, port))
+        if client is None:
+            client = DeviceClient(host, port, timeout=self.timeout)
+            client.connect()
+
+        try:
+            yield client
+        except ProtocolError:
+            self._release(client)
+            raise
+        except BaseException:
+            client.disconnect()
+            raise
+        else:
+            self._release(client)
+
+    def close(self) -> None:
+        """Disconnect and drop all idle connections."""
+        with self._lock:
+            idle = [client for entries in self._idle.values() for client, _ in entries]
+            self._idle.clear()
+        for client in idle:
+            client.disconnect()
+
+    def _checkout(self, key: tuple[str, int]) -> DeviceClient | None:
+        """Pop the most recently used healthy idle client for ``key``, if any."""
+        stale: list[DeviceClient] = []
+        found: DeviceClient | None = None
+        deadline = time.monotonic() - self.max_idle_time
+
+        with self._lock:
+            entries = self._idle.get(key)
+            while entries:
+                client, released_at = entries.pop()
+                if released_at >= deadline and _is_alive(client):
+                    found = client
+                    break
+                stale.append(client)
+
+        for client in stale:
+            client.disconnect()
+        return found
+
+    def _release(self, client: DeviceClient) -> None:
+        """Return a client to the idle set, or close it if the pool is full."""
+        if client.is_idle():
+            with self._lock:
+                entries = self._idle.setdefault((client.host, client.port), deque())
+                if len(entries) < self.max_idle:
+                    entries.append((client, time.monotonic()))
+                    return
+        client.disconnect()
+
+
+def _is_alive(client: DeviceClient) -> bool:
+    """Check an idle client's socket without blocking.
+
+    An idle connection should have nothing to read: a peer that has closed it
+    makes the socket readable with EOF, and unsolicited bytes would put the
+    reply stream out of sync. Either way the connection is not reusable.
+    """
+    if not client.connected:
+        return False
+    try:
+        readable, _, _ = select.select([client], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    return not readable
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import contextlib
 import time
-from typing import Literal
+from collections.abc import Callable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Literal
 
 import numpy as np
+from numpy.typing import NDArray
 from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
 from beamline.daq.client import DeviceClient
 from beamline.daq.data import ScanData
 from beamline.daq.device import Motor
 
+if TYPE_CHECKING:
+    from beamline.daq.nexus import NeXusWriter
+
 
 class ScanConfig(BaseModel):
     """Base scan configuration."""
@@ -125,14 +131,13 @@ class XAFSScanConfig(ScanConfig):
         Returns:
             Array of energy values in eV
         """
-        energies: list[float] = []
+        segments: list[np.ndarray] = []
         for start_offset, stop_offset, step_size in self.regions:
             start = self.edge + start_offset
             stop = self.edge + stop_offset
             n_steps = int((stop - start) / step_size) + 1
-            region_energies = np.linspace(start, stop, n_steps)
-            energies.extend(region_energies)
-        return np.array(energies)
+            segments.append(np.linspace(start, stop, n_steps))
+        return np.concatenate(segments)
 
 
 class ScanEngine:
@@ -146,7 +151,7 @@ class ScanEngine:
         """
         self.client = client
 
-    def run_linear(self, config: LinearScanConfig) -> ScanData:
+    def run_linear(self, config: LinearScanConfig, writer: NeXusWriter | None = None) -> ScanData:
         """Execute linear scan.
 
         Algorithm:
@@ -154,12 +159,13 @@ class ScanEngine:
         2. For each position:
            a. Move motor to position (wait for completion)
            b. Sleep dwell_time
-           c. Read all detectors
-           d. Record timestamp
+           c. Read all detectors in one pipelined round trip
+           d. Record timestamp (and append the point to writer, if given)
         3. Return ScanData
 
         Args:
             config: Linear scan configuration
+            writer: Open NeXusWriter to stream points to as they are acquired
 
         Returns:
             ScanData with motor positions, detector readings, and timestamps
@@ -167,45 +173,48 @@ class ScanEngine:
         motor = Motor(pv=config.motor, client=self.client)
         positions = config.positions
         n_points = len(positions)
+        metadata: dict[str, Any] = {
+            "scan_type": "linear",
+            "motor": config.motor,
+            "start": config.start,
+            "stop": config.stop,
+            "steps": config.steps,
+            "dwell_time": config.dwell_time,
+        }
 
         # Pre-allocate arrays
         timestamps = np.zeros(n_points)
-        detector_data: dict[str, list[float]] = {det: [] for det in config.detectors}
+        detector_block = np.empty((len(config.detectors), n_points))
 
         # Execute scan
-        for i, pos in enumerate(positions):
-            # Move motor
-            motor.move_to(pos, wait=True, timeout=60.0)
+        with _stream_points(
+            writer, [config.motor], config.detectors, n_points, "linear", metadata
+        ) as append_point:
+            for i, pos in enumerate(positions):
+                # Move motor
+                motor.move_to(pos, wait=True, timeout=60.0)
 
-            # Dwell time
-            time.sleep(config.dwell_time)
+                # Dwell time
+                time.sleep(config.dwell_time)
 
-            # Read detectors
-            timestamp = time.time()
-            timestamps[i] = timestamp
+                # Read detectors
+                timestamp = time.time()
+                timestamps[i] = timestamp
 
-            for det_pv in config.detectors:
-                value = self.client.get(det_pv)
-                detector_data[det_pv].append(value)
+                detector_block[:, i] = self.client.get_many(config.detectors)
+                append_point((pos,), detector_block[:, i], timestamp)
 
-        # Convert lists to numpy arrays
-        detector_readings = {det_pv: np.array(values) for det_pv, values in detector_data.items()}
+        # One contiguous row per detector
+        detector_readings = dict(zip(config.detectors, detector_block, strict=True))
 
         return ScanData(
             motor_positions={config.motor: positions},
             detector_readings=detector_readings,
             timestamps=timestamps,
-            metadata={
-                "scan_type": "linear",
-                "motor": config.motor,
-                "start": config.start,
-                "stop": config.stop,
-                "steps": config.steps,
-                "dwell_time": config.dwell_time,
-            },
+            metadata=metadata,
         )
 
-    def run_mesh(self, config: MeshScanConfig) -> ScanData:
+    def run_mesh(self, config: MeshScanConfig, writer: NeXusWriter | None = None) -> ScanData:
         """Execute 2D mesh scan.
 
         Algorithm:
@@ -214,11 +223,13 @@ class ScanEngine:
            a. Move both motors
            b. Wait for both to be idle
            c. Sleep dwell_time
-           d. Read all detectors
+           d. Read all detectors in one pipelined round trip
+           e. Append the point to writer, if given
         3. Return ScanData with 2D arrays flattened
 
         Args:
             config: Mesh scan configuration
+            writer: Open NeXusWriter to stream points to as they are acquired
 
         Returns:
             ScanData with motor positions, detector readings, and timestamps
@@ -232,18 +243,29 @@ class ScanEngine:
         positions1 = config.positions1
         positions2 = config.positions2
 
-        n_points = len(positions1) * len(positions2)
+        # Flattened grid, motor2 varying fastest
+        grid1, grid2 = np.meshgrid(positions1, positions2, indexing="ij")
+        motor1_positions = grid1.ravel()
+        motor2_positions = grid2.ravel()
+        n_points = motor1_positions.size
+        metadata: dict[str, Any] = {
+            "scan_type": "mesh",
+            "motor1": motor1_pv,
+            "motor2": motor2_pv,
+            "dwell_time": config.dwell_time,
+        }
 
         # Pre-allocate arrays
         timestamps = np.zeros(n_points)
-        motor1_positions = np.zeros(n_points)
-        motor2_positions = np.zeros(n_points)
-        detector_data: dict[str, list[float]] = {det: [] for det in config.detectors}
+        detector_block = np.empty((len(config.detectors), n_points))
 
         # Execute scan
-        point_idx = 0
-        for pos1 in positions1:
-            for pos2 in positions2:
+        with _stream_points(
+            writer, [motor1_pv, motor2_pv], config.detectors, n_points, "mesh", metadata
+        ) as append_point:
+            for point_idx, (pos1, pos2) in enumerate(
+                zip(motor1_positions.tolist(), motor2_positions.tolist(), strict=True)
+            ):
                 # Move both motors
                 motor1.move_to(pos1, wait=True, timeout=60.0)
                 motor2.move_to(pos2, wait=True, timeout=60.0)
@@ -252,19 +274,12 @@ class ScanEngine:
                 time.sleep(config.dwell_time)
 
                 # Read detectors
-                timestamp = time.time()
-                timestamps[point_idx] = timestamp
-                motor1_positions[point_idx] = pos1
-                motor2_positions[point_idx] = pos2
-
-                for det_pv in config.detectors:
-                    value = self.client.get(det_pv)
-                    detector_data[det_pv].append(value)
-
-                point_idx += 1
+                timestamps[point_idx] = time.time()
+                detector_block[:, point_idx] = self.client.get_many(config.detectors)
+                append_point((pos1, pos2), detector_block[:, point_idx], timestamps[point_idx])
 
-        # Convert lists to numpy arrays
-        detector_readings = {det_pv: np.array(values) for det_pv, values in detector_data.items()}
+        # One contiguous row per detector
+        detector_readings = dict(zip(config.detectors, detector_block, strict=True))
 
         return ScanData(
             motor_positions={
@@ -273,15 +288,10 @@ class ScanEngine:
             },
             detector_readings=detector_readings,
             timestamps=timestamps,
-            metadata={
-                "scan_type": "mesh",
-                "motor1": motor1_pv,
-                "motor2": motor2_pv,
-                "dwell_time": config.dwell_time,
-            },
+            metadata=metadata,
         )
 
-    def run_xafs(self, config: XAFSScanConfig) -> ScanData:
+    def run_xafs(self, config: XAFSScanConfig, writer: NeXusWriter | None = None) -> ScanData:
         """Execute XAFS energy scan.
 
         Algorithm:
@@ -290,11 +300,13 @@ class ScanEngine:
            a. Move monochromator to energy
            b. Wait for completion
            c. Sleep dwell_time
-           d. Read all detectors (I0, IT, IF)
+           d. Read all detectors (I0, IT, IF) in one pipelined round trip
+           e. Append the point to writer, if given
         3. Return ScanData
 
         Args:
             config: XAFS scan configuration
+            writer: Open NeXusWriter to stream points to as they are acquired
 
         Returns:
             ScanData with energy positions, detector readings, and timestamps
@@ -302,46 +314,50 @@ class ScanEngine:
         motor = Motor(pv=config.energy_pv, client=self.client)
         energies = config.generate_energies()
         n_points = len(energies)
+        metadata: dict[str, Any] = {
+            "scan_type": "xafs",
+            "energy_pv": config.energy_pv,
+            "edge": config.edge,
+            "regions": config.regions,
+            "dwell_time": config.dwell_time,
+        }
 
         # Pre-allocate arrays
         timestamps = np.zeros(n_points)
-        detector_data: dict[str, list[float]] = {det: [] for det in config.detectors}
+        detector_block = np.empty((len(config.detectors), n_points))
 
         # Execute scan
-        for i, energy in enumerate(energies):
-            # Move monochromator
-            motor.move_to(energy, wait=True, timeout=60.0)
+        with _stream_points(
+            writer, [config.energy_pv], config.detectors, n_points, "xafs", metadata
+        ) as append_point:
+            for i, energy in enumerate(energies):
+                # Move monochromator
+                motor.move_to(energy, wait=True, timeout=60.0)
 
-            # Dwell time
-            time.sleep(config.dwell_time)
+                # Dwell time
+                time.sleep(config.dwell_time)
 
-            # Read detectors
-            timestamp = time.time()
-            timestamps[i] = timestamp
+                # Read detectors
+                timestamp = time.time()
+                timestamps[i] = timestamp
 
-            for det_pv in config.detectors:
-                value = self.client.get(det_pv)
-                detector_data[det_pv].append(value)
+                detector_block[:, i] = self.client.get_many(config.detectors)
+                append_point((energy,), detector_block[:, i], timestamp)
 
-        # Convert lists to numpy arrays
-        detector_readings = {det_pv: np.array(values) for det_pv, values in detector_data.items()}
+        # One contiguous row per detector
+        detector_readings = dict(zip(config.detectors, detector_block, strict=True))
 
         return ScanData(
             motor_positions={config.energy_pv: energies},
             detector_readings=detector_readings,
             timestamps=timestamps,
-            metadata={
-                "scan_type": "xafs",
-                "energy_pv": config.energy_pv,
-                "edge": config.edge,
-                "regions": config.regions,
-                "dwell_time": config.dwell_time,
-            },
+            metadata=metadata,
         )
 
     def run(
         self,
         config: LinearScanConfig | MeshScanConfig | XAFSScanConfig,
+        writer: NeXusWriter | None = None,
     ) -> ScanData:
         """Run scan based on config type.
 
@@ -349,15 +365,41 @@ class ScanEngine:
 
         Args:
             config: Scan configuration
+            writer: Open NeXusWriter to stream points to as they are acquired
 
         Returns:
             ScanData with scan results
         """
         if isinstance(config, LinearScanConfig):
-            return self.run_linear(config)
+            return self.run_linear(config, writer)
         elif isinstance(config, MeshScanConfig):
-            return self.run_mesh(config)
+            return self.run_mesh(config, writer)
         elif isinstance(config, XAFSScanConfig):
-            return self.run_xafs(config)
+            return self.run_xafs(config, writer)
         else:
             raise ValueError(f"Unknown scan config type: {type(config)}")
+
+
+@contextlib.contextmanager
+def _stream_points(
+    writer: NeXusWriter | None,
+    motors: Sequence[str],
+    detectors: Sequence[str],
+    n_points: int,
+    scan_type: Literal["linear", "mesh", "xafs"],
+    metadata: dict[str, Any],
+) -> Iterator[Callable[[Sequence[float], NDArray[np.float64], float], None]]:
+    """Yield a per-point callback that appends to ``writer``, or does nothing.
+
+    The scan is ended (and flushed) even if acquisition fails part-way, so the
+    points acquired so far are kept in the file.
+    """
+    if writer is None:
+        yield lambda positions, values, timestamp: None
+        return
+
+    writer.begin_scan(motors, detectors, n_points, scan_type=scan_type, metadata=metadata)
+    try:
+        yield writer.append_point
+    finally:
+        writer.end_scan()
@@ -0,0 +1,64 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import numpy as np
+import pytest
+
+from beamline.daq.data import ScanData
+
+MOTORS = ("BL02:SAMPLE:X", "BL02:SAMPLE:Y", "BL02:SAMPLE:Z")
+DETECTORS = ("BL02:DET:I0", "BL02:DET:IT", "BL02:DET:IF")
+
+type ScanFactory = Callable[..., ScanData]
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    """Freshly seeded random generator, so values do not depend on test order."""
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(scope="session")
+def make_scan() -> ScanFactory:
+    """Factory for synthetic scans, building each array set once per session.
+
+    Calls with the same shape share read-only arrays; each call returns a new
+    ScanData, so tests may replace its arrays or metadata freely. Values are
+    seeded from the shape alone and do not depend on which test runs first.
+    """
+
+    @functools.cache
+    def arrays(
+        n_points: int, n_motors: int, n_detectors: int
+    ) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray], np.ndarray]:
+        motors = {
+            name: np.linspace(0, 100 / (i + 1), n_points)
+            for i, name in enumerate(MOTORS[:n_motors])
+        }
+        rng = np.random.default_rng([n_points, n_motors, n_detectors])
+        detectors = {name: rng.random(n_points) * 1000 for name in DETECTORS[:n_detectors]}
+        timestamps = np.linspace(0, n_points, n_points)
+        for values in (*motors.values(), *detectors.values(), timestamps):
+            values.flags.writeable = False
+        return motors, detectors, timestamps
+
+    def factory(
+        n_points: int = 10,
+        n_motors: int = 1,
+        n_detectors: int = 1,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> ScanData:
+        motors, detectors, timestamps = arrays(n_points, n_motors, n_detectors)
+        return ScanData(
+            motor_positions=dict(motors),
+            detector_readings=dict(detectors),
+            timestamps=timestamps,
+            metadata=dict(metadata or {}),
+        )
+
+    return factory
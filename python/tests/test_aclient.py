@@ -0,0 +1,155 @@
+"""Unit tests for AsyncDeviceClient."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+import pytest
+
+from beamline.daq.aclient import AsyncDeviceClient
+from beamline.daq.exceptions import ConnectionError, ProtocolError, TimeoutError
+
+PV_VALUES = {b"BL02:DET:I0": b"500000.0", b"BL02:DET:IT": b"450000.0"}
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer GET/PUT/STATUS/LIST like the device server; BIG:n sends n bytes, SLOW no reply."""
+    while line := await reader.readline():
+        verb, _, rest = line.strip().partition(b":")
+        if verb == b"GET":
+            value = PV_VALUES.get(rest)
+            writer.write(b"OK:" + value + b"\n" if value else b"ERR:UNKNOWN_PV\n")
+        elif verb == b"PUT":
+            writer.write(b"OK:PUT\n")
+        elif verb == b"STATUS":
+            writer.write(b"OK:idle\n")
+        elif verb == b"LIST":
+            writer.write(b"OK:" + b",".join(PV_VALUES) + b"\n")
+        elif verb == b"BIG":
+            writer.write(b"OK:" + b"A" * int(rest) + b"\n")
+        elif verb != b"SLOW":
+            writer.write(b"ERR:UNKNOWN_COMMAND\n")
+        await writer.drain()
+    writer.close()
+
+
+def run_with_server(test: Callable[[int], Awaitable[None]]) -> None:
+    """Run ``test(port)`` against a local server on an ephemeral port."""
+
+    async def main() -> None:
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            await test(port)
+
+    asyncio.run(main())
+
+
+class TestAsyncDeviceClient:
+    """Test AsyncDeviceClient functionality."""
+
+    def test_commands(self) -> None:
+        """Test GET/PUT/STATUS/LIST round trips."""
+
+        async def test(port: int) -> None:
+            async with AsyncDeviceClient("127.0.0.1", port) as client:
+                assert client.connected
+                assert await client.get("BL02:DET:I0") == 500000.0
+                await client.put("BL02:MONO:ENERGY", 7112.0)
+                assert await client.status("BL02:SAMPLE:X") == "IDLE"
+                assert await client.list_pvs() == ["BL02:DET:I0", "BL02:DET:IT"]
+            assert not client.connected
+
+        run_with_server(test)
+
+    def test_concurrent_requests_stay_ordered(self) -> None:
+        """Test gathered requests on one connection get their own replies."""
+
+        async def test(port: int) -> None:
+            async with AsyncDeviceClient("127.0.0.1", port) as client:
+                pvs = ["BL02:DET:I0", "BL02:DET:IT"] * 20
+                values = await asyncio.gather(*(client.get(pv) for pv in pvs))
+                assert values == [500000.0, 450000.0] * 20
+
+                batch = await client.get_many(pvs)
+                np.testing.assert_array_equal(batch, values)
+
+        run_with_server(test)
+
+    def test_error_response(self) -> None:
+        """Test ERR replies raise ProtocolError."""
+
+        async def test(port: int) -> None:
+            async with AsyncDeviceClient("127.0.0.1", port) as client:
+                with pytest.raises(ProtocolError, match="UNKNOWN_PV"):
+                    await client.get("BL02:INVALID:PV")
+                # Connection is still usable afterwards
+                assert await client.get("BL02:DET:IT") == 450000.0
+
+        run_with_server(test)
+
+    def test_timeout(self) -> None:
+        """Test a missing reply times out and drops the connection."""
+
+        async def test(port: int) -> None:
+            async with AsyncDeviceClient("127.0.0.1", port, timeout=0.05) as client:
+                with pytest.raises(TimeoutError, match="timed out"):
+                    await client._exchange(b"SLOW\n", 1)
+                assert not client.connected
+
+        run_with_server(test)
+
+    def test_cancel_drops_connection(self) -> None:
+        """Test cancelling a pending request drops the connection."""
+
+        async def test(port: int) -> None:
+            async with AsyncDeviceClient("127.0.0.1", port) as client:
+                task = asyncio.create_task(client._exchange(b"SLOW\n", 1))
+                await asyncio.sleep(0.01)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                assert not client.connected
+
+        run_with_server(test)
+
+    def test_long_reply_line(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test long reply lines are read whole, and oversized ones drop the connection."""
+
+        async def test(port: int) -> None:
+            async with AsyncDeviceClient("127.0.0.1", port) as client:
+                (line,) = await client._exchange(b"BIG:200000\n", 1)
+                assert len(line) == 200003
+
+            monkeypatch.setattr("beamline.daq.aclient._MAX_LINE", 1024)
+            async with AsyncDeviceClient("127.0.0.1", port) as client:
+                with pytest.raises(ProtocolError, match="exceeds 1024 bytes"):
+                    await client._exchange(b"BIG:4096\n", 1)
+                assert not client.connected
+
+        run_with_server(test)
+
+    def test_not_connected(self) -> None:
+        """Test operations when not connected."""
+        client = AsyncDeviceClient("127.0.0.1", 5064)
+        with pytest.raises(ConnectionError, match="Not connected"):
+            asyncio.run(client.get("BL02:RING:CURRENT"))
+
+    def test_connect_failure(self) -> None:
+        """Test connection failure."""
+
+        async def test(port: int) -> None:
+            client = AsyncDeviceClient("127.0.0.1", port)
+            with pytest.raises(ConnectionError, match="Failed to connect"):
+                await client.connect()
+
+        # Grab a free port, then close the listener so nothing accepts on it
+        async def free_port() -> int:
+            server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+            port: int = server.sockets[0].getsockname()[1]
+            server.close()
+            await server.wait_closed()
+            return port
+
+        port = asyncio.run(free_port())
+        asyncio.run(test(port))
@@ -1,14 +1,46 @@
 """Unit tests for DeviceClient."""
 
 import builtins
-from unittest.mock import MagicMock, patch
+import socket
+from collections.abc import Iterator
+from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 from beamline.daq.client import DeviceClient
 from beamline.daq.exceptions import ConnectionError, ProtocolError, TimeoutError
 
 
+def feed(mock_sock: MagicMock, chunks: list[bytes]) -> None:
+    """Make ``mock_sock.recv_into`` deliver ``chunks`` one per call."""
+    pending = iter(chunks)
+
+    def recv_into(buffer: memoryview) -> int:
+        chunk = next(pending)
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    mock_sock.recv_into.side_effect = recv_into
+
+
+@pytest.fixture
+def mock_sock(monkeypatch: pytest.MonkeyPatch) -> Iterator[MagicMock]:
+    """Socket mock returned by every ``socket.socket()`` call in the client module."""
+    sock = MagicMock()
+    monkeypatch.setattr("beamline.daq.client.socket.socket", MagicMock(return_value=sock))
+    yield sock
+
+
+@pytest.fixture
+def client(mock_sock: MagicMock) -> DeviceClient:
+    """Client marked connected on ``mock_sock``, without calling connect()."""
+    client = DeviceClient("localhost", 5064)
+    client._socket = mock_sock
+    client._connected = True
+    return client
+
+
 class TestDeviceClient:
     """Test DeviceClient functionality."""
 
@@ -20,165 +52,264 @@ class TestDeviceClient:
         assert client.timeout == 5.0
         assert not client._connected
 
-    def test_context_manager(self) -> None:
+    def test_context_manager(self, mock_sock: MagicMock) -> None:
         """Test context manager support."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_socket.return_value = mock_sock
-
-            with DeviceClient("localhost", 5064) as client:
-                assert client._connected
-                mock_sock.connect.assert_called_once_with(("localhost", 5064))
+        with DeviceClient("localhost", 5064) as client:
+            assert client._connected
+            mock_sock.connect.assert_called_once_with(("localhost", 5064))
 
-            mock_sock.close.assert_called_once()
-            assert not client._connected
+        mock_sock.close.assert_called_once()
+        assert not client._connected
 
-    def test_connect_success(self) -> None:
+    def test_connect_success(self, mock_sock: MagicMock) -> None:
         """Test successful connection."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_socket.return_value = mock_sock
+        client = DeviceClient("localhost", 5064)
+        client.connect()
 
-            client = DeviceClient("localhost", 5064)
-            client.connect()
+        assert client._connected
+        mock_sock.connect.assert_called_once_with(("localhost", 5064))
+        mock_sock.settimeout.assert_called_once_with(5.0)
 
-            assert client._connected
-            mock_sock.connect.assert_called_once_with(("localhost", 5064))
-            mock_sock.settimeout.assert_called_once_with(5.0)
+    def test_connect_socket_options(self, mock_sock: MagicMock) -> None:
+        """Test default and user socket options are applied on connect."""
+        rcvbuf = (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        client = DeviceClient("localhost", 5064, socket_options=[rcvbuf])
+        client.connect()
 
-    def test_connect_failure(self) -> None:
+        calls = [c.args for c in mock_sock.setsockopt.call_args_list]
+        assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in calls
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in calls
+        # User options are applied last so they override the defaults
+        assert calls[-1] == rcvbuf
+
+    def test_connect_failure(self, mock_sock: MagicMock) -> None:
         """Test connection failure."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.connect.side_effect = OSError("Connection refused")
-            mock_socket.return_value = mock_sock
+        mock_sock.connect.side_effect = OSError("Connection refused")
 
-            client = DeviceClient("localhost", 5064)
-            with pytest.raises(ConnectionError, match="Failed to connect"):
-                client.connect()
+        client = DeviceClient("localhost", 5064)
+        with pytest.raises(ConnectionError, match="Failed to connect"):
+            client.connect()
 
-            assert not client._connected
+        assert not client._connected
 
-    def test_get_success(self) -> None:
+    def test_get_success(self, client: DeviceClient, mock_sock: MagicMock) -> None:
         """Test successful GET command."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [b"OK:350.5\n", b""]
-            mock_socket.return_value = mock_sock
-
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+        feed(mock_sock, [b"OK:350.5\n", b""])
 
-            value = client.get("BL02:RING:CURRENT")
-            assert value == 350.5
-            mock_sock.sendall.assert_called_once_with(b"GET:BL02:RING:CURRENT\n")
+        value = client.get("BL02:RING:CURRENT")
+        assert value == 350.5
+        mock_sock.sendall.assert_called_once_with(b"GET:BL02:RING:CURRENT\n")
 
-    def test_get_error(self) -> None:
+    def test_get_error(self, client: DeviceClient, mock_sock: MagicMock) -> None:
         """Test GET command with error response."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [b"ERR:UNKNOWN_PV\n", b""]
-            mock_socket.return_value = mock_sock
+        feed(mock_sock, [b"ERR:UNKNOWN_PV\n", b""])
 
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+        with pytest.raises(ProtocolError, match="UNKNOWN_PV"):
+            client.get("BL02:INVALID:PV")
 
-            with pytest.raises(ProtocolError, match="UNKNOWN_PV"):
-                client.get("BL02:INVALID:PV")
+    def test_get_invalid_float(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test a non-numeric OK payload raises ValueError from float()."""
+        feed(mock_sock, [b"OK:NOT_A_NUMBER\n"])
 
-    def test_put_success(self) -> None:
-        """Test successful PUT command."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [b"OK:PUT\n", b""]
-            mock_socket.return_value = mock_sock
+        with pytest.raises(ValueError, match="NOT_A_NUMBER"):
+            client.get("BL02:RING:CURRENT")
 
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+    @pytest.mark.parametrize(
+        ("reply", "code"),
+        [(b"HELLO\n", "INVALID"), (b"\n", "EMPTY"), (b"OK 1.0\n", "INVALID")],
+    )
+    def test_get_malformed_response(
+        self, reply: bytes, code: str, client: DeviceClient, mock_sock: MagicMock
+    ) -> None:
+        """Test malformed replies raise ProtocolError with the parser's error code."""
+        feed(mock_sock, [reply])
+
+        with pytest.raises(ProtocolError) as exc_info:
+            client.get("BL02:RING:CURRENT")
+        assert exc_info.value.error_code == code
 
-            client.put("BL02:MONO:ENERGY", 7112.0)
-            mock_sock.sendall.assert_called_once_with(b"PUT:BL02:MONO:ENERGY:7112.0\n")
+    def test_put_bare_ok(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test a bare OK reply (no data) is accepted."""
+        feed(mock_sock, [b"OK\n"])
 
-    def test_move_success(self) -> None:
-        """Test successful MOVE command."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [b"OK:MOVING\n", b""]
-            mock_socket.return_value = mock_sock
+        client.put("BL02:MONO:ENERGY", 7112.0)
 
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+    def test_get_many(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test pipelined GETs are sent in one write and parsed in order."""
+        feed(mock_sock, [b"OK:1.5\nOK:2", b".5\nOK:1.5\n"])
 
-            client.move("BL02:SAMPLE:X", 1000.0)
-            mock_sock.sendall.assert_called_once_with(b"MOVE:BL02:SAMPLE:X:1000.0\n")
+        values = client.get_many(["BL02:DET:I0", "BL02:DET:IT", "BL02:DET:I0"])
 
-    def test_status_success(self) -> None:
-        """Test successful STATUS command."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [b"OK:IDLE\n", b""]
-            mock_socket.return_value = mock_sock
+        np.testing.assert_array_equal(values, [1.5, 2.5, 1.5])
+        mock_sock.sendall.assert_called_once_with(
+            b"GET:BL02:DET:I0\nGET:BL02:DET:IT\nGET:BL02:DET:I0\n"
+        )
 
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+    def test_get_many_error(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test an ERR reply in a batch names the failing PV."""
+        feed(mock_sock, [b"OK:1.5\nERR:UNKNOWN_PV\n"])
 
-            status = client.status("BL02:SAMPLE:X")
-            assert status == "IDLE"
-            mock_sock.sendall.assert_called_once_with(b"STATUS:BL02:SAMPLE:X\n")
+        with pytest.raises(ProtocolError, match="BL02:BAD"):
+            client.get_many(["BL02:DET:I0", "BL02:BAD"])
 
-    def test_list_pvs(self) -> None:
+    def test_put_success(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test successful PUT command."""
+        feed(mock_sock, [b"OK:PUT\n", b""])
+
+        client.put("BL02:MONO:ENERGY", 7112.0)
+        mock_sock.sendall.assert_called_once_with(b"PUT:BL02:MONO:ENERGY:7112.0\n")
+
+    def test_move_success(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test successful MOVE command."""
+        feed(mock_sock, [b"OK:MOVING\n", b""])
+
+        client.move("BL02:SAMPLE:X", 1000.0)
+        mock_sock.sendall.assert_called_once_with(b"MOVE:BL02:SAMPLE:X:1000.0\n")
+
+    def test_status_success(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test successful STATUS command."""
+        feed(mock_sock, [b"OK:IDLE\n", b""])
+
+        status = client.status("BL02:SAMPLE:X")
+        assert status == "IDLE"
+        mock_sock.sendall.assert_called_once_with(b"STATUS:BL02:SAMPLE:X\n")
+
+    def test_list_pvs(self, client: DeviceClient, mock_sock: MagicMock) -> None:
         """Test LIST command."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [
+        feed(
+            mock_sock,
+            [
                 b"OK:BL02:RING:CURRENT,BL02:MONO:ENERGY,BL02:DET:I0\n",
                 b"",
-            ]
-            mock_socket.return_value = mock_sock
+            ],
+        )
 
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+        pvs = client.list_pvs()
+        assert len(pvs) == 3
+        assert "BL02:RING:CURRENT" in pvs
+        assert "BL02:MONO:ENERGY" in pvs
+        assert "BL02:DET:I0" in pvs
 
-            pvs = client.list_pvs()
-            assert len(pvs) == 3
-            assert "BL02:RING:CURRENT" in pvs
-            assert "BL02:MONO:ENERGY" in pvs
-            assert "BL02:DET:I0" in pvs
-
-    def test_list_pvs_with_pattern(self) -> None:
+    def test_list_pvs_with_pattern(self, client: DeviceClient, mock_sock: MagicMock) -> None:
         """Test LIST command with pattern."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.recv.side_effect = [b"OK:BL02:DET:I0,BL02:DET:IT,BL02:DET:IF\n", b""]
-            mock_socket.return_value = mock_sock
+        feed(mock_sock, [b"OK:BL02:DET:I0,BL02:DET:IT,BL02:DET:IF\n", b""])
 
-            client = DeviceClient("localhost", 5064)
-            client._socket = mock_sock
-            client._connected = True
+        pvs = client.list_pvs("BL02:DET:*")
+        assert len(pvs) == 3
+        mock_sock.sendall.assert_called_once_with(b"LIST:BL02:DET:*\n")
 
-            pvs = client.list_pvs("BL02:DET:*")
-            assert len(pvs) == 3
-            mock_sock.sendall.assert_called_once_with(b"LIST:BL02:DET:*\n")
+    def test_iter_pvs(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test lazy PV listing skips blanks and surrounding whitespace."""
+        feed(mock_sock, [b"OK: BL02:DET:I0 , ,BL02:DET:IT,\n", b"OK:\n"])
 
-    def test_timeout(self) -> None:
-        """Test timeout handling."""
-        with patch("beamline.daq.client.socket.socket") as mock_socket:
-            mock_sock = MagicMock()
-            mock_sock.sendall.side_effect = builtins.TimeoutError("Operation timed out")
-            mock_socket.return_value = mock_sock
+        pvs = client.iter_pvs("BL02:DET:*")
+        mock_sock.sendall.assert_called_once_with(b"LIST:BL02:DET:*\n")
+        assert list(pvs) == ["BL02:DET:I0", "BL02:DET:IT"]
+        assert client.list_pvs() == []
+
+    def test_response_split_across_recv(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test a response arriving in several chunks is reassembled."""
+        feed(mock_sock, [b"OK:BL02:DET:I0,", b"BL02:DET:IT", b",BL02:DET:IF\n"])
+
+        assert client.list_pvs() == ["BL02:DET:I0", "BL02:DET:IT", "BL02:DET:IF"]
+
+    def test_pipeline(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test pipelined commands are sent together and replies read in order."""
+        feed(mock_sock, [b"OK:350.5\nOK:IDLE\n", b"ERR:UNKNOWN_PV\n"])
 
-            client = DeviceClient("localhost", 5064, timeout=1.0)
-            client._socket = mock_sock
-            client._connected = True
+        replies = client.pipeline(["GET:BL02:RING:CURRENT", "STATUS:BL02:SAMPLE:X", "GET:BL02:BAD"])
 
-            with pytest.raises(TimeoutError, match="timed out"):
-                client.get("BL02:RING:CURRENT")
+        assert replies == ["OK:350.5", "OK:IDLE", "ERR:UNKNOWN_PV"]
+        mock_sock.sendall.assert_called_once_with(
+            b"GET:BL02:RING:CURRENT\nSTATUS:BL02:SAMPLE:X\nGET:BL02:BAD\n"
+        )
+        assert mock_sock.recv_into.call_count == 2
+
+    def test_buffered_reply_carries_over(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test bytes received past one reply are used by the next command."""
+        feed(mock_sock, [b"OK:1.0\nOK:2.0\n"])
+
+        assert client.get("BL02:DET:I0") == 1.0
+        assert not client.is_idle()
+        assert client.get("BL02:DET:IT") == 2.0
+        assert client.is_idle()
+        assert mock_sock.recv_into.call_count == 1
+
+    def test_buffered_writes(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test PUT/MOVE are coalesced and flushed ahead of a GET."""
+        feed(mock_sock, [b"OK:PUT\nOK:MOVING\nOK:42.0\n"])
+
+        with client.buffered_writes():
+            client.put("BL02:MONO:ENERGY", 7112.0)
+            client.move("BL02:SAMPLE:X", 1000.0)
+            mock_sock.sendall.assert_not_called()
+            value = client.get("BL02:DET:I0")
+
+        assert value == 42.0
+        mock_sock.sendall.assert_called_once_with(
+            b"PUT:BL02:MONO:ENERGY:7112.0\nMOVE:BL02:SAMPLE:X:1000.0\nGET:BL02:DET:I0\n"
+        )
+
+    def test_buffered_writes_flush_on_exit(
+        self, client: DeviceClient, mock_sock: MagicMock
+    ) -> None:
+        """Test queued commands are flushed on exit and errors are raised."""
+        feed(mock_sock, [b"OK:PUT\nERR:INVALID_VALUE\n"])
+
+        with (
+            pytest.raises(ProtocolError, match="INVALID_VALUE"),
+            client.buffered_writes(),
+        ):
+            client.put("BL02:MONO:ENERGY", 7112.0)
+            client.put("BL02:MONO:ENERGY", -1.0)
+
+        mock_sock.sendall.assert_called_once_with(
+            b"PUT:BL02:MONO:ENERGY:7112.0\nPUT:BL02:MONO:ENERGY:-1.0\n"
+        )
+
+    def test_buffered_writes_flush_threshold(
+        self, client: DeviceClient, mock_sock: MagicMock
+    ) -> None:
+        """Test the buffer is flushed once it reaches flush_bytes."""
+        feed(mock_sock, [b"OK:PUT\n"])
+
+        with client.buffered_writes(flush_bytes=8):
+            client.put("BL02:MONO:ENERGY", 7112.0)
+            mock_sock.sendall.assert_called_once()
+
+    def test_monitor_until(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test waiting on pushed DATA updates and stopping the monitor."""
+        feed(
+            mock_sock,
+            [
+                b"OK:MONITORING\n",
+                b"DATA:1\nDATA:1\n",
+                b"DATA:0\n",
+                b"DATA:0\nOK:STOPPED\n",
+            ],
+        )
+
+        value = client.monitor_until("BL02:SAMPLE:X.DMOV", lambda v: v < 0.5, interval_ms=5)
+
+        assert value == 0.0
+        sent = [c.args[0] for c in mock_sock.sendall.call_args_list if c.args[0]]
+        assert sent == [b"MONITOR:BL02:SAMPLE:X.DMOV:5\n", b"STOP\n"]
+        assert not client._recv_buf
+
+    def test_monitor_until_timeout(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test monitor_until raises TimeoutError and still sends STOP."""
+        feed(mock_sock, [b"OK:MONITORING\n", b"DATA:1\n", b"OK:STOPPED\n"])
+
+        with pytest.raises(TimeoutError, match="did not match"):
+            client.monitor_until("BL02:SAMPLE:X.DMOV", lambda v: v < 0.5, timeout=0.0)
+        mock_sock.sendall.assert_any_call(b"STOP\n")
+
+    def test_timeout(self, client: DeviceClient, mock_sock: MagicMock) -> None:
+        """Test timeout handling."""
+        mock_sock.sendall.side_effect = builtins.TimeoutError("Operation timed out")
+
+        with pytest.raises(TimeoutError, match="timed out"):
+            client.get("BL02:RING:CURRENT")
 
     def test_not_connected(self) -> None:
         """Test operations when not connected."""
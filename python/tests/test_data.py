@@ -1,7 +1,7 @@
 """Unit tests for ScanData and CSV export."""
 
 import csv
-import tempfile
+import io
 from pathlib import Path
 
 import numpy as np
@@ -56,6 +56,20 @@ class TestScanData:
         with pytest.raises(ValueError, match="contains NaN"):
             data.validate()
 
+    def test_validate_inf_values(self) -> None:
+        """Test validation with Inf values in detector readings and timestamps."""
+        data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([1.0, 2.0, 3.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0, np.inf, 102.0])},
+            timestamps=np.array([1000.0, 1001.0, 1002.0]),
+        )
+        with pytest.raises(ValueError, match="Detector BL02:DET:I0 contains NaN or Inf"):
+            data.validate()
+
+        data.timestamps = np.array([1000.0, 1001.0, -np.inf])
+        with pytest.raises(ValueError, match="Timestamps contain NaN or Inf"):
+            data.validate()
+
     def test_validate_timestamp_ordering(self) -> None:
         """Test validation with non-monotonic timestamps."""
         data = ScanData(
@@ -66,6 +80,19 @@ class TestScanData:
         with pytest.raises(ValueError, match="not monotonically increasing"):
             data.validate()
 
+    def test_validate_timestamp_ordering_long_scan(self) -> None:
+        """Test ordering check on scans spanning several comparison blocks."""
+        timestamps = np.arange(200_000, dtype=np.float64)
+        data = ScanData(timestamps=timestamps.copy())
+        data.validate()
+
+        data.timestamps[65536] = data.timestamps[65535]  # equal is allowed
+        data.validate()
+
+        data.timestamps[-1] = 0.0
+        with pytest.raises(ValueError, match="not monotonically increasing"):
+            data.validate()
+
     def test_to_csv_success(self) -> None:
         """Test successful CSV export."""
         data = ScanData(
@@ -77,33 +104,77 @@ class TestScanData:
             timestamps=np.array([1000.0, 1001.0, 1002.0]),
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            csv_path = Path(tmpdir) / "test_scan.csv"
-            data.to_csv(csv_path)
+        buf = io.StringIO(newline="")
+        data.to_csv(buf)
+        rows = list(csv.reader(io.StringIO(buf.getvalue(), newline="")))
 
-            # Verify file exists
-            assert csv_path.exists()
+        # Check header
+        assert "timestamp" in rows[0]
+        assert "BL02:SAMPLE:X" in rows[0]
+        assert "BL02:DET:I0" in rows[0]
+        assert "BL02:DET:IT" in rows[0]
 
-            # Read and verify content
-            with csv_path.open("r") as f:
-                reader = csv.reader(f)
-                rows = list(reader)
+        # Check data rows (skip header)
+        assert len(rows) == 4  # 1 header + 3 data rows
+        assert float(rows[1][0]) == 1000.0  # timestamp
+        assert float(rows[1][rows[0].index("BL02:SAMPLE:X")]) == -100.0
+        assert not buf.closed
 
-            # Check header
-            assert "timestamp" in rows[0]
-            assert "BL02:SAMPLE:X" in rows[0]
-            assert "BL02:DET:I0" in rows[0]
-            assert "BL02:DET:IT" in rows[0]
+    def test_to_csv_path_output(self, tmp_path: Path) -> None:
+        """Test CSV export to a path creates parent directories."""
+        data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.0, 1.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0, 200.0])},
+            timestamps=np.array([0.0, 1.0]),
+        )
 
-            # Check data rows (skip header)
-            assert len(rows) == 4  # 1 header + 3 data rows
-            assert float(rows[1][0]) == 1000.0  # timestamp
-            assert float(rows[1][rows[0].index("BL02:SAMPLE:X")]) == -100.0
+        csv_path = tmp_path / "scans" / "test_scan.csv"
+        data.to_csv(str(csv_path))
 
-    def test_to_csv_empty_data(self) -> None:
+        assert csv_path.exists()
+        assert csv_path.read_text().splitlines()[0] == "timestamp,BL02:SAMPLE:X,BL02:DET:I0"
+
+    def test_to_csv_row_text(self) -> None:
+        """Test CSV rows use the shortest round-trip float formatting."""
+        data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.1])},
+            detector_readings={"BL02:DET:I0": np.array([0.1 + 0.2])},
+            timestamps=np.array([1.0]),
+        )
+
+        buf = io.StringIO(newline="")
+        data.to_csv(buf)
+
+        assert buf.getvalue().split("\r\n")[1] == "1.0,0.1,0.30000000000000004"
+
+    def test_to_csv_empty_data(self, tmp_path: Path) -> None:
         """Test CSV export with empty data."""
         data = ScanData()
-        with tempfile.TemporaryDirectory() as tmpdir:
-            csv_path = Path(tmpdir) / "test_scan.csv"
-            with pytest.raises(ValueError, match="No timestamps"):
-                data.to_csv(csv_path)
+        csv_path = tmp_path / "test_scan.csv"
+        with pytest.raises(ValueError, match="No timestamps"):
+            data.to_csv(csv_path)
+
+    def test_to_csv_round_trip(self, tmp_path: Path) -> None:
+        """Test CSV export preserves values exactly and orders columns by name."""
+        rng = np.random.default_rng(0)
+        data = ScanData(
+            motor_positions={
+                "BL02:SAMPLE:Y": rng.normal(size=50),
+                "BL02:SAMPLE:X": rng.normal(size=50),
+            },
+            detector_readings={"BL02:DET:I0": rng.uniform(1e5, 1e6, size=50)},
+            timestamps=np.arange(50, dtype=np.float64) * 0.1 + 1.7e9,
+        )
+
+        csv_path = tmp_path / "test_scan.csv"
+        data.to_csv(csv_path, delimiter=";")
+
+        with csv_path.open("r", newline="") as f:
+            rows = list(csv.reader(f, delimiter=";"))
+
+        assert rows[0] == ["timestamp", "BL02:SAMPLE:X", "BL02:SAMPLE:Y", "BL02:DET:I0"]
+        values = np.array(rows[1:], dtype=np.float64)
+        np.testing.assert_array_equal(values[:, 0], data.timestamps)
+        np.testing.assert_array_equal(values[:, 1], data.motor_positions["BL02:SAMPLE:X"])
+        np.testing.assert_array_equal(values[:, 2], data.motor_positions["BL02:SAMPLE:Y"])
+        np.testing.assert_array_equal(values[:, 3], data.detector_readings["BL02:DET:I0"])
@@ -1,7 +1,10 @@
 """Unit tests for device abstractions."""
 
+from collections.abc import Callable, Iterator
+from dataclasses import FrozenInstanceError
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from beamline.daq.client import DeviceClient
@@ -9,25 +12,40 @@ from beamline.daq.device import Detector, Motor, MotorStatus, Shutter
 from beamline.daq.exceptions import TimeoutError
 
 
+def _statuses(*states: MotorStatus) -> Callable[[str], MotorStatus]:
+    """Build a client.status side effect returning ``states`` in order."""
+    remaining = iter(states)
+    return lambda pv: next(remaining)
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    """Mock DeviceClient, fresh for each test."""
+    return MagicMock(spec=DeviceClient)
+
+
 class TestMotor:
     """Test Motor class."""
 
-    def test_init(self) -> None:
+    @pytest.fixture(autouse=True)
+    def mock_sleep(self) -> Iterator[MagicMock]:
+        """Skip real sleeps in the wait_for_idle polling loop."""
+        with patch("beamline.daq.device.time.sleep") as mock_sleep:
+            yield mock_sleep
+
+    def test_init(self, client: MagicMock) -> None:
         """Test motor initialization."""
-        client = MagicMock(spec=DeviceClient)
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
         assert motor.pv == "BL02:SAMPLE:X"
         assert motor.client == client
 
-    def test_readback_pv(self) -> None:
+    def test_readback_pv(self, client: MagicMock) -> None:
         """Test readback PV property."""
-        client = MagicMock(spec=DeviceClient)
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
         assert motor.readback_pv == "BL02:SAMPLE:X.RBV"
 
-    def test_position(self) -> None:
+    def test_position(self, client: MagicMock) -> None:
         """Test reading motor position."""
-        client = MagicMock(spec=DeviceClient)
         client.get.return_value = 1000.0
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
@@ -36,9 +54,8 @@ class TestMotor:
         assert position == 1000.0
         client.get.assert_called_once_with("BL02:SAMPLE:X.RBV")
 
-    def test_status_idle(self) -> None:
+    def test_status_idle(self, client: MagicMock) -> None:
         """Test motor status IDLE."""
-        client = MagicMock(spec=DeviceClient)
         client.status.return_value = "IDLE"
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
@@ -47,9 +64,8 @@ class TestMotor:
         assert status == MotorStatus.IDLE
         client.status.assert_called_once_with("BL02:SAMPLE:X")
 
-    def test_status_moving(self) -> None:
+    def test_status_moving(self, client: MagicMock) -> None:
         """Test motor status MOVING."""
-        client = MagicMock(spec=DeviceClient)
         client.status.return_value = "MOVING"
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
@@ -57,9 +73,8 @@ class TestMotor:
 
         assert status == MotorStatus.MOVING
 
-    def test_move_to_with_wait(self) -> None:
+    def test_move_to_with_wait(self, client: MagicMock) -> None:
         """Test move_to with wait=True."""
-        client = MagicMock(spec=DeviceClient)
         client.status.return_value = "IDLE"
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
@@ -68,9 +83,8 @@ class TestMotor:
         client.move.assert_called_once_with("BL02:SAMPLE:X", 1000.0)
         client.status.assert_called()
 
-    def test_move_to_without_wait(self) -> None:
+    def test_move_to_without_wait(self, client: MagicMock) -> None:
         """Test move_to with wait=False."""
-        client = MagicMock(spec=DeviceClient)
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
         motor.move_to(1000.0, wait=False)
@@ -78,28 +92,66 @@ class TestMotor:
         client.move.assert_called_once_with("BL02:SAMPLE:X", 1000.0)
         client.status.assert_not_called()
 
-    def test_wait_for_idle_success(self) -> None:
+    def test_wait_for_idle_success(self, client: MagicMock) -> None:
         """Test wait_for_idle success."""
-        client = MagicMock(spec=DeviceClient)
-        client.status.side_effect = ["MOVING", "MOVING", "IDLE"]
+        client.status.side_effect = _statuses(
+            MotorStatus.MOVING, MotorStatus.MOVING, MotorStatus.IDLE
+        )
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
         motor.wait_for_idle(timeout=10.0, poll_interval=0.01)
 
         assert client.status.call_count == 3
 
-    def test_wait_for_idle_timeout(self) -> None:
+    def test_wait_for_idle_timeout(self, client: MagicMock, mock_sleep: MagicMock) -> None:
         """Test wait_for_idle timeout."""
-        client = MagicMock(spec=DeviceClient)
         client.status.return_value = "MOVING"
 
         motor = Motor(pv="BL02:SAMPLE:X", client=client)
-        with pytest.raises(TimeoutError, match="did not reach IDLE"):
+        with (
+            patch("beamline.daq.device.time.monotonic", side_effect=[0.0, 0.05, 0.11]),
+            pytest.raises(TimeoutError, match="did not reach IDLE"),
+        ):
             motor.wait_for_idle(timeout=0.1, poll_interval=0.01)
 
-    def test_pv_validation(self) -> None:
+        assert client.status.call_count == 2
+        mock_sleep.assert_called_once()
+
+    def test_wait_for_idle_backoff(self, client: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test polling starts fast and backs off up to poll_interval."""
+        client.status.side_effect = _statuses(*[MotorStatus.MOVING] * 12, MotorStatus.IDLE)
+
+        motor = Motor(pv="BL02:SAMPLE:X", client=client)
+        motor.wait_for_idle(timeout=10.0, poll_interval=0.01)
+
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert delays[0] == pytest.approx(0.002)
+        assert delays == sorted(delays)
+        assert max(delays) == pytest.approx(0.01)
+
+    def test_wait_for_idle_monitor(self, client: MagicMock) -> None:
+        """Test monitor-based waiting watches the .DMOV PV."""
+        client.monitor_until.return_value = 0.0
+
+        motor = Motor(pv="BL02:SAMPLE:X", client=client)
+        motor.wait_for_idle(timeout=5.0, poll_interval=0.02, use_monitor=True)
+
+        pv, predicate, interval_ms, timeout = client.monitor_until.call_args.args
+        assert pv == "BL02:SAMPLE:X.DMOV"
+        assert predicate(0.0) and not predicate(1.0)
+        assert (interval_ms, timeout) == (20, 5.0)
+        client.status.assert_not_called()
+
+    def test_wait_for_idle_monitor_timeout(self, client: MagicMock) -> None:
+        """Test monitor-based waiting reports a motor timeout."""
+        client.monitor_until.side_effect = TimeoutError("no match")
+
+        motor = Motor(pv="BL02:SAMPLE:X", client=client)
+        with pytest.raises(TimeoutError, match="did not reach IDLE"):
+            motor.wait_for_idle(timeout=0.1, use_monitor=True)
+
+    def test_pv_validation(self, client: MagicMock) -> None:
         """Test PV name validation."""
-        client = MagicMock(spec=DeviceClient)
 
         with pytest.raises(ValueError, match="Invalid PV name"):
             Motor(pv="", client=client)
@@ -107,13 +159,21 @@ class TestMotor:
         with pytest.raises(ValueError, match="Invalid PV name"):
             Motor(pv="INVALID", client=client)
 
+        with pytest.raises(ValueError, match="Invalid PV name"):
+            Motor(pv=None, client=client)  # type: ignore[arg-type]
+
+    def test_immutable(self, client: MagicMock) -> None:
+        """Test motors cannot be re-pointed at another PV after construction."""
+        motor = Motor(pv="BL02:SAMPLE:X", client=client)
+        with pytest.raises(FrozenInstanceError):
+            motor.pv = "BL02:SAMPLE:Y"  # type: ignore[misc]
+
 
 class TestDetector:
     """Test Detector class."""
 
-    def test_read(self) -> None:
+    def test_read(self, client: MagicMock) -> None:
         """Test detector read."""
-        client = MagicMock(spec=DeviceClient)
         client.get.return_value = 500000.0
 
         detector = Detector(pv="BL02:DET:I0", client=client)
@@ -122,10 +182,9 @@ class TestDetector:
         assert value == 500000.0
         client.get.assert_called_once_with("BL02:DET:I0")
 
-    def test_read_multiple(self) -> None:
+    def test_read_multiple(self, client: MagicMock) -> None:
         """Test read_multiple."""
 
-        client = MagicMock(spec=DeviceClient)
         client.get.side_effect = [100.0, 101.0, 102.0]
 
         detector = Detector(pv="BL02:DET:I0", client=client)
@@ -137,40 +196,47 @@ class TestDetector:
         assert readings[1] == 101.0
         assert readings[2] == 102.0
 
+    def test_read_multiple_pipelined(self, client: MagicMock) -> None:
+        """Test read_multiple without dwell time uses one batched read."""
+        client.get_many.return_value = np.array([100.0, 101.0, 102.0])
+
+        detector = Detector(pv="BL02:DET:I0", client=client)
+        readings = detector.read_multiple(3, dwell_time=0)
+
+        client.get_many.assert_called_once_with(["BL02:DET:I0"] * 3)
+        client.get.assert_not_called()
+        np.testing.assert_array_equal(readings, [100.0, 101.0, 102.0])
+
 
 class TestShutter:
     """Test Shutter class."""
 
-    def test_open(self) -> None:
+    def test_open(self, client: MagicMock) -> None:
         """Test shutter open."""
-        client = MagicMock(spec=DeviceClient)
 
         shutter = Shutter(client=client)
         shutter.open()
 
         client.put.assert_called_once_with("BL02:SHUTTER:CMD", 1.0)
 
-    def test_close(self) -> None:
+    def test_close(self, client: MagicMock) -> None:
         """Test shutter close."""
-        client = MagicMock(spec=DeviceClient)
 
         shutter = Shutter(client=client)
         shutter.close()
 
         client.put.assert_called_once_with("BL02:SHUTTER:CMD", 0.0)
 
-    def test_is_open_true(self) -> None:
+    def test_is_open_true(self, client: MagicMock) -> None:
         """Test is_open returns True."""
-        client = MagicMock(spec=DeviceClient)
         client.get.return_value = 1.0
 
         shutter = Shutter(client=client)
         assert shutter.is_open() is True
         client.get.assert_called_once_with("BL02:SHUTTER:STATUS")
 
-    def test_is_open_false(self) -> None:
+    def test_is_open_false(self, client: MagicMock) -> None:
         """Test is_open returns False."""
-        client = MagicMock(spec=DeviceClient)
         client.get.return_value = 0.0
 
         shutter = Shutter(client=client)
@@ -3,408 +3,539 @@
 from __future__ import annotations
 
 import datetime
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from tempfile import TemporaryDirectory
+from typing import Any, Literal
 
 import h5py
 import numpy as np
 import pytest
 
 from beamline.daq.data import ScanData
-from beamline.daq.nexus import NeXusWriter
+from beamline.daq.nexus import (
+    _MIN_CHUNKED_POINTS,
+    CLOUD_PAGE_SIZE,
+    NeXusWriter,
+    _as_f64,
+    _compute_chunks,
+)
 
+# Never opened: constructor-only tests need no real directory
+UNOPENED = Path("unopened.nxs")
 
-class TestNeXusWriter:
-    """Test NeXusWriter class."""
-
-    def test_init_basic(self) -> None:
-        """Test basic initialization."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            writer = NeXusWriter(filename)
-            assert writer.filename == filename
-            assert writer.mode == "w"
-            assert writer.compression == 1
-
-    def test_init_custom_compression(self) -> None:
-        """Test initialization with custom compression."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            writer = NeXusWriter(filename, compression=5)
-            assert writer.compression == 5
-
-    def test_init_invalid_compression(self) -> None:
-        """Test initialization with invalid compression level."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            with pytest.raises(ValueError, match="Compression level must be 0-9"):
-                NeXusWriter(filename, compression=10)
-
-    def test_context_manager(self) -> None:
-        """Test context manager usage."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            with NeXusWriter(filename) as writer:
-                assert writer._file is not None
-                assert writer._entry_group is not None
-            # File should be closed after context exit
-            assert writer._file is None
-
-    def test_open_close(self) -> None:
-        """Test explicit open/close."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            writer = NeXusWriter(filename)
-            writer.open()
-            assert writer._file is not None
-            writer.close()
-            assert writer._file is None
+ScanFactory = Callable[..., ScanData]
+WriterFactory = Callable[..., NeXusWriter]
+ScanType = Literal["linear", "mesh", "xafs"]
 
-    def test_write_scan_basic(self) -> None:
-        """Test writing basic scan data."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-
-            # Create test scan data
-            n_points = 10
-            timestamps = np.linspace(0, 10, n_points)
-            motor_pos = np.linspace(0, 100, n_points)
-            detector_data = np.random.rand(n_points) * 1000
-
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": motor_pos},
-                detector_readings={"BL02:DET:I0": detector_data},
-                timestamps=timestamps,
-                metadata={"ring_current": 350.5, "sample_name": "test_sample"},
-            )
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data, title="Test Scan")
-
-            # Verify file structure
-            with h5py.File(filename, "r") as f:
-                assert "entry" in f
-                entry = f["entry"]
-                assert entry.attrs["NX_class"] == "NXentry"
-                assert entry.attrs["definition"] == "NXxas"
-                assert entry.attrs["title"] == "Test Scan"
-
-                # Check instrument structure
-                assert "instrument" in entry
-                instrument = entry["instrument"]
-                assert instrument.attrs["NX_class"] == "NXinstrument"
-
-                # Check source
-                assert "source" in instrument
-                source = instrument["source"]
-                assert source.attrs["NX_class"] == "NXsource"
-                assert source.attrs["type"] == "Synchrotron X-ray Source"
-                assert source["current"][()] == 350.5
-
-                # Check monochromator
-                assert "monochromator" in instrument
-                monochromator = instrument["monochromator"]
-                assert monochromator.attrs["NX_class"] == "NXmonochromator"
-                assert "energy" in monochromator
-                np.testing.assert_array_almost_equal(monochromator["energy"][:], motor_pos)
-
-                # Check detector
-                assert "detector" in instrument
-                detector = instrument["detector"]
-                assert detector.attrs["NX_class"] == "NXdetector"
-                assert "data" in detector
-                np.testing.assert_array_almost_equal(detector["data"][:], detector_data)
-
-                # Check sample
-                assert "sample" in entry
-                sample = entry["sample"]
-                assert sample.attrs["NX_class"] == "NXsample"
-                assert sample.attrs["name"] == "test_sample"
-                assert "position_x" in sample
-
-                # Check data group
-                assert "data" in entry
-                data = entry["data"]
-                assert data.attrs["NX_class"] == "NXdata"
-                assert data.attrs["signal"] == "intensity"
-                assert "intensity" in data
-                assert "energy" in data
-
-    def test_write_scan_xafs(self) -> None:
-        """Test writing XAFS scan data."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test_xafs.nxs"
-
-            n_points = 50
-            energy = np.linspace(7000, 8000, n_points)
-            mu = np.random.rand(n_points) * 10 + 1.0
-
-            scan_data = ScanData(
-                motor_positions={"BL02:MONO:ENERGY": energy},
-                detector_readings={"BL02:DET:IT": mu},
-                timestamps=np.linspace(0, 100, n_points),
-                metadata={"ring_current": 400.0},
-            )
+def _snapshot(group: h5py.Group) -> dict[str, Any]:
+    """Read a group's attributes and member names once, for repeated assertions."""
+    return {"attrs": dict(group.attrs), "keys": set(group)}
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data, title="XAFS Scan", scan_type="xafs")
 
-            with h5py.File(filename, "r") as f:
-                entry = f["entry"]
-                data = entry["data"]
-                assert data.attrs["axes"] == ["energy"]
+@pytest.fixture
+def make_writer(tmp_path: Path) -> WriterFactory:
+    """Factory for writers in tmp_path, uncompressed unless a test asks otherwise."""
 
-    def test_write_scan_multiple_detectors(self) -> None:
-        """Test writing scan with multiple detectors."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test_multi.nxs"
-
-            n_points = 20
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.linspace(0, 100, n_points)},
-                detector_readings={
-                    "BL02:DET:I0": np.random.rand(n_points) * 1000,
-                    "BL02:DET:IT": np.random.rand(n_points) * 500,
-                },
-                timestamps=np.linspace(0, 20, n_points),
-            )
+    def factory(name: str = "test.nxs", **kwargs: Any) -> NeXusWriter:
+        kwargs.setdefault("compression", None)
+        return NeXusWriter(tmp_path / name, **kwargs)
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data)
+    return factory
 
-            with h5py.File(filename, "r") as f:
-                detector = f["entry/instrument/detector"]
-                assert "data" in detector
-                assert "BL02_DET_IT" in detector  # Sanitized name
 
-    def test_write_scan_multiple_motors(self) -> None:
-        """Test writing scan with multiple motors."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test_motors.nxs"
-
-            n_points = 15
-            scan_data = ScanData(
-                motor_positions={
-                    "BL02:SAMPLE:X": np.linspace(0, 100, n_points),
-                    "BL02:SAMPLE:Y": np.linspace(0, 50, n_points),
-                },
-                detector_readings={"BL02:DET:I0": np.random.rand(n_points) * 1000},
-                timestamps=np.linspace(0, 15, n_points),
-            )
+@pytest.fixture
+def writer(make_writer: WriterFactory) -> Iterator[NeXusWriter]:
+    """Open writer backed by an in-memory HDF5 file, for write-then-read checks."""
+    with make_writer("memory.nxs", in_memory=True) as writer:
+        yield writer
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data)
 
-            with h5py.File(filename, "r") as f:
-                sample = f["entry/sample"]
-                assert "position_x" in sample
-                assert "position_y" in sample
+class TestNeXusWriter:
+    """Test NeXusWriter class."""
 
-    def test_add_metadata(self) -> None:
-        """Test adding custom metadata."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test_metadata.nxs"
+    @pytest.mark.parametrize(
+        ("kwargs", "compression"),
+        [({}, "lzf"), ({"compression": 5}, 5), ({"compression": None}, None)],
+    )
+    def test_init(self, kwargs: dict[str, Any], compression: object) -> None:
+        """Test initialization stores its settings without touching disk."""
+        writer = NeXusWriter(UNOPENED, **kwargs)
+        assert writer.filename == UNOPENED
+        assert writer.mode == "w"
+        assert writer.compression == compression
+        assert writer.compression_opts is None
+        assert writer._file is None
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"compression": 10}, "Compression level must be 0-9"),
+            ({"compression": "zstd"}, "Unsupported compression"),
+            ({"compression": "lzf", "compression_opts": 4}, "does not take compression_opts"),
+            ({"compression": "gzip", "compression_opts": 12}, "Compression level must be 0-9"),
+        ],
+    )
+    def test_init_invalid_compression(self, kwargs: dict[str, Any], match: str) -> None:
+        """Test rejection of bad levels, unknown filters and options LZF does not take."""
+        with pytest.raises(ValueError, match=match):
+            NeXusWriter(UNOPENED, **kwargs)
+
+    def test_context_manager(self, tmp_path: Path) -> None:
+        """Test context manager usage."""
+        filename = tmp_path / "test.nxs"
+        with NeXusWriter(filename) as writer:
+            assert writer._file is not None
+            assert writer._entry_group is not None
+        # File should be closed after context exit
+        assert writer._file is None
 
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.array([0.0, 1.0, 2.0])},
-                detector_readings={"BL02:DET:I0": np.array([100.0, 200.0, 300.0])},
-                timestamps=np.array([0.0, 1.0, 2.0]),
+    def test_open_close(self, tmp_path: Path) -> None:
+        """Test explicit open/close."""
+        filename = tmp_path / "test.nxs"
+        writer = NeXusWriter(filename)
+        writer.open()
+        assert writer._file is not None
+        writer.close()
+        assert writer._file is None
+
+    def test_detector_dtype(self, tmp_path: Path, make_writer: WriterFactory) -> None:
+        """Test detector datasets use detector_dtype while axes stay float64."""
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.linspace(0, 1, 10)},
+            detector_readings={
+                "BL02:DET:I0": np.linspace(1e5, 2e5, 10),
+                "BL02:DET:IT": np.linspace(1e4, 2e4, 10),
+            },
+            timestamps=np.linspace(0, 1, 10),
+        )
+
+        with make_writer(detector_dtype=np.float32, in_memory=True) as writer:
+            writer.write_scan(scan_data)
+            f = writer._file
+            assert f["entry/instrument/detector/data"].dtype == np.float32
+            assert f["entry/instrument/detector/BL02_DET_IT"].dtype == np.float32
+            assert f["entry/instrument/monochromator/energy"].dtype == np.float64
+            assert f["entry/sample/position_x"].dtype == np.float64
+            np.testing.assert_allclose(
+                f["entry/data/intensity"][:],
+                scan_data.detector_readings["BL02:DET:I0"],
+                rtol=1e-7,
             )
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data)
-                writer.add_metadata("experiment_id", "EXP001")
-                writer.add_metadata("beamline", "BL02")
-                writer.add_metadata("operator", "John Doe")
-
-            with h5py.File(filename, "r") as f:
-                entry = f["entry"]
-                assert entry.attrs["experiment_id"] == "EXP001"
-                assert entry.attrs["beamline"] == "BL02"
-                assert entry.attrs["operator"] == "John Doe"
+        with pytest.raises(ValueError, match="floating-point"):
+            NeXusWriter(tmp_path / "f32.nxs", detector_dtype=np.int32)
 
-    def test_add_metadata_sanitization(self) -> None:
-        """Test metadata key sanitization."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test_sanitize.nxs"
+    def test_paged_file_space(self, tmp_path: Path, make_writer: WriterFactory) -> None:
+        """Test page_size creates a file with the paged file-space strategy."""
+        filename = tmp_path / "paged.nxs"
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.linspace(0, 1, 10)},
+            detector_readings={"BL02:DET:I0": np.linspace(1, 2, 10)},
+            timestamps=np.linspace(0, 1, 10),
+        )
 
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.array([0.0])},
-                detector_readings={"BL02:DET:I0": np.array([100.0])},
-                timestamps=np.array([0.0]),
-            )
+        with make_writer("paged.nxs", page_size=CLOUD_PAGE_SIZE) as writer:
+            writer.write_scan(scan_data)
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data)
-                writer.add_metadata("key with spaces", "value")
-                writer.add_metadata("key-with-dashes", "value2")
+        with h5py.File(filename, "r") as f:
+            fcpl = f.id.get_create_plist()
+            assert fcpl.get_file_space_strategy()[0] == h5py.h5f.FSPACE_STRATEGY_PAGE
+            assert fcpl.get_file_space_page_size() == CLOUD_PAGE_SIZE
 
-            with h5py.File(filename, "r") as f:
-                entry = f["entry"]
-                assert "key_with_spaces" in entry.attrs
-                assert "key_with_dashes" in entry.attrs
+        with pytest.raises(ValueError, match="page_size must be >= 512"):
+            NeXusWriter(filename, page_size=256)
 
-    def test_compression(self) -> None:
-        """Test gzip compression."""
-        with TemporaryDirectory() as tmpdir:
-            filename_no_comp = Path(tmpdir) / "no_comp.nxs"
-            filename_comp = Path(tmpdir) / "comp.nxs"
-
-            n_points = 1000
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.linspace(0, 100, n_points)},
-                detector_readings={"BL02:DET:I0": np.random.rand(n_points) * 1000},
-                timestamps=np.linspace(0, 100, n_points),
-            )
+    def test_in_memory(self, tmp_path: Path) -> None:
+        """Test in-memory writer never touches the filesystem."""
+        filename = tmp_path / "memory.nxs"
 
-            # Write without compression
-            with NeXusWriter(filename_no_comp, compression=0) as writer:
-                writer.write_scan(scan_data)
+        with NeXusWriter(filename, in_memory=True) as writer:
+            assert writer._file is not None
+            assert writer._file.driver == "core"
+            assert "entry" in writer._file
 
-            # Write with compression
-            with NeXusWriter(filename_comp, compression=1) as writer:
-                writer.write_scan(scan_data)
+        assert not filename.exists()
 
-            # For this test data, compression should help
-            # But we just verify both files are readable
-            with h5py.File(filename_no_comp, "r") as f:
-                assert "entry" in f
+    def test_write_scan_basic(self, writer: NeXusWriter, make_scan: ScanFactory) -> None:
+        """Test writing basic scan data."""
+        scan_data = make_scan(metadata={"ring_current": 350.5, "sample_name": "test_sample"})
+        motor_pos = scan_data.motor_positions["BL02:SAMPLE:X"]
+        detector_data = scan_data.detector_readings["BL02:DET:I0"]
+
+        writer.write_scan(scan_data, title="Test Scan")
+
+        # Verify file structure
+        f = writer._file
+        assert "entry" in f
+        entry = _snapshot(f["entry"])
+        assert entry["attrs"]["NX_class"] == "NXentry"
+        assert entry["attrs"]["definition"] == "NXxas"
+        assert entry["attrs"]["title"] == "Test Scan"
+        assert {"instrument", "sample", "data"} <= entry["keys"]
+
+        # Check instrument structure
+        instrument = _snapshot(f["entry/instrument"])
+        assert instrument["attrs"]["NX_class"] == "NXinstrument"
+        assert {"source", "monochromator", "detector"} <= instrument["keys"]
+
+        # Check source
+        source = _snapshot(f["entry/instrument/source"])
+        assert source["attrs"]["NX_class"] == "NXsource"
+        assert source["attrs"]["type"] == "Synchrotron X-ray Source"
+        assert f["entry/instrument/source/current"][()] == 350.5
+
+        # Check monochromator
+        monochromator = _snapshot(f["entry/instrument/monochromator"])
+        assert monochromator["attrs"]["NX_class"] == "NXmonochromator"
+        assert "energy" in monochromator["keys"]
+        np.testing.assert_array_almost_equal(
+            f["entry/instrument/monochromator/energy"][:], motor_pos
+        )
+
+        # Check detector
+        detector = _snapshot(f["entry/instrument/detector"])
+        assert detector["attrs"]["NX_class"] == "NXdetector"
+        assert "data" in detector["keys"]
+        np.testing.assert_array_almost_equal(f["entry/instrument/detector/data"][:], detector_data)
+
+        # Check sample
+        sample = _snapshot(f["entry/sample"])
+        assert sample["attrs"]["NX_class"] == "NXsample"
+        assert sample["attrs"]["name"] == "test_sample"
+        assert "position_x" in sample["keys"]
+
+        # Check data group
+        data = _snapshot(f["entry/data"])
+        assert data["attrs"]["NX_class"] == "NXdata"
+        assert data["attrs"]["signal"] == "intensity"
+        assert {"intensity", "energy"} <= data["keys"]
+
+    @pytest.mark.parametrize(
+        ("scan_type", "expected_axes"),
+        [("linear", ["two_theta"]), ("mesh", ["two_theta"]), ("xafs", ["energy"])],
+    )
+    def test_write_scan_axes(
+        self,
+        writer: NeXusWriter,
+        make_scan: ScanFactory,
+        scan_type: ScanType,
+        expected_axes: list[str],
+    ) -> None:
+        """Test the default plot axes follow the scan type."""
+        writer.write_scan(make_scan(50), scan_type=scan_type)
+
+        assert writer._file["entry/data"].attrs["axes"] == expected_axes
+
+    def test_write_scan_multiple_detectors(
+        self, writer: NeXusWriter, make_scan: ScanFactory
+    ) -> None:
+        """Test writing scan with multiple detectors."""
+        scan_data = make_scan(20, n_detectors=2)
 
-            with h5py.File(filename_comp, "r") as f:
-                assert "entry" in f
+        writer.write_scan(scan_data)
 
-    def test_large_dataset_chunking(self) -> None:
-        """Test chunking for large datasets."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "large.nxs"
+        f = writer._file
+        detector = f["entry/instrument/detector"]
+        assert "data" in detector
+        assert "BL02_DET_IT" in detector  # Sanitized name
 
-            n_points = 50000  # Large dataset
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.linspace(0, 100, n_points)},
-                detector_readings={"BL02:DET:I0": np.random.rand(n_points) * 1000},
-                timestamps=np.linspace(0, 100, n_points),
+    def test_write_scan_multiple_motors(self, writer: NeXusWriter, make_scan: ScanFactory) -> None:
+        """Test writing scan with multiple motors."""
+        scan_data = make_scan(15, n_motors=2)
+
+        writer.write_scan(scan_data)
+
+        f = writer._file
+        sample = f["entry/sample"]
+        assert "position_x" in sample
+        assert "position_y" in sample
+
+    def test_streamed_scan_matches_write_scan(self, make_writer: WriterFactory) -> None:
+        """Test begin_scan/append_point produce the same contents as write_scan."""
+        scan_data = ScanData(
+            motor_positions={
+                "BL02:SAMPLE:Y": np.linspace(-1, 1, 20),
+                "BL02:SAMPLE:X": np.linspace(0, 10, 20),
+            },
+            detector_readings={
+                "BL02:DET:I0": np.linspace(1e5, 2e5, 20),
+                "BL02:DET:IT": np.linspace(1e4, 2e4, 20),
+            },
+            timestamps=np.linspace(1.7e9, 1.7e9 + 19, 20),
+            metadata={"ring_current": 350.5, "sample_name": "Cu foil"},
+        )
+        motors = list(scan_data.motor_positions)
+        detectors = list(scan_data.detector_readings)
+
+        def contents(f: h5py.File) -> dict[str, object]:
+            items: dict[str, object] = {"/": dict(f["entry"].attrs)}
+
+            def visit(name: str, obj: h5py.HLObject) -> None:
+                value = obj[()].tolist() if isinstance(obj, h5py.Dataset) else None
+                items[name] = (value, {k: str(v) for k, v in obj.attrs.items()})
+
+            f.visititems(visit)
+            return items
+
+        with make_writer(in_memory=True) as writer:
+            writer.write_scan(scan_data, title="Scan", scan_type="xafs")
+            bulk = contents(writer._file)
+
+        with make_writer(in_memory=True) as writer:
+            writer.begin_scan(
+                motors,
+                detectors,
+                20,
+                title="Scan",
+                scan_type="xafs",
+                metadata=scan_data.metadata,
             )
-
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data)
-
-            # Verify file is readable and data is correct
-            with h5py.File(filename, "r") as f:
-                detector_data = f["entry/instrument/detector/data"]
-                assert len(detector_data) == n_points
-                # Check that chunking is applied (chunks attribute exists)
-                assert detector_data.chunks is not None
-
-    def test_start_time_iso8601(self) -> None:
+            for i in range(20):
+                writer.append_point(
+                    [scan_data.motor_positions[m][i] for m in motors],
+                    [scan_data.detector_readings[d][i] for d in detectors],
+                    scan_data.timestamps[i],
+                )
+            assert writer.end_scan() == 20
+            streamed = contents(writer._file)
+
+        assert streamed == bulk
+
+    def test_stream_errors(self, make_writer: WriterFactory) -> None:
+        """Test streaming calls out of order or with wrong lengths are rejected."""
+        with make_writer() as writer:
+            with pytest.raises(RuntimeError, match="No scan in progress"):
+                writer.append_point([0.0], [1.0], 0.0)
+
+            writer.begin_scan(["BL02:SAMPLE:X"], ["BL02:DET:I0"])
+            with pytest.raises(RuntimeError, match="already in progress"):
+                writer.begin_scan(["BL02:SAMPLE:X"], ["BL02:DET:I0"])
+            with pytest.raises(ValueError, match="Expected 1 detector values, got 2"):
+                writer.append_point([0.0], [1.0, 2.0], 0.0)
+
+            assert writer.end_scan() == 0
+            with pytest.raises(RuntimeError, match="No scan in progress"):
+                writer.end_scan()
+
+    def test_add_metadata(self, writer: NeXusWriter) -> None:
+        """Test adding custom metadata."""
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.0, 1.0, 2.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0, 200.0, 300.0])},
+            timestamps=np.array([0.0, 1.0, 2.0]),
+        )
+
+        writer.write_scan(scan_data)
+        writer.add_metadata("experiment_id", "EXP001")
+        writer.add_metadata("beamline", "BL02")
+        writer.add_metadata("operator", "John Doe")
+
+        attrs = _snapshot(writer._file["entry"])["attrs"]
+        assert attrs["experiment_id"] == "EXP001"
+        assert attrs["beamline"] == "BL02"
+        assert attrs["operator"] == "John Doe"
+
+    def test_add_metadata_sanitization(self, writer: NeXusWriter) -> None:
+        """Test metadata key sanitization."""
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0])},
+            timestamps=np.array([0.0]),
+        )
+
+        writer.write_scan(scan_data)
+        writer.add_metadata("key with spaces", "value")
+        writer.add_metadata("key-with-dashes", "value2")
+
+        attrs = _snapshot(writer._file["entry"])["attrs"]
+        assert "key_with_spaces" in attrs
+        assert "key_with_dashes" in attrs
+
+    def test_add_metadata_batch(self, writer: NeXusWriter) -> None:
+        """Test adding several metadata entries at once."""
+        writer.add_metadata_batch(
+            {"experiment id": "EXP001", "energy-range": [7000.0, 8000.0], "path": Path("x")}
+        )
+
+        attrs = _snapshot(writer._file["entry"])["attrs"]
+        assert attrs["experiment_id"] == "EXP001"
+        np.testing.assert_array_equal(attrs["energy_range"], [7000.0, 8000.0])
+        assert attrs["path"] == "x"
+
+    def test_compression(self, make_writer: WriterFactory, make_scan: ScanFactory) -> None:
+        """Test gzip compression."""
+        scan_data = make_scan(1000)
+
+        # Write without compression
+        with make_writer(compression=0, in_memory=True) as writer:
+            writer.write_scan(scan_data)
+            assert writer._file["entry/instrument/detector/data"].compression is None
+
+        # Write with compression
+        with make_writer(compression=1, in_memory=True) as writer:
+            writer.write_scan(scan_data)
+            assert writer._file["entry/instrument/detector/data"].compression == "gzip"
+
+    @pytest.mark.parametrize(
+        ("kwargs", "expected", "opts"),
+        [
+            ({}, "lzf", None),
+            ({"compression": "gzip"}, "gzip", 1),
+            ({"compression": "gzip", "compression_opts": 6}, "gzip", 6),
+            ({"compression": 4}, "gzip", 4),
+            ({"compression": None}, None, None),
+        ],
+    )
+    def test_compression_filter(
+        self, kwargs: dict[str, object], expected: str | None, opts: int | None, tmp_path: Path
+    ) -> None:
+        """Test the selected filter is applied to array datasets."""
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.linspace(0, 1, 100)},
+            detector_readings={"BL02:DET:I0": np.linspace(1, 2, 100)},
+            timestamps=np.linspace(0, 1, 100),
+        )
+
+        with NeXusWriter(tmp_path / "filter.nxs", in_memory=True, **kwargs) as writer:  # type: ignore[arg-type]
+            writer.write_scan(scan_data)
+            data = writer._file["entry/instrument/detector/data"]
+            assert data.compression == expected
+            assert data.compression_opts == opts
+            assert data.shuffle == (expected is not None)
+            assert data.fletcher32 == (expected is not None)
+            np.testing.assert_array_equal(data[:], scan_data.detector_readings["BL02:DET:I0"])
+
+    @pytest.mark.parametrize(
+        ("n_points", "expected"),
+        [(_MIN_CHUNKED_POINTS - 1, None), (_MIN_CHUNKED_POINTS, (_MIN_CHUNKED_POINTS,))],
+    )
+    def test_dataset_chunking_threshold(
+        self,
+        writer: NeXusWriter,
+        make_scan: ScanFactory,
+        n_points: int,
+        expected: tuple[int] | None,
+    ) -> None:
+        """Test datasets switch from contiguous to chunked at the threshold."""
+        writer.write_scan(make_scan(n_points))
+
+        detector_data = writer._file["entry/instrument/detector/data"]
+        assert len(detector_data) == n_points
+        assert detector_data.chunks == expected
+
+    def test_as_f64_avoids_copy(self) -> None:
+        """Test float64 arrays are passed through and others converted."""
+        values = np.linspace(0, 1, 10)
+        assert _as_f64(values) is values
+
+        converted = _as_f64(np.arange(10, dtype=np.int32))
+        assert converted.dtype == np.float64
+        strided = _as_f64(values[::2])
+        assert strided.flags.c_contiguous
+        np.testing.assert_array_equal(strided, values[::2])
+
+    @pytest.mark.parametrize(
+        ("n_points", "expected"),
+        [(10, None), (1023, None), (1024, (1024,)), (131072, (131072,)), (10**6, (131072,))],
+    )
+    def test_compute_chunks(self, n_points: int, expected: tuple[int] | None) -> None:
+        """Test chunk shape is capped at 1 MiB of float64."""
+        assert _compute_chunks(n_points) == expected
+
+    def test_start_time_iso8601(self, writer: NeXusWriter, make_scan: ScanFactory) -> None:
         """Test start_time is stored as ISO 8601."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test_time.nxs"
-
-            # Use specific timestamp
-            base_time = datetime.datetime(2026, 1, 12, 10, 30, 0, tzinfo=datetime.UTC)
-            timestamps = np.array([base_time.timestamp() + i for i in range(5)])
+        # Use specific timestamp
+        base_time = datetime.datetime(2026, 1, 12, 10, 30, 0, tzinfo=datetime.UTC)
 
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.linspace(0, 10, 5)},
-                detector_readings={"BL02:DET:I0": np.random.rand(5) * 1000},
-                timestamps=timestamps,
-            )
+        scan_data = make_scan(5)
+        scan_data.timestamps = base_time.timestamp() + np.arange(5, dtype=np.float64)
 
-            with NeXusWriter(filename) as writer:
-                writer.write_scan(scan_data)
+        writer.write_scan(scan_data)
 
-            with h5py.File(filename, "r") as f:
-                entry = f["entry"]
-                start_time_str = entry.attrs["start_time"]
-                # Should be ISO 8601 format
-                assert "T" in start_time_str or "+" in start_time_str or "Z" in start_time_str
-                # Should be parseable
-                parsed = datetime.datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
-                assert parsed.year == 2026
+        f = writer._file
+        entry = f["entry"]
+        start_time_str = entry.attrs["start_time"]
+        # Should be ISO 8601 format
+        assert "T" in start_time_str or "+" in start_time_str or "Z" in start_time_str
+        # Should be parseable
+        parsed = datetime.datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+        assert parsed.year == 2026
 
-    def test_write_scan_no_file_open(self) -> None:
+    def test_write_scan_no_file_open(self, tmp_path: Path) -> None:
         """Test error when writing without opening file."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            writer = NeXusWriter(filename)
-
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.array([0.0])},
-                detector_readings={"BL02:DET:I0": np.array([100.0])},
-                timestamps=np.array([0.0]),
-            )
+        filename = tmp_path / "test.nxs"
+        writer = NeXusWriter(filename)
+
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0])},
+            timestamps=np.array([0.0]),
+        )
 
-            with pytest.raises(RuntimeError, match="File not open"):
-                writer.write_scan(scan_data)
+        with pytest.raises(RuntimeError, match="File not open"):
+            writer.write_scan(scan_data)
 
-    def test_add_metadata_no_file_open(self) -> None:
+    def test_add_metadata_no_file_open(self, tmp_path: Path) -> None:
         """Test error when adding metadata without opening file."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-            writer = NeXusWriter(filename)
+        filename = tmp_path / "test.nxs"
+        writer = NeXusWriter(filename)
 
-            with pytest.raises(RuntimeError, match="File not open"):
-                writer.add_metadata("key", "value")
+        with pytest.raises(RuntimeError, match="File not open"):
+            writer.add_metadata("key", "value")
 
 
 class TestScanDataToNeXus:
     """Test ScanData.to_nexus() method."""
 
-    def test_to_nexus_basic(self) -> None:
+    def test_to_nexus_basic(self, tmp_path: Path) -> None:
         """Test basic to_nexus() usage."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
+        filename = tmp_path / "test.nxs"
 
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.array([0.0, 1.0, 2.0])},
-                detector_readings={"BL02:DET:I0": np.array([100.0, 200.0, 300.0])},
-                timestamps=np.array([0.0, 1.0, 2.0]),
-            )
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.0, 1.0, 2.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0, 200.0, 300.0])},
+            timestamps=np.array([0.0, 1.0, 2.0]),
+        )
 
-            scan_data.to_nexus(filename, title="Test Scan")
+        scan_data.to_nexus(filename, title="Test Scan")
 
-            # Verify file exists and is valid
-            assert filename.exists()
-            with h5py.File(filename, "r") as f:
-                assert "entry" in f
-                assert f["entry"].attrs["title"] == "Test Scan"
+        # Verify file exists and is valid
+        assert filename.exists()
+        with h5py.File(filename, "r") as f:
+            assert "entry" in f
+            assert f["entry"].attrs["title"] == "Test Scan"
 
-    def test_to_nexus_auto_title(self) -> None:
+    def test_to_nexus_auto_title(self, tmp_path: Path) -> None:
         """Test to_nexus() with auto-generated title."""
-        with TemporaryDirectory() as tmpdir:
-            filename = Path(tmpdir) / "test.nxs"
-
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.array([0.0])},
-                detector_readings={"BL02:DET:I0": np.array([100.0])},
-                timestamps=np.array([0.0]),
-                metadata={"title": "Metadata Title"},
-            )
-
-            scan_data.to_nexus(filename)
-
-            with h5py.File(filename, "r") as f:
-                assert f["entry"].attrs["title"] == "Metadata Title"
-
-    def test_to_nexus_scan_type(self) -> None:
-        """Test to_nexus() with different scan types."""
-        with TemporaryDirectory() as tmpdir:
-            filename_linear = Path(tmpdir) / "linear.nxs"
-            filename_xafs = Path(tmpdir) / "xafs.nxs"
-
-            scan_data = ScanData(
-                motor_positions={"BL02:SAMPLE:X": np.array([0.0, 1.0])},
-                detector_readings={"BL02:DET:I0": np.array([100.0, 200.0])},
-                timestamps=np.array([0.0, 1.0]),
-            )
-
-            scan_data.to_nexus(filename_linear, scan_type="linear")
-            scan_data.to_nexus(filename_xafs, scan_type="xafs")
-
-            with h5py.File(filename_linear, "r") as f:
-                data = f["entry/data"]
-                assert data.attrs["axes"] == ["two_theta"]
-
-            with h5py.File(filename_xafs, "r") as f:
-                data = f["entry/data"]
-                assert data.attrs["axes"] == ["energy"]
+        filename = tmp_path / "test.nxs"
+
+        scan_data = ScanData(
+            motor_positions={"BL02:SAMPLE:X": np.array([0.0])},
+            detector_readings={"BL02:DET:I0": np.array([100.0])},
+            timestamps=np.array([0.0]),
+            metadata={"title": "Metadata Title"},
+        )
+
+        scan_data.to_nexus(filename)
+
+        with h5py.File(filename, "r") as f:
+            assert f["entry"].attrs["title"] == "Metadata Title"
+
+    @pytest.mark.parametrize(
+        ("scan_type", "expected_axes"), [("linear", ["two_theta"]), ("xafs", ["energy"])]
+    )
+    def test_to_nexus_scan_type(
+        self,
+        tmp_path: Path,
+        make_scan: ScanFactory,
+        scan_type: ScanType,
+        expected_axes: list[str],
+    ) -> None:
+        """Test to_nexus() passes the scan type through."""
+        filename = tmp_path / f"{scan_type}.nxs"
+
+        make_scan(2).to_nexus(filename, scan_type=scan_type)
+
+        with h5py.File(filename, "r") as f:
+            assert f["entry/data"].attrs["axes"] == expected_axes
@@ -0,0 +1,93 @@
+"""Unit tests for DeviceClientPool."""
+
+import socket
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from beamline.daq.exceptions import ProtocolError, TimeoutError
+from beamline.daq.pool import DeviceClientPool
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[str, int]]:
+    """Minimal line server answering OK:1.0 to GET and ERR:UNKNOWN_PV otherwise."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    listener.settimeout(5.0)
+
+    def handle(conn: socket.socket) -> None:
+        with conn, conn.makefile("rb") as reader:
+            for line in reader:
+                reply = b"OK:1.0\n" if line.startswith(b"GET:") else b"ERR:UNKNOWN_PV\n"
+                conn.sendall(reply)
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.getsockname()[:2]
+    listener.close()
+
+
+class TestDeviceClientPool:
+    """Test DeviceClientPool functionality."""
+
+    def test_reuses_connection(self, server: tuple[str, int]) -> None:
+        """Test a released client is handed out again."""
+        host, port = server
+        with DeviceClientPool() as pool:
+            with pool.acquire(host, port) as client:
+                assert client.get("BL02:DET:I0") == 1.0
+            with pool.acquire(host, port) as again:
+                assert again is client
+                assert again.get("BL02:DET:I0") == 1.0
+
+    def test_protocol_error_keeps_connection(self, server: tuple[str, int]) -> None:
+        """Test a server-side error does not discard the connection."""
+        host, port = server
+        with DeviceClientPool() as pool:
+            with pytest.raises(ProtocolError), pool.acquire(host, port) as client:
+                client.status("BL02:SAMPLE:X")
+            with pool.acquire(host, port) as again:
+                assert again is client
+
+    def test_other_error_discards_connection(self, server: tuple[str, int]) -> None:
+        """Test a transport failure closes the client instead of pooling it."""
+        host, port = server
+        with DeviceClientPool() as pool:
+            with pytest.raises(TimeoutError), pool.acquire(host, port) as client:
+                raise TimeoutError("simulated")
+            assert not client.connected
+            with pool.acquire(host, port) as again:
+                assert again is not client
+
+    def test_expired_connection_not_reused(self, server: tuple[str, int]) -> None:
+        """Test idle connections older than max_idle_time are evicted."""
+        host, port = server
+        with DeviceClientPool(max_idle_time=1e-9) as pool:
+            with pool.acquire(host, port) as client:
+                pass
+            with pool.acquire(host, port) as again:
+                assert again is not client
+            assert not client.connected
+
+    def test_max_idle(self, server: tuple[str, int]) -> None:
+        """Test clients beyond max_idle are closed on release."""
+        host, port = server
+        with DeviceClientPool(max_idle=0) as pool:
+            with pool.acquire(host, port) as client:
+                pass
+            assert not client.connected
+
+    def test_invalid_arguments(self) -> None:
+        """Test constructor validation."""
+        with pytest.raises(ValueError, match="max_idle"):
+            DeviceClientPool(max_idle=-1)
+        with pytest.raises(ValueError, match="max_idle_time"):
+            DeviceClientPool(max_idle_time=0)
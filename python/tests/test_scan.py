@@ -1,10 +1,18 @@
 """Unit tests for scan engine."""
 
-from unittest.mock import MagicMock, patch
+import itertools
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from unittest.mock import MagicMock
 
+import h5py
+import numpy as np
 import pytest
+from numpy.typing import ArrayLike
 
 from beamline.daq.client import DeviceClient
+from beamline.daq.exceptions import ProtocolError
+from beamline.daq.nexus import NeXusWriter
 from beamline.daq.scan import (
     LinearScanConfig,
     MeshScanConfig,
@@ -30,6 +38,19 @@ class TestScanConfigs:
         assert config.motor == "BL02:SAMPLE:X"
         assert len(config.positions) == 100
 
+    def test_scan_config_points_follow_fields(self) -> None:
+        """Test point arrays are derived from the current field values."""
+        config = LinearScanConfig(
+            motor="BL02:SAMPLE:X", start=0.0, stop=1.0, steps=5, detectors=["BL02:DET:I0"]
+        )
+        np.testing.assert_array_equal(config.positions, [0.0, 0.25, 0.5, 0.75, 1.0])
+
+        copy = config.model_copy(update={"stop": 10.0})
+        np.testing.assert_array_equal(copy.positions, [0.0, 2.5, 5.0, 7.5, 10.0])
+
+        config.steps = 3
+        np.testing.assert_array_equal(config.positions, [0.0, 0.5, 1.0])
+
     def test_linear_scan_config_invalid_range(self) -> None:
         """Test LinearScanConfig with invalid range."""
         with pytest.raises(ValueError, match="stop must be greater"):
@@ -64,6 +85,11 @@ class TestScanConfigs:
         energies = config.generate_energies()
         assert len(energies) > 0
         assert energies[0] < energies[-1]  # Should be increasing
+        assert energies.dtype == np.float64
+        assert len(energies) == 27 + 101 + 236  # Points per region, edges included
+        assert energies[0] == 7112.0 - 150.0
+        assert energies[27] == 7112.0 - 20.0  # Shared boundary appears in both regions
+        assert energies[-1] == 7112.0 + 500.0
 
     def test_xafs_scan_config_invalid_regions(self) -> None:
         """Test XAFSScanConfig with invalid regions."""
@@ -85,15 +111,33 @@ class TestScanConfigs:
             )
 
 
+def _reads(rows: Iterable[ArrayLike]) -> Callable[[Sequence[str]], np.ndarray]:
+    """Build a client.get_many side effect returning one row of ``rows`` per call."""
+    remaining = iter(rows)
+    return lambda pvs: np.asarray(next(remaining), dtype=np.float64)
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    """Mock DeviceClient whose motors are always idle, fresh for each test."""
+    client = MagicMock(spec=DeviceClient)
+    client.status.return_value = "IDLE"
+    return client
+
+
 class TestScanEngine:
     """Test ScanEngine execution."""
 
-    def test_run_linear(self) -> None:
+    @pytest.fixture(autouse=True)
+    def frozen_clock(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Skip dwell sleeps and pin point timestamps to t=1000 s."""
+        monkeypatch.setattr("beamline.daq.scan.time.sleep", lambda _: None)
+        monkeypatch.setattr("beamline.daq.scan.time.time", lambda: 1000.0)
+
+    def test_run_linear(self, client: MagicMock) -> None:
         """Test linear scan execution."""
-        client = MagicMock(spec=DeviceClient)
-        client.get.side_effect = [100.0, 101.0, 102.0]  # Detector readings
-        client.status.return_value = "IDLE"
-        client.move.return_value = None
+        # Detector readings, one round trip per point
+        client.get_many.side_effect = _reads([[100.0, 90.0], [101.0, 91.0], [102.0, 92.0]])
 
         engine = ScanEngine(client)
         config = LinearScanConfig(
@@ -101,24 +145,28 @@ class TestScanEngine:
             start=-100.0,
             stop=100.0,
             steps=3,
-            detectors=["BL02:DET:I0"],
+            detectors=["BL02:DET:I0", "BL02:DET:IT"],
             dwell_time=0.01,
         )
 
-        with patch("beamline.daq.device.time.sleep"), patch("time.time", return_value=1000.0):
-            data = engine.run_linear(config)
+        data = engine.run_linear(config)
 
         assert len(data.timestamps) == 3
         assert len(data.motor_positions["BL02:SAMPLE:X"]) == 3
-        assert len(data.detector_readings["BL02:DET:I0"]) == 3
+        np.testing.assert_array_equal(data.detector_readings["BL02:DET:I0"], [100.0, 101.0, 102.0])
+        np.testing.assert_array_equal(data.detector_readings["BL02:DET:IT"], [90.0, 91.0, 92.0])
+        client.get_many.assert_called_with(["BL02:DET:I0", "BL02:DET:IT"])
+        client.get.assert_not_called()
         assert data.metadata["scan_type"] == "linear"
 
-    def test_run_mesh(self) -> None:
+        # Scan data owns its arrays, independent of the config
+        data.motor_positions["BL02:SAMPLE:X"] *= 2
+        np.testing.assert_array_equal(data.motor_positions["BL02:SAMPLE:X"], [-200.0, 0.0, 200.0])
+        np.testing.assert_array_equal(config.positions, [-100.0, 0.0, 100.0])
+
+    def test_run_mesh(self, client: MagicMock) -> None:
         """Test mesh scan execution."""
-        client = MagicMock(spec=DeviceClient)
-        client.get.return_value = 50.0  # Detector readings
-        client.status.return_value = "IDLE"
-        client.move.return_value = None
+        client.get_many.side_effect = _reads(np.arange(9.0)[:, None])  # Point index
 
         engine = ScanEngine(client)
         config = MeshScanConfig(
@@ -128,20 +176,21 @@ class TestScanEngine:
             dwell_time=0.01,
         )
 
-        with patch("beamline.daq.device.time.sleep"), patch("time.time", return_value=1000.0):
-            data = engine.run_mesh(config)
+        data = engine.run_mesh(config)
 
         assert len(data.timestamps) == 9  # 3x3 grid
-        assert "BL02:SAMPLE:X" in data.motor_positions
-        assert "BL02:SAMPLE:Y" in data.motor_positions
+        np.testing.assert_array_equal(data.detector_readings["BL02:DET:IF"], np.arange(9.0))
+        np.testing.assert_array_equal(
+            data.motor_positions["BL02:SAMPLE:X"], np.repeat([-10.0, 0.0, 10.0], 3)
+        )
+        np.testing.assert_array_equal(
+            data.motor_positions["BL02:SAMPLE:Y"], np.tile([-10.0, 0.0, 10.0], 3)
+        )
         assert data.metadata["scan_type"] == "mesh"
 
-    def test_run_xafs(self) -> None:
+    def test_run_xafs(self, client: MagicMock) -> None:
         """Test XAFS scan execution."""
-        client = MagicMock(spec=DeviceClient)
-        client.get.return_value = 100.0  # Detector readings
-        client.status.return_value = "IDLE"
-        client.move.return_value = None
+        client.get_many.side_effect = _reads(itertools.repeat([100.0]))  # Detector readings
 
         engine = ScanEngine(client)
         config = XAFSScanConfig(
@@ -151,19 +200,47 @@ class TestScanEngine:
             dwell_time=0.01,
         )
 
-        with patch("beamline.daq.device.time.sleep"), patch("time.time", return_value=1000.0):
-            data = engine.run_xafs(config)
+        data = engine.run_xafs(config)
 
         assert len(data.timestamps) > 0
         assert "BL02:MONO:ENERGY" in data.motor_positions
         assert data.metadata["scan_type"] == "xafs"
         assert data.metadata["edge"] == 7112.0
 
-    def test_run_dispatch(self) -> None:
+    def test_run_linear_streams_to_writer(self, client: MagicMock, tmp_path: Path) -> None:
+        """Test points reach the NeXus file as they are acquired, even if the scan fails."""
+        client.get_many.side_effect = [
+            np.array([100.0]),
+            np.array([101.0]),
+            ProtocolError("UNKNOWN_PV"),
+        ]
+
+        engine = ScanEngine(client)
+        config = LinearScanConfig(
+            motor="BL02:SAMPLE:X",
+            start=0.0,
+            stop=2.0,
+            steps=3,
+            detectors=["BL02:DET:I0"],
+            dwell_time=0.01,
+        )
+
+        filename = tmp_path / "scan.nxs"
+        with (
+            NeXusWriter(filename) as writer,
+            pytest.raises(ProtocolError),
+        ):
+            engine.run(config, writer)
+
+        with h5py.File(filename, "r") as f:
+            np.testing.assert_array_equal(f["entry/instrument/detector/data"][:], [100.0, 101.0])
+            np.testing.assert_array_equal(f["entry/instrument/monochromator/energy"][:], [0.0, 1.0])
+            assert f["entry"].attrs["start_time"].startswith("1970-01-01T00:16:40")
+
+    def test_run_dispatch(self, client: MagicMock) -> None:
         """Test run() method dispatch."""
-        client = MagicMock(spec=DeviceClient)
         client.get.return_value = 100.0
-        client.status.return_value = "IDLE"
+        client.get_many.return_value = np.array([100.0])
 
         engine = ScanEngine(client)
 
@@ -175,7 +252,6 @@ class TestScanEngine:
             detectors=["BL02:DET:I0"],
         )
 
-        with patch("beamline.daq.device.time.sleep"), patch("time.time", return_value=1000.0):
-            data = engine.run(linear_config)
+        data = engine.run(linear_config)
 
         assert data.metadata["scan_type"] == "linear"
@@ -2,14 +2,59 @@
 
 from __future__ import annotations
 
+from typing import NamedTuple
+
 import numpy as np
 import pytest
-from hypothesis import given
+from hypothesis import given, settings
 from hypothesis import strategies as st
 from hypothesis.extra.numpy import arrays
+from numpy.typing import ArrayLike
+from scipy import optimize
 
 from beamline.analysis.xrd import FitResult, Peak, XRDAnalyzer
 
+# Unit-variance noise drawn once, sized for the longest synthetic pattern
+NOISE = np.random.default_rng(0xBEEF).standard_normal(400)
+NOISE.flags.writeable = False
+
+FWHM_PER_SIGMA = 2 * np.sqrt(2 * np.log(2))
+
+
+def _gaussian_peaks(
+    two_theta: np.ndarray,
+    centers: ArrayLike,
+    sigmas: ArrayLike,
+    amplitudes: ArrayLike = 100.0,
+) -> np.ndarray:
+    """Sum of Gaussian peaks, evaluated for all peaks in one broadcast."""
+    offsets = (two_theta[:, None] - np.asarray(centers)) / np.asarray(sigmas)
+    return (np.asarray(amplitudes) * np.exp(-0.5 * offsets**2)).sum(axis=1)
+
+
+class PeakProfiles(NamedTuple):
+    """Noise-free single peak sampled as both a Gaussian and a Lorentzian."""
+
+    center: float
+    amplitude: float
+    width: float
+    two_theta: np.ndarray
+    gaussian: np.ndarray
+    lorentzian: np.ndarray
+
+
+@pytest.fixture(scope="module")
+def peak_profiles() -> PeakProfiles:
+    """Build the fit_peak test profiles once per module; arrays are read-only."""
+    center, amplitude, width, background = 20.0, 100.0, 0.5, 10.0
+    two_theta = np.linspace(15, 25, 100)
+    gaussian = amplitude * np.exp(-0.5 * ((two_theta - center) / (width / 2.355)) ** 2) + background
+    lorentzian = amplitude / (1 + ((two_theta - center) / (width / 2.0)) ** 2) + background
+
+    for values in (two_theta, gaussian, lorentzian):
+        values.flags.writeable = False
+    return PeakProfiles(center, amplitude, width, two_theta, gaussian, lorentzian)
+
 
 class TestPeak:
     """Tests for Peak dataclass."""
@@ -58,16 +103,14 @@ class TestXRDAnalyzer:
         """Test finding peaks in simple synthetic data."""
         # Create synthetic data with known peaks
         two_theta = np.linspace(10, 50, 400)
-        intensity = np.zeros_like(two_theta)
 
         # Add two Gaussian peaks
         peak1_pos = 20.0
         peak2_pos = 30.0
-        for pos in [peak1_pos, peak2_pos]:
-            intensity += 100 * np.exp(-0.5 * ((two_theta - pos) / 0.5) ** 2)
+        intensity = _gaussian_peaks(two_theta, [peak1_pos, peak2_pos], 0.5)
 
         # Add noise
-        intensity += np.random.normal(0, 1, len(intensity))
+        intensity += NOISE[: len(intensity)]
 
         peaks = self.analyzer.find_peaks(two_theta, intensity, prominence=5.0)
 
@@ -77,6 +120,20 @@ class TestXRDAnalyzer:
         assert any(abs(p - peak1_pos) < 1.0 for p in positions)
         assert any(abs(p - peak2_pos) < 1.0 for p in positions)
 
+    def test_find_peaks_fwhm(self) -> None:
+        """Test FWHM of well-separated Gaussian peaks of different widths."""
+        two_theta = np.linspace(10, 60, 5001)
+        widths = [0.3, 0.8, 1.5]
+        intensity = _gaussian_peaks(
+            two_theta, [20.0, 35.0, 50.0], np.asarray(widths) / FWHM_PER_SIGMA
+        )
+
+        peaks = self.analyzer.find_peaks(two_theta, intensity, prominence=5.0)
+
+        assert len(peaks) == 3
+        for peak, fwhm in zip(peaks, widths, strict=True):
+            assert abs(peak.fwhm - fwhm) < 0.01
+
     def test_find_peaks_empty_array(self) -> None:
         """Test find_peaks with empty arrays."""
         two_theta = np.array([])
@@ -101,46 +158,147 @@ class TestXRDAnalyzer:
         with pytest.raises(ValueError, match="monotonically increasing"):
             self.analyzer.find_peaks(two_theta, intensity)
 
-    def test_fit_peak_gaussian(self) -> None:
-        """Test fitting a Gaussian peak."""
-        # Create synthetic peak
-        center = 20.0
-        amplitude = 100.0
-        width = 0.5
-        background = 10.0
+    def test_find_peaks_non_finite(self) -> None:
+        """Test find_peaks rejects NaN and Inf in either array."""
+        two_theta = np.linspace(10, 50, 100)
+        intensity = np.ones(100)
 
-        two_theta = np.linspace(15, 25, 100)
-        intensity = (
-            amplitude * np.exp(-0.5 * ((two_theta - center) / (width / 2.355)) ** 2) + background
-        )
+        bad_theta = two_theta.copy()
+        bad_theta[50] = np.nan
+        with pytest.raises(ValueError, match="finite values"):
+            self.analyzer.find_peaks(bad_theta, intensity)
+
+        bad_intensity = intensity.copy()
+        bad_intensity[-1] = np.inf
+        with pytest.raises(ValueError, match="finite values"):
+            self.analyzer.find_peaks(two_theta, bad_intensity)
 
+    def test_fit_peak_gaussian(self, peak_profiles: PeakProfiles) -> None:
+        """Test fitting a Gaussian peak."""
+        p = peak_profiles
         result = self.analyzer.fit_peak(
-            two_theta, intensity, center=center, width=width, model="gaussian"
+            p.two_theta, p.gaussian, center=p.center, width=p.width, model="gaussian"
         )
 
         assert result.model_type == "gaussian"
-        assert abs(result.center - center) < 0.1
-        assert abs(result.amplitude - amplitude) < 10.0
-        assert abs(result.width - width) < 0.2
+        assert abs(result.center - p.center) < 0.1
+        assert abs(result.amplitude - p.amplitude) < 10.0
+        assert abs(result.width - p.width) < 0.2
         assert "center" in result.uncertainties
 
-    def test_fit_peak_lorentzian(self) -> None:
+    def test_fit_peak_lorentzian(self, peak_profiles: PeakProfiles) -> None:
         """Test fitting a Lorentzian peak."""
-        center = 20.0
-        amplitude = 100.0
-        width = 0.5
-        background = 10.0
+        p = peak_profiles
+        result = self.analyzer.fit_peak(
+            p.two_theta, p.lorentzian, center=p.center, width=p.width, model="lorentzian"
+        )
+
+        assert result.model_type == "lorentzian"
+        assert abs(result.center - p.center) < 0.1
+
+    def test_fit_peak_uncertainties_match_curve_fit(self) -> None:
+        """Test parameter uncertainties agree with scipy.optimize.curve_fit."""
+        rng = np.random.default_rng(1)
+        two_theta = np.linspace(15, 25, 300)
+        sigma = 0.5 / (2 * np.sqrt(2 * np.log(2)))
+        intensity = (
+            100 * np.exp(-0.5 * ((two_theta - 20.0) / sigma) ** 2)
+            + 10.0
+            + 0.3 * two_theta
+            + rng.normal(0, 1, len(two_theta))
+        )
+
+        result = self.analyzer.fit_peak(two_theta, intensity, center=20.0, width=0.5)
+        popt, pcov = optimize.curve_fit(
+            self.analyzer._gaussian_model,
+            two_theta,
+            intensity,
+            p0=[20.0, 90.0, 0.5, 10.0, 0.3],
+        )
+
+        assert abs(result.center - popt[0]) < 1e-4
+        assert abs(result.width - popt[2]) < 1e-4
+        for i, name in enumerate(["center", "amplitude", "width", "background_0"]):
+            assert result.uncertainties[name] == pytest.approx(np.sqrt(pcov[i, i]), rel=1e-3)
+
+    def test_fit_peak_local_window(self) -> None:
+        """Test fitting on a local window ignores a distant second peak.
 
-        two_theta = np.linspace(15, 25, 100)
-        gamma = width / 2.0
-        intensity = amplitude / (1 + ((two_theta - center) / gamma) ** 2) + background
+        The background is reported at the window mean (here the peak center),
+        not extrapolated to the mean of the whole scan.
+        """
+        two_theta = np.linspace(10, 60, 5001)
+        sigma = 0.5 / (2 * np.sqrt(2 * np.log(2)))
+        intensity = 100 * np.exp(-0.5 * ((two_theta - 20.0) / sigma) ** 2)
+        intensity += 200 * np.exp(-0.5 * ((two_theta - 45.0) / sigma) ** 2)
+        intensity += 10.0 + 0.2 * (two_theta - 20.0)
 
         result = self.analyzer.fit_peak(
-            two_theta, intensity, center=center, width=width, model="lorentzian"
+            two_theta, intensity, center=20.0, width=0.5, fit_window_factor=5.0
         )
 
-        assert result.model_type == "lorentzian"
-        assert abs(result.center - center) < 0.1
+        assert abs(result.center - 20.0) < 1e-4
+        assert abs(result.amplitude - 100.0) < 0.1
+        assert abs(result.background - 10.0) < 0.1
+        assert result.chi_squared < 1e-6
+
+        with pytest.raises(ValueError, match="No data within"):
+            self.analyzer.fit_peak(
+                two_theta, intensity, center=100.0, width=0.5, fit_window_factor=5.0
+            )
+
+    def test_fit_peak_pseudo_voigt_background(self) -> None:
+        """Test pseudo-Voigt fit reports the background, not the mixing parameter."""
+        two_theta = np.linspace(15, 25, 200)
+        sigma = 0.5 / (2 * np.sqrt(2 * np.log(2)))
+        gaussian = np.exp(-0.5 * ((two_theta - 20.0) / sigma) ** 2)
+        lorentzian = 1 / (1 + ((two_theta - 20.0) / 0.25) ** 2)
+        intensity = 100 * (0.3 * gaussian + 0.7 * lorentzian) + 10.0
+
+        result = self.analyzer.fit_peak(
+            two_theta,
+            intensity,
+            center=20.0,
+            width=0.5,
+            model="pseudo_voigt",
+            background_order=0,
+        )
+
+        assert abs(result.center - 20.0) < 0.01
+        assert abs(result.background - 10.0) < 0.5
+        assert "eta" in result.uncertainties
+
+    def test_fit_peaks_multiple(self) -> None:
+        """Test batch fitting of several peaks on one pattern."""
+        two_theta = np.linspace(10, 60, 2501)
+        centers = [20.0, 35.0, 50.0]
+        widths = [0.4, 0.6, 0.8]
+        intensity = 5.0 + _gaussian_peaks(
+            two_theta, centers, np.asarray(widths) / FWHM_PER_SIGMA, [100.0, 60.0, 80.0]
+        )
+
+        results = self.analyzer.fit_peaks(
+            two_theta, intensity, [c + 0.05 for c in centers], widths, max_workers=2
+        )
+
+        assert len(results) == 3
+        for result, pos, fwhm in zip(results, centers, widths, strict=True):
+            assert abs(result.center - pos) < 1e-3
+            assert abs(result.width - fwhm) < 1e-3
+            assert abs(result.background - 5.0) < 0.1
+
+    def test_fit_peaks_validation(self) -> None:
+        """Test input validation for fit_peaks."""
+        two_theta = np.linspace(10, 50, 100)
+        intensity = np.ones(100)
+
+        assert self.analyzer.fit_peaks(two_theta, intensity, []) == []
+
+        with pytest.raises(ValueError, match="same length"):
+            self.analyzer.fit_peaks(two_theta, intensity, [20.0, 30.0], widths=[1.0])
+
+        with pytest.raises(ValueError, match="fit_window_factor"):
+            self.analyzer.fit_peaks(two_theta, intensity, [20.0], fit_window_factor=0.0)
 
     def test_fit_peak_validation(self) -> None:
         """Test input validation for fit_peak."""
@@ -155,6 +313,46 @@ class TestXRDAnalyzer:
                 two_theta, np.linspace(0, 100, 100), center=20.0, model="invalid"
             )
 
+    @pytest.mark.parametrize(
+        ("model", "params"),
+        [
+            ("gaussian", [20.1, 80.0, 0.7]),
+            ("lorentzian", [20.1, 80.0, 0.7]),
+            ("pseudo_voigt", [20.1, 80.0, 0.7, 0.3]),
+        ],
+    )
+    @pytest.mark.parametrize("background_order", [0, 1, 2])
+    def test_model_jacobian_matches_finite_difference(
+        self, model: str, params: list[float], background_order: int
+    ) -> None:
+        """Test analytic Jacobians against central finite differences."""
+        model_func = getattr(self.analyzer, f"_{model}_model")
+        jac_func = getattr(self.analyzer, f"_{model}_jac")
+        x = np.linspace(15, 25, 50)
+        p = np.array(params + [5.0, 0.1, 0.01][: background_order + 1])
+
+        numeric = np.empty((len(x), len(p)))
+        for i in range(len(p)):
+            step = np.zeros_like(p)
+            step[i] = 1e-6 * max(1.0, abs(p[i]))
+            upper = model_func(x, *(p + step))
+            lower = model_func(x, *(p - step))
+            numeric[:, i] = (upper - lower) / (2 * step[i])
+
+        np.testing.assert_allclose(jac_func(x, *p), numeric, atol=1e-4)
+
+    @pytest.mark.parametrize("coeffs", [(2.0,), (2.0, 0.5), (2.0, 0.5, -0.01)])
+    def test_calculate_background_matches_polyval(self, coeffs: tuple[float, ...]) -> None:
+        """Test polynomial background against numpy.polyval."""
+        x = np.linspace(10, 80, 50)
+        expected = np.polyval(coeffs[::-1], x)
+
+        np.testing.assert_allclose(self.analyzer._calculate_background(x, coeffs), expected)
+
+        out = np.ones_like(x)
+        self.analyzer._calculate_background(x, coeffs, out=out)
+        np.testing.assert_allclose(out, expected + 1.0)
+
     def test_calculate_d_spacing(self) -> None:
         """Test d-spacing calculation."""
         # Known value: Cu Kα (1.5406 Å) at 20° two-theta
@@ -175,6 +373,39 @@ class TestXRDAnalyzer:
         with pytest.raises(ValueError, match="wavelength must be > 0"):
             self.analyzer.calculate_d_spacing(20.0, wavelength=-1.0)
 
+    def test_calculate_d_spacing_array(self) -> None:
+        """Test d-spacing for an array of peak positions matches scalar calls."""
+        two_theta = np.array([20.0, 28.4, 47.3, 56.1])
+
+        d = self.analyzer.calculate_d_spacing(two_theta)
+
+        assert isinstance(d, np.ndarray)
+        expected = [self.analyzer.calculate_d_spacing(float(t)) for t in two_theta]
+        assert all(type(value) is float for value in expected)
+        assert isinstance(self.analyzer.calculate_d_spacing(np.float64(20.0)), float)
+        assert isinstance(self.analyzer.calculate_d_spacing(np.array(20.0)), float)
+        np.testing.assert_allclose(d, expected, rtol=1e-14)
+
+        with pytest.raises(ValueError, match="two_theta must be in"):
+            self.analyzer.calculate_d_spacing(np.array([20.0, 180.0]))
+
+    def test_estimate_crystallite_size_array(self) -> None:
+        """Test Scherrer sizes for arrays of peaks match scalar calls."""
+        fwhm = np.array([0.2, 0.5, 1.0])
+        two_theta = np.array([20.0, 30.0, 40.0])
+
+        sizes = self.analyzer.estimate_crystallite_size(fwhm, two_theta)
+
+        assert isinstance(sizes, np.ndarray)
+        expected = [
+            self.analyzer.estimate_crystallite_size(float(f), float(t))
+            for f, t in zip(fwhm, two_theta, strict=True)
+        ]
+        np.testing.assert_allclose(sizes, expected, rtol=1e-14)
+
+        with pytest.raises(ValueError, match="fwhm must be > 0"):
+            self.analyzer.estimate_crystallite_size(np.array([0.5, 0.0]), two_theta[:2])
+
     def test_estimate_crystallite_size(self) -> None:
         """Test crystallite size estimation."""
         fwhm = 0.5  # degrees
@@ -202,6 +433,19 @@ class TestXRDAnalyzer:
         expected = 3.135 * np.sqrt(3)
         assert abs(a - expected) < 0.01
 
+    def test_calculate_lattice_parameter_cubic_multiple_peaks(self) -> None:
+        """Test cubic lattice parameter averages over several indexed peaks."""
+        a_true = 5.431
+        hkl_indices = [(1, 1, 1), (2, 2, 0), (3, 1, 1), (4, 0, 0)]
+        d_spacings = [a_true / np.sqrt(np.dot(hkl, hkl)) for hkl in hkl_indices]
+
+        a = self.analyzer.calculate_lattice_parameter(d_spacings, hkl_indices)
+
+        assert a == pytest.approx(a_true, rel=1e-12)
+
+        with pytest.raises(ValueError, match="Invalid hkl indices"):
+            self.analyzer.calculate_lattice_parameter([3.135, 1.0], [(1, 1, 1), (0, 0, 0)])
+
     def test_calculate_lattice_parameter_validation(self) -> None:
         """Test lattice parameter validation."""
         with pytest.raises(ValueError, match="same length"):
@@ -214,24 +458,39 @@ class TestXRDAnalyzer:
                 [3.135], [(1, 1, 1)], crystal_system="tetragonal"
             )
 
+        with pytest.raises(ValueError, match="tuples of length 3"):
+            self.analyzer.calculate_lattice_parameter([3.135], [(1, 1)])  # type: ignore[list-item]
+
+        with pytest.raises(ValueError, match="tuples of length 3"):
+            self.analyzer.calculate_lattice_parameter(
+                [3.135, 2.0],
+                [(1, 1, 1), (2, 0)],  # type: ignore[list-item]
+            )
+
+        with pytest.raises(ValueError, match="must contain integers"):
+            self.analyzer.calculate_lattice_parameter([3.135], [(1.0, 1.0, 1.0)])  # type: ignore[list-item]
+
+    @pytest.mark.slow
+    @settings(max_examples=25, deadline=None)
     @given(
         arrays(
             dtype=np.float64,
             shape=st.integers(min_value=10, max_value=100),
             elements=st.floats(min_value=10.0, max_value=50.0),
+            unique=True,
         )
     )
     def test_find_peaks_property(self, two_theta: np.ndarray) -> None:
         """Property-based test for find_peaks."""
-        # Ensure monotonic
+        # Ensure monotonic (values are unique, so strictly increasing)
         two_theta = np.sort(two_theta)
-        if len(np.unique(two_theta)) < len(two_theta):
-            # Skip if duplicates
-            return
 
-        # Create intensity with some structure
-        intensity = 50 + 30 * np.sin(two_theta / 5) + np.random.normal(0, 2, len(two_theta))
-        intensity = np.maximum(intensity, 0)  # Ensure non-negative
+        # Create intensity with some structure, updating one array in place
+        intensity = np.sin(two_theta / 5)
+        intensity *= 30
+        intensity += 50
+        intensity += 2 * NOISE[: len(two_theta)]
+        np.maximum(intensity, 0, out=intensity)  # Ensure non-negative
 
         try:
             peaks = self.analyzer.find_peaks(two_theta, intensity, prominence=5.0)